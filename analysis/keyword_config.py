@@ -0,0 +1,118 @@
+"""
+关键词配置
+
+解析 frequency_words.txt 并编译匹配器，main.py 和 MCP 服务共用同一份结果。文件格式：
+
+    空行分隔词组；普通词直接书写，+词 为必须词，!词 为过滤词（对所有词组生效），@数字 为该词组最多显示的条数
+
+加载时先比较文件的修改时间和大小，未变化时直接返回已编译的配置；文件被修改后下一次加载即生效，无需重启。
+"""
+
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+from analysis.word_matcher import WordGroupMatcher, get_word_matcher
+
+
+def parse_frequency_words(content: str) -> Tuple[List[Dict], List[str]]:
+    """
+    解析频率词文件内容
+
+    Returns:
+        (词组列表, 过滤词列表)。词组包含 required / normal / group_key / max_count，
+        以及该词组内声明的过滤词 filter_words（仅用于展示，匹配时使用全局过滤词列表）
+    """
+    word_groups = [group.strip() for group in content.split("\n\n") if group.strip()]
+
+    processed_groups = []
+    filter_words = []
+
+    for group in word_groups:
+        words = [word.strip() for word in group.split("\n") if word.strip()]
+
+        group_required_words = []
+        group_normal_words = []
+        group_filter_words = []
+        group_max_count = 0  # 默认不限制
+
+        for word in words:
+            if word.startswith("@"):
+                # 解析最大显示数量（只接受正整数）
+                try:
+                    count = int(word[1:])
+                    if count > 0:
+                        group_max_count = count
+                except (ValueError, IndexError):
+                    pass  # 忽略无效的@数字格式
+            elif word.startswith("!"):
+                filter_words.append(word[1:])
+                group_filter_words.append(word[1:])
+            elif word.startswith("+"):
+                group_required_words.append(word[1:])
+            else:
+                group_normal_words.append(word)
+
+        if group_required_words or group_normal_words:
+            if group_normal_words:
+                group_key = " ".join(group_normal_words)
+            else:
+                group_key = " ".join(group_required_words)
+
+            processed_groups.append(
+                {
+                    "required": group_required_words,
+                    "normal": group_normal_words,
+                    "group_key": group_key,
+                    "max_count": group_max_count,
+                    "filter_words": group_filter_words,
+                }
+            )
+
+    return processed_groups, filter_words
+
+
+class KeywordConfig:
+    """解析并编译后的关键词配置（加载后不会被修改）"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.word_groups, self.filter_words = parse_frequency_words(content)
+        # 预编译多模式匹配器，后续按词组对象复用
+        self.matcher: WordGroupMatcher = get_word_matcher(self.word_groups, self.filter_words)
+
+    @property
+    def fingerprint(self) -> str:
+        """匹配规则指纹"""
+        return self.matcher.fingerprint
+
+
+# 已加载的配置：文件绝对路径 -> ((修改时间, 大小), 配置)
+_loaded_configs: Dict[str, Tuple[Tuple[int, int], KeywordConfig]] = {}
+
+
+def load_keyword_config(path: Union[str, Path]) -> KeywordConfig:
+    """
+    加载关键词配置，文件未变化时返回同一个已编译的配置
+
+    Raises:
+        FileNotFoundError: 文件不存在
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = str(path.resolve())
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _loaded_configs.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    # 修改时间变化但内容相同（如重新保存）时沿用已编译的配置
+    if cached is not None and cached[1].content == content:
+        config = cached[1]
+    else:
+        config = KeywordConfig(content)
+    _loaded_configs[key] = (signature, config)
+    return config
@@ -0,0 +1,152 @@
+"""
+新闻权重
+
+排序时为一批新闻一次性计算权重：
+
+    排名权重 = Σ(11 - min(rank, 10)) / 排名次数
+    频次权重 = min(出现次数, 10) × 10
+    热度权重 = 排名 ≤ rank_threshold 的次数 / 排名次数 × 100
+    总权重 = 排名权重 × RANK_WEIGHT + 频次权重 × FREQUENCY_WEIGHT + 热度权重 × HOTNESS_WEIGHT
+
+安装了 NumPy 且排名总数较多时，把所有新闻的排名展平为一个数组按段求和；否则逐条计算。
+两种方式的运算顺序相同，结果逐位一致。
+"""
+
+from itertools import chain
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 为可选依赖
+    np = None
+
+from analysis.top_k import top_k
+
+# 与 config.yaml 的 weight 默认值一致
+DEFAULT_WEIGHT_CONFIG = {
+    "RANK_WEIGHT": 0.6,
+    "FREQUENCY_WEIGHT": 0.3,
+    "HOTNESS_WEIGHT": 0.1,
+}
+
+# 排名总数达到该值时使用 NumPy（数据量小时数组转换的开销大于收益）
+NUMPY_MIN_RANKS = 256
+
+
+def calculate_news_weights(
+    news_list: Sequence[Dict],
+    rank_threshold: int = 5,
+    weight_config: Optional[Dict] = None,
+    use_numpy: Optional[bool] = None,
+) -> List[float]:
+    """
+    批量计算新闻权重
+
+    Args:
+        news_list: 新闻字典列表，使用 ranks 和 count 字段（count 缺省为排名次数）
+        rank_threshold: 高排名阈值
+        weight_config: RANK_WEIGHT / FREQUENCY_WEIGHT / HOTNESS_WEIGHT，默认 DEFAULT_WEIGHT_CONFIG
+        use_numpy: 是否使用 NumPy，None 时按是否安装和数据量自动选择
+
+    Returns:
+        与 news_list 顺序对应的权重列表，没有排名的新闻权重为 0
+    """
+    if weight_config is None:
+        weight_config = DEFAULT_WEIGHT_CONFIG
+
+    rank_lists = []
+    counts = []
+    total_ranks = 0
+    for news in news_list:
+        ranks = news.get("ranks") or ()
+        rank_lists.append(ranks)
+        counts.append(news.get("count", len(ranks)))
+        total_ranks += len(ranks)
+
+    if use_numpy is None:
+        use_numpy = np is not None and total_ranks >= NUMPY_MIN_RANKS
+    if use_numpy and np is not None:
+        return _numpy_weights(rank_lists, counts, total_ranks, rank_threshold, weight_config)
+    return _python_weights(rank_lists, counts, rank_threshold, weight_config)
+
+
+def _python_weights(
+    rank_lists: List, counts: List[int], rank_threshold: int, weight_config: Dict
+) -> List[float]:
+    rank_factor = weight_config["RANK_WEIGHT"]
+    frequency_factor = weight_config["FREQUENCY_WEIGHT"]
+    hotness_factor = weight_config["HOTNESS_WEIGHT"]
+
+    weights = []
+    for ranks, count in zip(rank_lists, counts):
+        if not ranks:
+            weights.append(0.0)
+            continue
+
+        # 一次遍历同时得到排名得分和高排名次数
+        rank_sum = 0
+        high_rank_count = 0
+        for rank in ranks:
+            rank_sum += 11 - (rank if rank < 10 else 10)
+            if rank <= rank_threshold:
+                high_rank_count += 1
+
+        rank_weight = rank_sum / len(ranks)
+        frequency_weight = min(count, 10) * 10
+        hotness_weight = high_rank_count / len(ranks) * 100
+        weights.append(
+            rank_weight * rank_factor
+            + frequency_weight * frequency_factor
+            + hotness_weight * hotness_factor
+        )
+    return weights
+
+
+def _numpy_weights(
+    rank_lists: List,
+    counts: List[int],
+    total_ranks: int,
+    rank_threshold: int,
+    weight_config: Dict,
+) -> List[float]:
+    lengths = np.fromiter(
+        (len(ranks) for ranks in rank_lists), dtype=np.int64, count=len(rank_lists)
+    )
+    flat = np.fromiter(chain.from_iterable(rank_lists), dtype=np.int64, count=total_ranks)
+
+    # 前缀和相减得到每条新闻的段内合计（整数运算，没有排名的新闻段长为 0）
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    score_sums = np.concatenate(([0], np.cumsum(11 - np.minimum(flat, 10))))
+    high_sums = np.concatenate(([0], np.cumsum(flat <= rank_threshold, dtype=np.int64)))
+    rank_sum = score_sums[ends] - score_sums[starts]
+    high_rank_count = high_sums[ends] - high_sums[starts]
+
+    has_ranks = lengths > 0
+    divisor = np.where(has_ranks, lengths, 1)
+    rank_weight = rank_sum / divisor
+    frequency_weight = np.minimum(np.asarray(counts, dtype=np.int64), 10) * 10
+    hotness_weight = high_rank_count / divisor * 100
+
+    weights = (
+        rank_weight * weight_config["RANK_WEIGHT"]
+        + frequency_weight * weight_config["FREQUENCY_WEIGHT"]
+        + hotness_weight * weight_config["HOTNESS_WEIGHT"]
+    )
+    return np.where(has_ranks, weights, 0.0).tolist()
+
+
+def top_news_by_weight(
+    news_list: List[Dict],
+    limit: Optional[int] = None,
+    rank_threshold: int = 5,
+    weight_config: Optional[Dict] = None,
+) -> List[Dict]:
+    """
+    按权重从高到低返回前 limit 条新闻（权重相同时保持原顺序）
+
+    limit 为 None 或小于等于 0 时返回全部新闻的排序结果。
+    """
+    weights = calculate_news_weights(news_list, rank_threshold, weight_config)
+    order = top_k(range(len(news_list)), limit, key=weights.__getitem__, reverse=True)
+    return [news_list[index] for index in order]
@@ -0,0 +1,33 @@
+"""
+有上限的排序选择
+
+只需要前 k 项时用大小为 k 的堆选择（heapq.nsmallest / nlargest），复杂度 O(n log k)，
+不必对全部数据排序后再截取。结果与 sorted(...)[:k] 完全相同，包括相等元素的先后顺序。
+"""
+
+import heapq
+from typing import Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def top_k(
+    items: Iterable[T],
+    k: Optional[int],
+    key: Optional[Callable[[T], object]] = None,
+    reverse: bool = False,
+) -> List[T]:
+    """
+    返回排序后的前 k 项，等价于 sorted(items, key=key, reverse=reverse)[:k]
+
+    Args:
+        items: 待选择的元素
+        k: 数量上限，None 或小于等于 0 时不限制（返回全部排序结果）
+        key: 排序键
+        reverse: 是否降序
+    """
+    if k is None or k <= 0:
+        return sorted(items, key=key, reverse=reverse)
+    if reverse:
+        return heapq.nlargest(k, items, key=key)
+    return heapq.nsmallest(k, items, key=key)
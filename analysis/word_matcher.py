@@ -0,0 +1,262 @@
+"""
+关键词匹配
+
+把 frequency_words 的词组编译成一个 Aho-Corasick 多模式自动机，每个标题只扫描一遍，
+即可同时得到过滤词判定和第一个命中的词组。匹配结果与逐词小写子串判断（`word in title`）完全一致。
+
+同一标题在一天内的每次抓取和汇总中都会重复出现，MatchCache 记录每个标题的匹配结果并持久化，
+以匹配规则的指纹区分关键词配置，每个标题在同一配置下只匹配一次。
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+
+class AhoCorasick:
+    """多模式子串匹配自动机"""
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        构建自动机
+
+        Args:
+            patterns: 模式串列表，模式ID为其下标；空模式串视为在任意文本中出现
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._empty: List[int] = []
+
+        for pattern_id, pattern in enumerate(patterns):
+            if not pattern:
+                self._empty.append(pattern_id)
+                continue
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[node][char] = next_node
+                node = next_node
+            self._output[node].append(pattern_id)
+
+        # 广度优先计算失败指针，并把失败节点的输出合并到当前节点
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_node] = self._goto[fail].get(char, 0)
+                self._output[next_node].extend(self._output[self._fail[next_node]])
+
+    def find(self, text: str) -> Set[int]:
+        """返回在 text 中出现过的模式ID集合"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found = set(self._empty)
+
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                found.update(output[node])
+
+        return found
+
+
+class WordGroupMatcher:
+    """编译后的词组匹配器"""
+
+    def __init__(self, word_groups: List[Dict], filter_words: List[str]):
+        """
+        Args:
+            word_groups: load_frequency_words 返回的词组（required / normal）
+            filter_words: 过滤词列表
+        """
+        self.word_groups = word_groups
+        self.filter_words = filter_words
+        # 匹配规则指纹：必须词、普通词（按词组顺序）和过滤词不变时相同，用于判断匹配缓存是否失效
+        rules = [[group["required"], group["normal"]] for group in word_groups]
+        self.fingerprint = hashlib.sha1(
+            json.dumps([rules, filter_words], ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+        pattern_ids: Dict[str, int] = {}
+
+        def pattern_id(word: str) -> int:
+            return pattern_ids.setdefault(word.lower(), len(pattern_ids))
+
+        self._filter_ids = {pattern_id(word) for word in filter_words}
+        # 每个词组的 (必须词ID集合, 普通词ID集合)
+        self._groups = []
+        # 模式ID -> 包含该模式的词组下标，用于只检查可能命中的词组
+        self._pattern_groups: Dict[int, List[int]] = {}
+        # 不含任何词的词组（如"全部新闻"虚拟词组）对所有标题都成立
+        self._always_groups: List[int] = []
+
+        for index, group in enumerate(word_groups):
+            required = {pattern_id(word) for word in group["required"]}
+            normal = {pattern_id(word) for word in group["normal"]}
+            self._groups.append((required, normal))
+            if not required and not normal:
+                self._always_groups.append(index)
+            for word_id in required | normal:
+                self._pattern_groups.setdefault(word_id, []).append(index)
+
+        self._automaton = AhoCorasick(pattern_ids)
+
+    def match(self, title: str) -> Optional[int]:
+        """
+        返回标题命中的第一个词组下标
+
+        Returns:
+            词组下标；标题为空、命中过滤词或没有词组命中时返回 None
+        """
+        if not isinstance(title, str):
+            title = str(title) if title is not None else ""
+        if not title.strip():
+            return None
+
+        found = self._automaton.find(title.lower())
+        if not found.isdisjoint(self._filter_ids):
+            return None
+
+        candidates = set(self._always_groups)
+        for word_id in found:
+            candidates.update(self._pattern_groups.get(word_id, ()))
+
+        for index in sorted(candidates):
+            required, normal = self._groups[index]
+            if required and not required <= found:
+                continue
+            if normal and normal.isdisjoint(found):
+                continue
+            return index
+
+        return None
+
+    def matches(self, title: str) -> bool:
+        """检查标题是否匹配词组规则（未配置词组时匹配所有非空标题）"""
+        if not self.word_groups:
+            if not isinstance(title, str):
+                title = str(title) if title is not None else ""
+            return bool(title.strip())
+        return self.match(title) is not None
+
+
+# 已编译的匹配器，按词组和过滤词列表对象缓存（加载后的词组不会被修改）
+_MATCHER_CACHE_SIZE = 8
+_matcher_cache: "OrderedDict[tuple, WordGroupMatcher]" = OrderedDict()
+
+
+def get_word_matcher(
+    word_groups: List[Dict], filter_words: List[str]
+) -> WordGroupMatcher:
+    """获取词组对应的已编译匹配器，未编译时编译并缓存"""
+    key = (id(word_groups), id(filter_words))
+    matcher = _matcher_cache.get(key)
+    if (
+        matcher is not None
+        and matcher.word_groups is word_groups
+        and matcher.filter_words is filter_words
+    ):
+        _matcher_cache.move_to_end(key)
+        return matcher
+
+    matcher = WordGroupMatcher(word_groups, filter_words)
+    _matcher_cache[key] = matcher
+    if len(_matcher_cache) > _MATCHER_CACHE_SIZE:
+        _matcher_cache.popitem(last=False)
+    return matcher
+
+
+class MatchCache:
+    """
+    标题匹配结果缓存：小写标题 -> 命中的词组下标（未命中或命中过滤词记为 -1）
+
+    匹配结果只取决于小写后的标题，因此以小写标题为键。指定 path 时从文件加载：
+    文件按规则指纹分节保存，同一天交替使用的多套规则（如关键词报告和全部新闻模式）各自保留结果，
+    只保留最近保存的 MAX_SECTIONS 套规则。
+    """
+
+    FORMAT_VERSION = 2
+    MAX_SECTIONS = 4
+
+    def __init__(self, matcher: WordGroupMatcher, path: Optional[Union[str, Path]] = None):
+        self.matcher = matcher
+        self.path = Path(path) if path is not None else None
+        self._results: Dict[str, int] = {}
+        self._dirty = False
+        if self.path is not None:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def match(self, title: str) -> Optional[int]:
+        """与 WordGroupMatcher.match 相同，已匹配过的标题直接返回缓存结果"""
+        if not isinstance(title, str):
+            return self.matcher.match(title)
+        key = title.lower()
+        result = self._results.get(key)
+        if result is None:
+            index = self.matcher.match(title)
+            result = self._results[key] = -1 if index is None else index
+            self._dirty = True
+        return None if result < 0 else result
+
+    def matches(self, title: str) -> bool:
+        """与 WordGroupMatcher.matches 相同"""
+        if not self.matcher.word_groups:
+            return self.matcher.matches(title)
+        return self.match(title) is not None
+
+    def load(self) -> None:
+        """读取持久化的匹配结果，文件不存在、格式不符或没有当前规则的结果时忽略"""
+        self._results = self._read_sections().get(self.matcher.fingerprint, {})
+        self._dirty = False
+
+    def _read_sections(self) -> Dict[str, Dict[str, int]]:
+        """读取文件中按规则指纹分节的匹配结果"""
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.FORMAT_VERSION:
+                return data["sections"]
+        except Exception as e:
+            print(f"读取标题匹配缓存失败，将重新匹配: {e}")
+        return {}
+
+    def save(self) -> None:
+        """持久化匹配结果（无新增时跳过），保留文件中其他规则的结果"""
+        if self.path is None or not self._dirty:
+            return
+        sections = self._read_sections()
+        sections.pop(self.matcher.fingerprint, None)
+        sections[self.matcher.fingerprint] = self._results
+        # 按保存顺序只保留最近的几套规则
+        sections = dict(list(sections.items())[-self.MAX_SECTIONS:])
+        data = {"version": self.FORMAT_VERSION, "sections": sections}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            print(f"保存标题匹配缓存失败: {e}")
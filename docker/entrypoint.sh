@@ -15,6 +15,10 @@ case "${RUN_MODE:-cron}" in
     echo "🔄 单次执行"
     exec /usr/local/bin/python main.py
     ;;
+"daemon")
+    echo "♾️ 守护进程模式，执行间隔: ${DAEMON_INTERVAL:-30} 分钟"
+    exec /usr/local/bin/python main.py --daemon
+    ;;
 "cron")
     # 生成 crontab
     echo "${CRON_SCHEDULE:-*/30 * * * *} cd /app && /usr/local/bin/python main.py" > /tmp/crontab
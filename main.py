@@ -1,26 +1,54 @@
 # coding=utf-8
 
+import hashlib
 import json
 import os
 import random
 import re
+import sys
+import threading
 import time
 import webbrowser
 import smtplib
+from array import array
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import Header
 from email.utils import formataddr, formatdate, make_msgid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Union
+from urllib.parse import urlparse
 
 import pytz
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+
+from analysis.keyword_config import load_keyword_config
+from analysis.news_weight import calculate_news_weights
+from analysis.top_k import top_k
+from analysis.word_matcher import MatchCache, get_word_matcher
+from storage.backend import create_storage, resolve_object_store_config
+from storage.day_archive import day_snapshot_loader
+from storage.txt_format import (
+    DELTA_PREFIX,
+    UNCHANGED_PREFIX,
+    directory_loader,
+    encode_delta_lines,
+    format_snapshot,
+    format_title_line,
+    parse_snapshot_file,
+    resolve_unchanged,
+)
+from storage.url_templates import compact_url, expand_url
 
 
 VERSION = "3.4.0"
+# newsnow 热榜接口地址（可通过 crawler.api_url 指向本地回放服务做离线测试）
+DEFAULT_CRAWLER_API_URL = "https://newsnow.busiyi.world/api/s"
 
 
 # === SMTP邮件配置 ===
@@ -77,6 +105,56 @@ def load_config():
         if os.environ.get("ENABLE_RSS", "").strip()
         else config_data["app"].get("enable_rss", True),
         "REQUEST_INTERVAL": config_data["crawler"]["request_interval"],
+        "CRAWLER_API_URL": os.environ.get("CRAWLER_API_URL", "").strip()
+        or config_data["crawler"].get("api_url")
+        or DEFAULT_CRAWLER_API_URL,
+        "MAX_CONCURRENCY": max(
+            1, int(config_data["crawler"].get("max_concurrency", 1) or 1)
+        ),
+        "DAEMON_INTERVAL": max(
+            1,
+            int(
+                os.environ.get("DAEMON_INTERVAL", "").strip()
+                or config_data["crawler"].get("daemon_interval", 30)
+            ),
+        ),
+        "CRAWL_DEADLINE": max(
+            0,
+            int(
+                os.environ.get("CRAWL_DEADLINE", "").strip()
+                or config_data["crawler"].get("crawl_deadline", 0)
+                or 0
+            ),
+        ),
+        "CIRCUIT_BREAKER": {
+            "ENABLED": config_data["crawler"]
+            .get("circuit_breaker", {})
+            .get("enabled", True),
+            "FAILURE_THRESHOLD": max(
+                1,
+                int(
+                    config_data["crawler"]
+                    .get("circuit_breaker", {})
+                    .get("failure_threshold", 3)
+                ),
+            ),
+            "COOLDOWN_MINUTES": max(
+                1,
+                int(
+                    config_data["crawler"]
+                    .get("circuit_breaker", {})
+                    .get("cooldown_minutes", 60)
+                ),
+            ),
+            "MAX_COOLDOWN_MINUTES": max(
+                1,
+                int(
+                    config_data["crawler"]
+                    .get("circuit_breaker", {})
+                    .get("max_cooldown_minutes", 1440)
+                ),
+            ),
+        },
         "REPORT_MODE": os.environ.get("REPORT_MODE", "").strip()
         or config_data["report"]["mode"],
         "RANK_THRESHOLD": config_data["report"]["rank_threshold"],
@@ -147,6 +225,30 @@ def load_config():
             "HOTNESS_WEIGHT": config_data["weight"]["hotness_weight"],
         },
         "PLATFORMS": config_data["platforms"],
+        "STORAGE": {
+            "BACKEND": os.environ.get("STORAGE_BACKEND", "").strip().lower()
+            or config_data.get("storage", {}).get("backend", "txt"),
+            "SQLITE_PATH": config_data.get("storage", {}).get(
+                "sqlite_path", "output/trendradar.db"
+            ),
+            "LOAD_WORKERS": int(
+                os.environ.get("LOAD_WORKERS", "").strip()
+                or config_data.get("storage", {}).get("load_workers", 0)
+            ),
+            "DELTA_SNAPSHOTS": (
+                os.environ.get("DELTA_SNAPSHOTS", "").strip().lower() in ("true", "1")
+                if os.environ.get("DELTA_SNAPSHOTS", "").strip()
+                else config_data.get("storage", {}).get("delta_snapshots", False)
+            ),
+            "KEYFRAME_INTERVAL": int(
+                os.environ.get("KEYFRAME_INTERVAL", "").strip()
+                or config_data.get("storage", {}).get("keyframe_interval", 12)
+            ),
+            # output 目录的存储位置（本地或 S3 兼容对象存储），环境变量优先
+            "OBJECT_STORE": resolve_object_store_config(
+                config_data.get("storage", {}).get("object_store")
+            ),
+        },
     }
 
     # 通知渠道配置（环境变量优先）
@@ -290,12 +392,135 @@ def ensure_directory_exists(directory: str):
     Path(directory).mkdir(parents=True, exist_ok=True)
 
 
-def get_output_path(subfolder: str, filename: str) -> str:
-    """获取输出路径"""
-    date_folder = format_date_folder()
-    output_dir = Path("output") / date_folder / subfolder
-    ensure_directory_exists(str(output_dir))
-    return str(output_dir / filename)
+# output 目录的存储后端（本地目录或 S3 兼容对象存储）
+_storage_backend = None
+
+
+def get_storage():
+    """获取全局存储后端实例，快照、报告和 RSS 文件通过它写入 output 目录"""
+    global _storage_backend
+    if _storage_backend is None:
+        _storage_backend = create_storage(CONFIG["STORAGE"]["OBJECT_STORE"], Path("output"))
+    return _storage_backend
+
+
+def day_sidecar_path(date_folder: str, filename: str) -> Path:
+    """日期目录下只在本地使用的辅助文件（当日聚合、匹配缓存等）的路径，位于存储后端的本地目录"""
+    return get_storage().local_path(f"{date_folder}/{filename}")
+
+
+# === HTTP客户端 ===
+CRAWLER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+    "Connection": "keep-alive",
+    "Cache-Control": "no-cache",
+}
+
+VERSION_CHECK_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "text/plain, */*",
+    "Cache-Control": "no-cache",
+}
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class HttpClient:
+    """共享 HTTP 客户端：按主机复用 keep-alive 连接池，统一管理超时和代理"""
+
+    def __init__(
+        self,
+        pool_connections: int = 20,
+        pool_maxsize: int = 10,
+        default_timeout: int = 30,
+    ):
+        self.default_timeout = default_timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._adapter = adapter
+        self._proxies_cache: Dict[str, Dict[str, str]] = {}
+
+    def _get_proxies(self, proxy_url: Optional[str]) -> Optional[Dict[str, str]]:
+        """获取代理配置（同一代理地址只构建一次）"""
+        if not proxy_url:
+            return None
+        if proxy_url not in self._proxies_cache:
+            self._proxies_cache[proxy_url] = {"http": proxy_url, "https": proxy_url}
+        return self._proxies_cache[proxy_url]
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        proxy_url: Optional[str] = None,
+        timeout: Optional[int] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """发送请求，复用连接池"""
+        return self.session.request(
+            method,
+            url,
+            proxies=self._get_proxies(proxy_url),
+            timeout=timeout or self.default_timeout,
+            **kwargs,
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """统计各主机的请求数、新建连接数和连接复用次数"""
+        pool_managers = [self._adapter.poolmanager]
+        pool_managers.extend(self._adapter.proxy_manager.values())
+
+        stats = {}
+        for pool_manager in pool_managers:
+            for pool_key in list(pool_manager.pools.keys()):
+                pool = pool_manager.pools.get(pool_key)
+                if pool is None:
+                    continue
+                host_stats = stats.setdefault(
+                    pool.host, {"requests": 0, "connections": 0, "reused": 0}
+                )
+                host_stats["requests"] += pool.num_requests
+                host_stats["connections"] += pool.num_connections
+                host_stats["reused"] += max(0, pool.num_requests - pool.num_connections)
+        return stats
+
+    def print_connection_stats(self) -> None:
+        """输出连接复用统计"""
+        stats = self.get_connection_stats()
+        if not stats:
+            return
+        print("HTTP连接复用统计:")
+        for host, host_stats in stats.items():
+            print(
+                f"  {host}: 请求 {host_stats['requests']} 次，新建连接 {host_stats['connections']} 个，复用 {host_stats['reused']} 次"
+            )
+
+    def close(self) -> None:
+        self.session.close()
+
+
+# 全局 HTTP 客户端实例
+_http_client = None
+
+
+def get_http_client() -> HttpClient:
+    """获取全局 HTTP 客户端实例"""
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient(pool_maxsize=max(10, CONFIG["MAX_CONCURRENCY"]))
+    return _http_client
 
 
 def check_version_update(
@@ -303,18 +528,8 @@ def check_version_update(
 ) -> Tuple[bool, Optional[str]]:
     """检查版本更新"""
     try:
-        proxies = None
-        if proxy_url:
-            proxies = {"http": proxy_url, "https": proxy_url}
-
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Accept": "text/plain, */*",
-            "Cache-Control": "no-cache",
-        }
-
-        response = requests.get(
-            version_url, proxies=proxies, headers=headers, timeout=10
+        response = get_http_client().get(
+            version_url, proxy_url=proxy_url, headers=VERSION_CHECK_HEADERS, timeout=10
         )
         response.raise_for_status()
 
@@ -344,14 +559,7 @@ def check_version_update(
 
 def is_first_crawl_today() -> bool:
     """检测是否是当天第一次爬取"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
-
-    if not txt_dir.exists():
-        return True
-
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-    return len(files) <= 1
+    return len(list_day_snapshots(format_date_folder())) <= 1
 
 
 def html_escape(text: str) -> str:
@@ -471,12 +679,388 @@ class PushRecordManager:
         return result
 
 
+# === 新闻记录 ===
+class NewsItem:
+    """
+    单条新闻记录：抓取或解析时构建一次，贯穿合并、匹配、权重计算和渲染
+
+    排名历史保存为两个平行的紧凑数组：每次出现时的快照序号和排名（同一快照中出现多次时序号重复），
+    序号是 timeline（快照时间列表，同一聚合中的记录共用一个）中的下标。
+    ranks、first_time、last_time、count 都由排名历史推出；尚未加入聚合的记录只有排名。
+    """
+
+    __slots__ = ("url", "mobile_url", "timeline", "snapshot_indexes", "rank_history")
+
+    # 兼容字典式读取时的键名映射
+    _KEY_MAP = {
+        "ranks": "ranks",
+        "url": "url",
+        "mobileUrl": "mobile_url",
+        "mobile_url": "mobile_url",
+        "first_time": "first_time",
+        "last_time": "last_time",
+        "count": "count",
+    }
+
+    def __init__(self, ranks: List[int], url: str = "", mobile_url: str = ""):
+        self.url = url
+        self.mobile_url = mobile_url
+        self.timeline: Optional[List[str]] = None
+        self.snapshot_indexes = array("H")
+        self.rank_history = array("H", ranks)
+
+    @classmethod
+    def from_history(
+        cls,
+        timeline: List[str],
+        snapshot_indexes: List[int],
+        rank_history: List[int],
+        url: str = "",
+        mobile_url: str = "",
+    ) -> "NewsItem":
+        """由持久化的排名历史恢复记录"""
+        item = cls(rank_history, url, mobile_url)
+        item.timeline = timeline
+        item.snapshot_indexes = array("H", snapshot_indexes)
+        return item
+
+    def stamp(self, timeline: List[str], index: int) -> None:
+        """记录首次出现：当前的排名都属于 timeline[index] 快照"""
+        self.timeline = timeline
+        self.snapshot_indexes = array("H", [index]) * len(self.rank_history)
+
+    def merge(self, other: "NewsItem", index: int) -> None:
+        """合并同一标题在 timeline[index] 快照中的记录"""
+        ranks = other.rank_history
+        if len(ranks) == 1:
+            self.snapshot_indexes.append(index)
+            self.rank_history.append(ranks[0])
+            return
+        self.snapshot_indexes.extend(array("H", [index]) * len(ranks))
+        self.rank_history.extend(ranks)
+
+    def repeat_latest(self, index: int) -> None:
+        """最近一次出现时的排名在 timeline[index] 快照中原样再次出现"""
+        latest = self.snapshot_indexes[-1]
+        position = len(self.snapshot_indexes)
+        while position > 0 and self.snapshot_indexes[position - 1] == latest:
+            position -= 1
+        latest_ranks = self.rank_history[position:]
+        self.snapshot_indexes.extend(array("H", [index]) * len(latest_ranks))
+        self.rank_history.extend(latest_ranks)
+
+    def add_rank(self, rank: int) -> None:
+        """同一快照中再次出现（同一平台同名标题）"""
+        self.rank_history.append(rank)
+        if self.snapshot_indexes:
+            self.snapshot_indexes.append(self.snapshot_indexes[-1])
+
+    @property
+    def ranks(self) -> List[int]:
+        """出现过的排名（去重，按首次出现顺序）"""
+        return list(dict.fromkeys(self.rank_history))
+
+    @property
+    def first_time(self) -> str:
+        if not self.snapshot_indexes:
+            return ""
+        return self.timeline[self.snapshot_indexes[0]]
+
+    @property
+    def last_time(self) -> str:
+        if not self.snapshot_indexes:
+            return ""
+        return self.timeline[self.snapshot_indexes[-1]]
+
+    @property
+    def last_index(self) -> int:
+        """最近一次出现的快照序号，尚未加入聚合时为 -1"""
+        return self.snapshot_indexes[-1] if self.snapshot_indexes else -1
+
+    @property
+    def count(self) -> int:
+        """出现过的快照数"""
+        indexes = self.snapshot_indexes
+        if not indexes:
+            return 1
+        return 1 + sum(1 for i in range(1, len(indexes)) if indexes[i] != indexes[i - 1])
+
+    def history(self) -> List[Tuple[str, int]]:
+        """按时间顺序返回 [(快照时间, 排名)]，用于分析排名变化"""
+        return [
+            (self.timeline[index], rank)
+            for index, rank in zip(self.snapshot_indexes, self.rank_history)
+        ]
+
+    def get(self, key: str, default=None):
+        """兼容字典式读取（供 RSS 等按字典处理数据的模块使用）"""
+        attr = self._KEY_MAP.get(key)
+        if attr is None:
+            return default
+        return getattr(self, attr)
+
+    def __getitem__(self, key: str):
+        attr = self._KEY_MAP.get(key)
+        if attr is None:
+            raise KeyError(key)
+        return getattr(self, attr)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._KEY_MAP
+
+    def __repr__(self) -> str:
+        return (
+            f"NewsItem(ranks={self.ranks!r}, url={self.url!r}, "
+            f"mobile_url={self.mobile_url!r}, count={self.count})"
+        )
+
+
 # === 数据获取 ===
+class HostRateLimiter:
+    """按主机限流：限制同一主机的在途请求数，并保持每个并发槽位的请求间隔"""
+
+    def __init__(self, max_concurrency: int = 1, request_interval: int = 0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.request_interval = request_interval
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    def _get_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(
+                    self.max_concurrency
+                )
+            return self._semaphores[host]
+
+    @contextmanager
+    def slot(self, url: str):
+        """占用目标主机的一个并发槽位，请求结束后等待间隔再释放"""
+        semaphore = self._get_semaphore(urlparse(url).netloc)
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            if self.request_interval > 0:
+                actual_interval = self.request_interval + random.randint(-10, 20)
+                actual_interval = max(50, actual_interval)
+                time.sleep(actual_interval / 1000)
+            semaphore.release()
+
+
+CRAWL_SCHEDULE_FILE = "output/.crawl_schedule.json"
+
+
+class CrawlScheduler:
+    """按平台 interval 配置（分钟）决定本轮需要爬取的平台，上次成功爬取时间持久化到 output 目录"""
+
+    # 定时任务启动有抖动，留出一分钟余量，避免刚好差几秒而跳过一轮
+    TOLERANCE_SECONDS = 60
+
+    def __init__(self, schedule_file: str = CRAWL_SCHEDULE_FILE):
+        self.schedule_file = Path(schedule_file)
+        self.last_crawled: Dict[str, float] = {}
+        if self.schedule_file.exists():
+            try:
+                with open(self.schedule_file, "r", encoding="utf-8") as f:
+                    self.last_crawled = json.load(f)
+            except Exception as e:
+                print(f"读取爬取计划失败，所有平台将立即爬取: {e}")
+
+    @staticmethod
+    def get_interval(platform: Dict) -> int:
+        """平台的爬取间隔（分钟），0 表示每次运行都爬取"""
+        try:
+            return max(0, int(platform.get("interval") or 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def is_due(self, platform: Dict, now: datetime) -> bool:
+        interval = self.get_interval(platform)
+        last_crawled = self.last_crawled.get(platform["id"])
+        if not interval or last_crawled is None:
+            return True
+        return now.timestamp() - last_crawled >= interval * 60 - self.TOLERANCE_SECONDS
+
+    def split_due(self, platforms: List[Dict], now: datetime) -> Tuple[List[Dict], List[Dict]]:
+        """返回 (本轮到期的平台, 跳过的平台)，保持配置顺序"""
+        due, skipped = [], []
+        for platform in platforms:
+            (due if self.is_due(platform, now) else skipped).append(platform)
+        return due, skipped
+
+    def record(self, platform_ids: List[str], now: datetime) -> None:
+        """记录成功爬取的平台并保存（失败的平台不记录，下一轮继续尝试）"""
+        for platform_id in platform_ids:
+            self.last_crawled[platform_id] = now.timestamp()
+
+        try:
+            self.schedule_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.schedule_file, "w", encoding="utf-8") as f:
+                json.dump(self.last_crawled, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"保存爬取计划失败: {e}")
+
+
+def get_platform_priority(platform: Dict) -> int:
+    """平台的爬取优先级，数值大的先爬取，未配置为 0"""
+    try:
+        return int(platform.get("priority") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+PLATFORM_HEALTH_FILE = "output/.platform_health.json"
+
+
+class PlatformHealth:
+    """
+    平台健康记录与熔断器
+
+    记录每个平台的连续失败次数、响应耗时（指数滑动平均）和最近成功/失败时间，持久化到 output 目录。
+    连续失败达到阈值后熔断：冷却期内不再请求，冷却结束后只试探一次（不重试），
+    试探失败则冷却时间翻倍（不超过上限），成功则恢复正常。
+    """
+
+    # 响应耗时滑动平均中本次耗时的权重
+    LATENCY_ALPHA = 0.3
+
+    def __init__(self, health_file: str = PLATFORM_HEALTH_FILE):
+        self.health_file = Path(health_file)
+        self.records: Dict[str, Dict] = {}
+        self.probe_ids = set()
+        self._lock = threading.Lock()
+        if self.health_file.exists():
+            try:
+                with open(self.health_file, "r", encoding="utf-8") as f:
+                    self.records = json.load(f)
+            except Exception as e:
+                print(f"读取平台健康记录失败，将重新记录: {e}")
+
+    def _get_record(self, platform_id: str) -> Dict:
+        return self.records.setdefault(
+            platform_id,
+            {
+                "consecutive_failures": 0,
+                "latency_ms": None,
+                "last_success": None,
+                "last_failure": None,
+            },
+        )
+
+    def is_open(self, platform_id: str) -> bool:
+        """连续失败次数是否已达到熔断阈值"""
+        record = self.records.get(platform_id)
+        return bool(
+            record
+            and record["consecutive_failures"]
+            >= CONFIG["CIRCUIT_BREAKER"]["FAILURE_THRESHOLD"]
+        )
+
+    def open_until(self, platform_id: str) -> Optional[float]:
+        """熔断平台的冷却结束时间戳，未熔断时返回 None"""
+        if not self.is_open(platform_id):
+            return None
+
+        record = self.records[platform_id]
+        breaker = CONFIG["CIRCUIT_BREAKER"]
+        extra_failures = record["consecutive_failures"] - breaker["FAILURE_THRESHOLD"]
+        cooldown_minutes = min(
+            breaker["MAX_COOLDOWN_MINUTES"],
+            breaker["COOLDOWN_MINUTES"] * 2 ** min(extra_failures, 16),
+        )
+        return (record["last_failure"] or 0) + cooldown_minutes * 60
+
+    def split_available(
+        self, platforms: List[Dict], now: datetime
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """返回 (本轮请求的平台, 熔断跳过的平台)，冷却结束的熔断平台记入 probe_ids 只试探一次"""
+        self.probe_ids = set()
+        if not CONFIG["CIRCUIT_BREAKER"]["ENABLED"]:
+            return list(platforms), []
+
+        available, skipped = [], []
+        for platform in platforms:
+            open_until = self.open_until(platform["id"])
+            if open_until is None:
+                available.append(platform)
+            elif now.timestamp() >= open_until:
+                self.probe_ids.add(platform["id"])
+                available.append(platform)
+            else:
+                skipped.append(platform)
+        return available, skipped
+
+    def max_retries(self, platform_id: str, default: int) -> int:
+        """试探中的平台不重试"""
+        return 0 if platform_id in self.probe_ids else default
+
+    def record_success(self, platform_id: str, latency_ms: float) -> None:
+        with self._lock:
+            record = self._get_record(platform_id)
+            record["consecutive_failures"] = 0
+            record["last_success"] = time.time()
+            if record["latency_ms"] is None:
+                record["latency_ms"] = round(latency_ms, 1)
+            else:
+                record["latency_ms"] = round(
+                    self.LATENCY_ALPHA * latency_ms
+                    + (1 - self.LATENCY_ALPHA) * record["latency_ms"],
+                    1,
+                )
+
+    def record_failure(self, platform_id: str) -> None:
+        with self._lock:
+            record = self._get_record(platform_id)
+            record["consecutive_failures"] += 1
+            record["last_failure"] = time.time()
+
+    def save(self) -> None:
+        try:
+            self.health_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.health_file, "w", encoding="utf-8") as f:
+                json.dump(self.records, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"保存平台健康记录失败: {e}")
+
+    def summary(self, id_to_name: Optional[Dict] = None) -> List[str]:
+        """熔断中平台的摘要，每个平台一行"""
+        id_to_name = id_to_name or {}
+        beijing_tz = pytz.timezone("Asia/Shanghai")
+        lines = []
+        for platform_id, record in self.records.items():
+            open_until = self.open_until(platform_id)
+            if open_until is None:
+                continue
+            last_success = (
+                datetime.fromtimestamp(record["last_success"], beijing_tz).strftime(
+                    "%m-%d %H:%M"
+                )
+                if record["last_success"]
+                else "无"
+            )
+            next_probe = datetime.fromtimestamp(open_until, beijing_tz).strftime(
+                "%m-%d %H:%M"
+            )
+            lines.append(
+                f"{id_to_name.get(platform_id, platform_id)}: 连续失败 {record['consecutive_failures']} 次，"
+                f"最近成功 {last_success}，下次试探 {next_probe}"
+            )
+        return lines
+
+
 class DataFetcher:
     """数据获取器"""
 
-    def __init__(self, proxy_url: Optional[str] = None):
+    def __init__(
+        self,
+        proxy_url: Optional[str] = None,
+        max_concurrency: int = 1,
+        api_url: Optional[str] = None,
+    ):
         self.proxy_url = proxy_url
+        self.max_concurrency = max(1, max_concurrency)
+        self.api_url = api_url or CONFIG["CRAWLER_API_URL"]
 
     def fetch_data(
         self,
@@ -484,38 +1068,49 @@ class DataFetcher:
         max_retries: int = 2,
         min_retry_wait: int = 3,
         max_retry_wait: int = 5,
-    ) -> Tuple[Optional[str], str, str]:
-        """获取指定ID数据，支持重试"""
+        rate_limiter: Optional[HostRateLimiter] = None,
+        health: Optional[PlatformHealth] = None,
+        deadline: Optional[float] = None,
+    ) -> Tuple[Optional[Dict], str, str]:
+        """
+        获取指定ID数据，支持重试，返回解码后的响应
+
+        传入 health 时记录请求结果；deadline 为 time.monotonic() 截止时间，重试等待会超过截止时间时不再重试
+        """
         if isinstance(id_info, tuple):
             id_value, alias = id_info
         else:
             id_value = id_info
             alias = id_value
 
-        url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
+        if health:
+            max_retries = health.max_retries(id_value, max_retries)
 
-        proxies = None
-        if self.proxy_url:
-            proxies = {"http": self.proxy_url, "https": self.proxy_url}
+        url = f"{self.api_url}?id={id_value}&latest"
+        http_client = get_http_client()
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            "Connection": "keep-alive",
-            "Cache-Control": "no-cache",
-        }
+        def request():
+            # 只计请求本身的耗时，不含等待并发槽位和请求间隔的时间
+            start_time = time.monotonic()
+            response = http_client.get(
+                url,
+                proxy_url=self.proxy_url,
+                headers=CRAWLER_HEADERS,
+                timeout=10,
+            )
+            return response, (time.monotonic() - start_time) * 1000
 
         retries = 0
         while retries <= max_retries:
             try:
-                response = requests.get(
-                    url, proxies=proxies, headers=headers, timeout=10
-                )
+                if rate_limiter:
+                    with rate_limiter.slot(url):
+                        response, latency_ms = request()
+                else:
+                    response, latency_ms = request()
                 response.raise_for_status()
 
-                data_text = response.text
-                data_json = json.loads(data_text)
+                data_json = json.loads(response.text)
 
                 status = data_json.get("status", "未知")
                 if status not in ["success", "cache"]:
@@ -523,135 +1118,405 @@ class DataFetcher:
 
                 status_info = "最新数据" if status == "success" else "缓存数据"
                 print(f"获取 {id_value} 成功（{status_info}）")
-                return data_text, id_value, alias
+                if health:
+                    health.record_success(id_value, latency_ms)
+                return data_json, id_value, alias
 
             except Exception as e:
                 retries += 1
+                base_wait = random.uniform(min_retry_wait, max_retry_wait)
+                additional_wait = (retries - 1) * random.uniform(1, 2)
+                wait_time = base_wait + additional_wait
+                if deadline is not None and time.monotonic() + wait_time >= deadline:
+                    retries = max_retries + 1
                 if retries <= max_retries:
-                    base_wait = random.uniform(min_retry_wait, max_retry_wait)
-                    additional_wait = (retries - 1) * random.uniform(1, 2)
-                    wait_time = base_wait + additional_wait
                     print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
                     time.sleep(wait_time)
                 else:
                     print(f"请求 {id_value} 失败: {e}")
+                    if health:
+                        health.record_failure(id_value)
                     return None, id_value, alias
         return None, id_value, alias
 
+    def _parse_response(
+        self, id_value: str, data: Dict, results: Dict, failed_ids: List
+    ) -> None:
+        """将单个平台的响应转换为 NewsItem 记录，写入 results 或记录失败"""
+        try:
+            source_titles = results[id_value] = {}
+            for index, item in enumerate(data.get("items", []), 1):
+                title = item.get("title")
+                # 跳过无效标题（None、float、空字符串）
+                if title is None or isinstance(title, float) or not str(title).strip():
+                    continue
+                title = str(title).strip()
+
+                existing = source_titles.get(title)
+                if existing is not None:
+                    existing.add_rank(index)
+                else:
+                    source_titles[title] = NewsItem(
+                        [index], item.get("url", ""), item.get("mobileUrl", "")
+                    )
+        except Exception as e:
+            print(f"处理 {id_value} 数据出错: {e}")
+            failed_ids.append(id_value)
+
     def crawl_websites(
         self,
         ids_list: List[Union[str, Tuple[str, str]]],
         request_interval: int = CONFIG["REQUEST_INTERVAL"],
+        max_concurrency: Optional[int] = None,
+        health: Optional[PlatformHealth] = None,
+        priorities: Optional[Dict[str, int]] = None,
+        deadline_seconds: int = 0,
     ) -> Tuple[Dict, Dict, List]:
-        """爬取多个网站数据"""
+        """
+        爬取多个网站数据，max_concurrency > 1 时并发爬取，传入 health 时记录各平台健康状况
+
+        priorities 为 {平台ID: 优先级}，数值大的先爬取；deadline_seconds > 0 时为本次爬取的总时长上限，
+        到期后未开始的平台放弃并计入失败。返回结果始终按 ids_list 的顺序排列。
+        """
+        if max_concurrency is None:
+            max_concurrency = self.max_concurrency
+
         results = {}
         id_to_name = {}
         failed_ids = []
 
-        for i, id_info in enumerate(ids_list):
+        for id_info in ids_list:
             if isinstance(id_info, tuple):
                 id_value, name = id_info
             else:
                 id_value = id_info
                 name = id_value
-
             id_to_name[id_value] = name
-            response, _, _ = self.fetch_data(id_info)
 
+        platform_ids = list(id_to_name)
+        fetch_order = list(ids_list)
+        if priorities:
+            # 稳定排序：同优先级保持配置顺序
+            fetch_order.sort(
+                key=lambda id_info: -priorities.get(
+                    id_info[0] if isinstance(id_info, tuple) else id_info, 0
+                )
+            )
+
+        deadline = (
+            time.monotonic() + deadline_seconds if deadline_seconds > 0 else None
+        )
+        responses = {}
+        abandoned_ids = []
+
+        def fetch(id_info, rate_limiter=None):
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            return self.fetch_data(
+                id_info, rate_limiter=rate_limiter, health=health, deadline=deadline
+            )
+
+        if max_concurrency > 1 and len(ids_list) > 1:
+            # 并发模式：同一主机最多 max_concurrency 个在途请求，
+            # 每个并发槽位仍保持 request_interval 的请求间隔
+            rate_limiter = HostRateLimiter(max_concurrency, request_interval)
+            with ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(ids_list))
+            ) as executor:
+                futures = {
+                    executor.submit(fetch, id_info, rate_limiter): id_info
+                    for id_info in fetch_order
+                }
+                for future, id_info in futures.items():
+                    fetched = future.result()
+                    if fetched is None:
+                        abandoned_ids.append(
+                            id_info[0] if isinstance(id_info, tuple) else id_info
+                        )
+                    else:
+                        responses[fetched[1]] = fetched[0]
+        else:
+            for i, id_info in enumerate(fetch_order):
+                fetched = fetch(id_info)
+                if fetched is None:
+                    abandoned_ids.extend(
+                        item[0] if isinstance(item, tuple) else item
+                        for item in fetch_order[i:]
+                    )
+                    break
+                responses[fetched[1]] = fetched[0]
+
+                if i < len(fetch_order) - 1:
+                    actual_interval = request_interval + random.randint(-10, 20)
+                    actual_interval = max(50, actual_interval)
+                    time.sleep(actual_interval / 1000)
+
+        if abandoned_ids:
+            print(f"已达到爬取时长上限 {deadline_seconds} 秒，放弃: {abandoned_ids}")
+
+        # 按配置顺序整理结果，保证输出顺序与爬取顺序无关
+        for id_value in platform_ids:
+            response = responses.get(id_value)
             if response:
-                try:
-                    data = json.loads(response)
-                    results[id_value] = {}
-                    for index, item in enumerate(data.get("items", []), 1):
-                        title = item.get("title")
-                        # 跳过无效标题（None、float、空字符串）
-                        if title is None or isinstance(title, float) or not str(title).strip():
-                            continue
-                        title = str(title).strip()
-                        url = item.get("url", "")
-                        mobile_url = item.get("mobileUrl", "")
-
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                        else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url,
-                            }
-                except json.JSONDecodeError:
-                    print(f"解析 {id_value} 响应失败")
-                    failed_ids.append(id_value)
-                except Exception as e:
-                    print(f"处理 {id_value} 数据出错: {e}")
-                    failed_ids.append(id_value)
+                self._parse_response(id_value, response, results, failed_ids)
             else:
                 failed_ids.append(id_value)
 
-            if i < len(ids_list) - 1:
-                actual_interval = request_interval + random.randint(-10, 20)
-                actual_interval = max(50, actual_interval)
-                time.sleep(actual_interval / 1000)
-
         print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
         return results, id_to_name, failed_ids
 
 
 # === 数据处理 ===
-def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
-    """保存标题到文件"""
-    file_path = get_output_path("txt", f"{format_time_filename()}.txt")
-
-    with open(file_path, "w", encoding="utf-8") as f:
-        for id_value, title_data in results.items():
-            # id | name 或 id
-            name = id_to_name.get(id_value)
-            if name and name != id_value:
-                f.write(f"{id_value} | {name}\n")
+def write_snapshot(
+    results: Dict,
+    id_to_name: Dict,
+    failed_ids: List,
+    date_folder: str,
+    time_info: str,
+) -> Tuple[str, Dict, Dict, Dict]:
+    """
+    写入一个快照
+
+    Returns:
+        (快照位置, titles_by_id, id_to_name, unchanged)，后三项与 load_day_snapshot 读回该快照的结果相同，
+        titles_by_id 中是新建的 NewsItem，不与 results 共享
+    """
+    sorted_titles_by_id = {}
+    for id_value, title_data in results.items():
+        # 按排名排序标题
+        sorted_titles = []
+        for title, info in title_data.items():
+            cleaned_title = clean_title(title)
+            if isinstance(info, NewsItem):
+                ranks = info.ranks
+                url = info.url
+                mobile_url = info.mobile_url
+            elif isinstance(info, dict):
+                ranks = info.get("ranks", [])
+                url = info.get("url", "")
+                mobile_url = info.get("mobileUrl", "")
             else:
-                f.write(f"{id_value}\n")
-
-            # 按排名排序标题
-            sorted_titles = []
-            for title, info in title_data.items():
-                cleaned_title = clean_title(title)
-                if isinstance(info, dict):
-                    ranks = info.get("ranks", [])
-                    url = info.get("url", "")
-                    mobile_url = info.get("mobileUrl", "")
-                else:
-                    ranks = info if isinstance(info, list) else []
-                    url = ""
-                    mobile_url = ""
+                ranks = info if isinstance(info, list) else []
+                url = ""
+                mobile_url = ""
+
+            rank = ranks[0] if ranks else 1
+            # 可由标题或ID推出的链接只保存可变部分，渲染时展开
+            url = compact_url(id_value, "url", cleaned_title, url)
+            mobile_url = compact_url(id_value, "mobile_url", cleaned_title, mobile_url)
+            sorted_titles.append((rank, cleaned_title, url, mobile_url))
+
+        sorted_titles.sort(key=lambda x: x[0])
+        sorted_titles_by_id[id_value] = sorted_titles
+
+    # 内容与当天上次写入完全相同的平台（接口返回缓存数据时常见）只记录引用
+    fingerprints = load_platform_fingerprints(date_folder)
+    unchanged = {}
+    # 内容有变化的平台上次写入的 (快照时间, 距上次完整写入的增量次数)，作为增量快照的基准
+    delta_bases = {}
+    for id_value, sorted_titles in sorted_titles_by_id.items():
+        if not sorted_titles:
+            continue
+        fingerprint = compute_platform_fingerprint(sorted_titles)
+        previous = fingerprints.get(id_value)
+        if previous and previous[0] == fingerprint and previous[1] != time_info:
+            unchanged[id_value] = previous[1]
+            continue
+        # 旧格式的指纹没有增量次数，下次完整写入
+        if previous and len(previous) > 2 and previous[1] != time_info:
+            delta_bases[id_value] = (previous[1], previous[2])
+        fingerprints[id_value] = [fingerprint, time_info, 0]
+
+    if unchanged:
+        print(f"内容未变化的平台: {list(unchanged.keys())}")
+
+    # 与读回快照的结果一致：空平台不保留，同名标题保留首次出现的位置、最后一次的数据
+    snapshot_titles = {}
+    snapshot_id_to_name = {}
+    for id_value, sorted_titles in sorted_titles_by_id.items():
+        if id_value not in unchanged and sorted_titles:
+            source_titles = snapshot_titles[id_value] = {}
+            for rank, cleaned_title, url, mobile_url in sorted_titles:
+                source_titles[cleaned_title] = NewsItem([rank], url, mobile_url)
+        if id_value in unchanged or sorted_titles:
+            snapshot_id_to_name[id_value] = id_to_name.get(id_value) or id_value
 
-                rank = ranks[0] if ranks else 1
-                sorted_titles.append((rank, cleaned_title, url, mobile_url))
+    if use_sqlite_storage():
+        snapshot_path = save_titles_to_sqlite(
+            sorted_titles_by_id, id_to_name, failed_ids, unchanged, date_folder, time_info
+        )
+        save_platform_fingerprints(date_folder, fingerprints)
+        return snapshot_path, snapshot_titles, snapshot_id_to_name, unchanged
 
-            sorted_titles.sort(key=lambda x: x[0])
+    txt_dir = Path("output") / date_folder / "txt"
+    ensure_directory_exists(str(txt_dir))
+    file_path = str(txt_dir / f"{time_info}.txt")
+
+    delta_lines = {}
+    if CONFIG["STORAGE"]["DELTA_SNAPSHOTS"]:
+        delta_lines = encode_snapshot_deltas(
+            txt_dir, snapshot_titles, delta_bases, fingerprints
+        )
 
+    # 每个平台一个段落，文件首行为平台偏移索引，按平台读取时直接定位
+    sections = []
+    for id_value, sorted_titles in sorted_titles_by_id.items():
+        # id | name 或 id
+        name = id_to_name.get(id_value)
+        if name and name != id_value:
+            lines = [f"{id_value} | {name}"]
+        else:
+            lines = [id_value]
+
+        if id_value in unchanged:
+            lines.append(f"{UNCHANGED_PREFIX}{unchanged[id_value]}]")
+        elif id_value in delta_lines:
+            base_time, delta = delta_lines[id_value]
+            lines.append(f"{DELTA_PREFIX}{base_time}]")
+            lines.extend(delta)
+        else:
             for rank, cleaned_title, url, mobile_url in sorted_titles:
-                line = f"{rank}. {cleaned_title}"
+                lines.append(format_title_line(rank, cleaned_title, url, mobile_url))
 
-                if url:
-                    line += f" [URL:{url}]"
-                if mobile_url:
-                    line += f" [MOBILE:{mobile_url}]"
-                f.write(line + "\n")
+        sections.append((id_value, "\n".join(lines) + "\n\n"))
 
-            f.write("\n")
+    footer = ""
+    if failed_ids:
+        footer = "==== 以下ID请求失败 ====\n" + "".join(
+            f"{id_value}\n" for id_value in failed_ids
+        )
 
-        if failed_ids:
-            f.write("==== 以下ID请求失败 ====\n")
-            for id_value in failed_ids:
-                f.write(f"{id_value}\n")
+    get_storage().write_bytes(
+        f"{date_folder}/txt/{time_info}.txt", format_snapshot(sections, footer)
+    )
+
+    save_platform_fingerprints(date_folder, fingerprints)
+    return file_path, snapshot_titles, snapshot_id_to_name, unchanged
+
+
+def encode_snapshot_deltas(
+    txt_dir: Path,
+    snapshot_titles: Dict,
+    delta_bases: Dict[str, Tuple[str, int]],
+    fingerprints: Dict,
+) -> Dict[str, Tuple[str, List[str]]]:
+    """
+    以各平台上次写入的快照为基准编码增量，返回 {平台ID: (基准快照时间, 增量行)}
+
+    只记录进出榜和排名变化的标题，连续未变的标题合并为一个复制行；增量不比完整内容短、
+    或距上次完整写入已达 storage.keyframe_interval 次时完整写入（关键帧），限制读取时的引用链长度。
+    写入增量的平台在 fingerprints 中的增量次数加一。
+    """
+    interval = CONFIG["STORAGE"]["KEYFRAME_INTERVAL"]
+    load_base = directory_loader(txt_dir)
+    delta_lines = {}
+
+    for id_value, (base_time, chain) in delta_bases.items():
+        if chain + 1 >= interval or id_value not in snapshot_titles:
+            continue
+        try:
+            base = load_base(base_time)
+        except Exception as e:
+            print(f"读取增量基准快照 {base_time} 失败: {e}")
+            continue
+        if base is None or id_value not in base[0]:
+            continue
+
+        items = [
+            (title, (item.ranks[0], item.url, item.mobile_url))
+            for title, item in snapshot_titles[id_value].items()
+        ]
+        lines = encode_delta_lines(list(base[0][id_value].items()), items)
+        full_size = sum(
+            len(format_title_line(rank, title, url, mobile_url))
+            for title, (rank, url, mobile_url) in items
+        )
+        if sum(len(line) for line in lines) < full_size:
+            delta_lines[id_value] = (base_time, lines)
+            fingerprints[id_value][2] = chain + 1
+
+    return delta_lines
+
+
+def save_titles_to_sqlite(
+    sorted_titles_by_id: Dict,
+    id_to_name: Dict,
+    failed_ids: List,
+    unchanged: Dict[str, str],
+    date_folder: str,
+    time_info: str,
+) -> str:
+    """保存标题到 SQLite 快照库，返回 `数据库路径:日期目录/时间` 形式的快照位置"""
+    from storage.sqlite_store import folder_to_date
+
+    # 与写 txt 再解析回来的结果一致：同名标题保留首次出现的位置、最后一次的数据
+    titles_by_id = {}
+    for id_value, sorted_titles in sorted_titles_by_id.items():
+        if id_value in unchanged:
+            continue
+        source_titles = titles_by_id[id_value] = {}
+        for rank, cleaned_title, url, mobile_url in sorted_titles:
+            source_titles[cleaned_title] = (rank, url, mobile_url)
+
+    get_snapshot_store().save_snapshot(
+        folder_to_date(date_folder),
+        time_info,
+        {k: v for k, v in titles_by_id.items() if v},
+        {k: id_to_name.get(k) or k for k in sorted_titles_by_id},
+        failed_ids,
+        unchanged,
+    )
+    return f"{CONFIG['STORAGE']['SQLITE_PATH']}:{date_folder}/{time_info}"
+
+
+PLATFORM_FINGERPRINTS_FILENAME = ".platform_fingerprints.json"
+
+
+def compute_platform_fingerprint(sorted_titles: List[Tuple]) -> str:
+    """平台标题列表（排名、标题、链接）的内容指纹"""
+    content = "\n".join(
+        f"{rank}\t{title}\t{url}\t{mobile_url}"
+        for rank, title, url, mobile_url in sorted_titles
+    )
+    return hashlib.md5(content.encode("utf-8")).hexdigest()
+
+
+def load_platform_fingerprints(date_folder: str) -> Dict[str, List[str]]:
+    """读取当天各平台最近一次写入内容的 [内容指纹, 快照时间, 距上次完整写入的增量次数]，存储方式变化时作废"""
+    fingerprint_path = Path("output") / date_folder / PLATFORM_FINGERPRINTS_FILENAME
+    if not fingerprint_path.exists():
+        return {}
+
+    try:
+        with open(fingerprint_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("backend") != CONFIG["STORAGE"]["BACKEND"]:
+            return {}
+        return data["platforms"]
+    except Exception as e:
+        print(f"读取平台内容指纹失败: {e}")
+        return {}
 
-    return file_path
+
+def save_platform_fingerprints(date_folder: str, fingerprints: Dict) -> None:
+    """保存各平台的内容指纹"""
+    fingerprint_path = Path("output") / date_folder / PLATFORM_FINGERPRINTS_FILENAME
+    try:
+        fingerprint_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(fingerprint_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"backend": CONFIG["STORAGE"]["BACKEND"], "platforms": fingerprints},
+                f,
+                ensure_ascii=False,
+            )
+    except Exception as e:
+        print(f"保存平台内容指纹失败: {e}")
 
 
 def load_frequency_words(
     frequency_file: Optional[str] = None,
 ) -> Tuple[List[Dict], List[str]]:
-    """加载频率词配置"""
+    """加载频率词配置（文件未修改时复用已编译的配置，修改后下一次加载即生效）"""
     if frequency_file is None:
         frequency_file = os.environ.get(
             "FREQUENCY_WORDS_PATH", "config/frequency_words.txt"
@@ -661,384 +1526,538 @@ def load_frequency_words(
     if not frequency_path.exists():
         raise FileNotFoundError(f"频率词文件 {frequency_file} 不存在")
 
-    with open(frequency_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    word_groups = [group.strip() for group in content.split("\n\n") if group.strip()]
-
-    processed_groups = []
-    filter_words = []
-
-    for group in word_groups:
-        words = [word.strip() for word in group.split("\n") if word.strip()]
+    config = load_keyword_config(frequency_path)
+    return config.word_groups, config.filter_words
 
-        group_required_words = []
-        group_normal_words = []
-        group_filter_words = []
-        group_max_count = 0  # 默认不限制
 
-        for word in words:
-            if word.startswith("@"):
-                # 解析最大显示数量（只接受正整数）
-                try:
-                    count = int(word[1:])
-                    if count > 0:
-                        group_max_count = count
-                except (ValueError, IndexError):
-                    pass  # 忽略无效的@数字格式
-            elif word.startswith("!"):
-                filter_words.append(word[1:])
-                group_filter_words.append(word[1:])
-            elif word.startswith("+"):
-                group_required_words.append(word[1:])
-            else:
-                group_normal_words.append(word)
+def parse_file_titles(file_path: Path) -> Tuple[Dict, Dict]:
+    """解析单个txt文件的标题数据，返回(titles_by_id, id_to_name)，未变化的平台从引用的快照中读取"""
+    load_base = day_snapshot_loader(Path(file_path).parent)
+    stored_titles, id_to_name, _, _ = resolve_unchanged(
+        parse_snapshot_file(file_path, load_base), load_base
+    )
+    return to_news_items(stored_titles), id_to_name
 
-        if group_required_words or group_normal_words:
-            if group_normal_words:
-                group_key = " ".join(group_normal_words)
-            else:
-                group_key = " ".join(group_required_words)
 
-            processed_groups.append(
-                {
-                    "required": group_required_words,
-                    "normal": group_normal_words,
-                    "group_key": group_key,
-                    "max_count": group_max_count,  # 新增字段
-                }
-            )
+def parse_snapshot_titles(file_path: Path) -> Tuple[Dict, Dict, Dict]:
+    """解析单个txt文件，返回(titles_by_id, id_to_name, unchanged)，unchanged 为 {平台ID: 内容相同的快照时间}"""
+    stored_titles, id_to_name, _, unchanged = parse_snapshot_file(
+        file_path, day_snapshot_loader(Path(file_path).parent)
+    )
+    return to_news_items(stored_titles), id_to_name, unchanged
 
-    return processed_groups, filter_words
 
+def to_news_items(stored_titles: Dict) -> Dict:
+    """把 {平台ID: {标题: (rank, url, mobile_url)}} 转换为 {平台ID: {标题: NewsItem}}"""
+    return {
+        source_id: {
+            title: NewsItem([rank], url, mobile_url)
+            for title, (rank, url, mobile_url) in titles.items()
+        }
+        for source_id, titles in stored_titles.items()
+    }
 
-def parse_file_titles(file_path: Path) -> Tuple[Dict, Dict]:
-    """解析单个txt文件的标题数据，返回(titles_by_id, id_to_name)"""
-    titles_by_id = {}
-    id_to_name = {}
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-        sections = content.split("\n\n")
+# 快照存储后端（txt 文件或 SQLite 数据库）
+_snapshot_store = None
 
-        for section in sections:
-            if not section.strip() or "==== 以下ID请求失败 ====" in section:
-                continue
 
-            lines = section.strip().split("\n")
-            if len(lines) < 2:
-                continue
+def use_sqlite_storage() -> bool:
+    """是否使用 SQLite 快照存储"""
+    return CONFIG["STORAGE"]["BACKEND"] == "sqlite"
 
-            # id | name 或 id
-            header_line = lines[0].strip()
-            if " | " in header_line:
-                parts = header_line.split(" | ", 1)
-                source_id = parts[0].strip()
-                name = parts[1].strip()
-                id_to_name[source_id] = name
-            else:
-                source_id = header_line
-                id_to_name[source_id] = source_id
 
-            titles_by_id[source_id] = {}
+def get_snapshot_store():
+    """获取全局 SQLite 快照存储实例"""
+    global _snapshot_store
+    if _snapshot_store is None:
+        from storage.sqlite_store import SQLiteSnapshotStore
 
-            for line in lines[1:]:
-                if line.strip():
-                    try:
-                        title_part = line.strip()
-                        rank = None
-
-                        # 提取排名
-                        if ". " in title_part and title_part.split(". ")[0].isdigit():
-                            rank_str, title_part = title_part.split(". ", 1)
-                            rank = int(rank_str)
-
-                        # 提取 MOBILE URL
-                        mobile_url = ""
-                        if " [MOBILE:" in title_part:
-                            title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
-                            if mobile_part.endswith("]"):
-                                mobile_url = mobile_part[:-1]
-
-                        # 提取 URL
-                        url = ""
-                        if " [URL:" in title_part:
-                            title_part, url_part = title_part.rsplit(" [URL:", 1)
-                            if url_part.endswith("]"):
-                                url = url_part[:-1]
-
-                        title = clean_title(title_part.strip())
-                        ranks = [rank] if rank is not None else [1]
-
-                        titles_by_id[source_id][title] = {
-                            "ranks": ranks,
-                            "url": url,
-                            "mobileUrl": mobile_url,
-                        }
+        _snapshot_store = SQLiteSnapshotStore(CONFIG["STORAGE"]["SQLITE_PATH"])
+    return _snapshot_store
 
-                    except Exception as e:
-                        print(f"解析标题行出错: {line}, 错误: {e}")
 
-    return titles_by_id, id_to_name
+def list_day_snapshots(date_folder: str) -> List[List]:
+    """列出指定日期的快照，返回按时间排序的 [时间, 签名]，签名变化说明快照被改写"""
+    if use_sqlite_storage():
+        from storage.sqlite_store import folder_to_date
 
+        return [
+            [time_info, title_count]
+            for time_info, title_count in get_snapshot_store().list_snapshots(
+                folder_to_date(date_folder)
+            )
+        ]
 
-def read_all_today_titles(
-    current_platform_ids: Optional[List[str]] = None,
-) -> Tuple[Dict, Dict, Dict]:
-    """读取当天所有标题文件，支持按当前监控平台过滤"""
-    date_folder = format_date_folder()
+    # 对象存储时先下载其他节点写入的快照
+    get_storage().sync(f"{date_folder}/txt/")
     txt_dir = Path("output") / date_folder / "txt"
-
     if not txt_dir.exists():
-        return {}, {}, {}
-
-    all_results = {}
-    final_id_to_name = {}
-    title_info = {}
+        return []
 
     files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
+    return [[f.stem, f.stat().st_size] for f in files]
+
 
-    for file_path in files:
-        time_info = file_path.stem
+def load_day_snapshot(date_folder: str, time_info: str) -> Tuple[Dict, Dict, Dict]:
+    """读取指定日期的单个快照，返回(titles_by_id, id_to_name, unchanged)，未变化的平台只返回引用"""
+    if not use_sqlite_storage():
+        return parse_snapshot_titles(
+            Path("output") / date_folder / "txt" / f"{time_info}.txt"
+        )
 
-        titles_by_id, file_id_to_name = parse_file_titles(file_path)
+    from storage.sqlite_store import folder_to_date
 
-        if current_platform_ids is not None:
-            filtered_titles_by_id = {}
-            filtered_id_to_name = {}
+    store = get_snapshot_store()
+    date = folder_to_date(date_folder)
+    stored_titles, id_to_name = store.read_snapshot(date, time_info)
+    unchanged = {
+        source_id: since_time
+        for _, source_id, since_time in store.list_unchanged(date, time_info)
+    }
+    return to_news_items(stored_titles), id_to_name, unchanged
 
-            for source_id, title_data in titles_by_id.items():
-                if source_id in current_platform_ids:
-                    filtered_titles_by_id[source_id] = title_data
-                    if source_id in file_id_to_name:
-                        filtered_id_to_name[source_id] = file_id_to_name[source_id]
 
-            titles_by_id = filtered_titles_by_id
-            file_id_to_name = filtered_id_to_name
+def load_day_snapshots(date_folder: str, times: List[str]) -> List[Tuple[Dict, Dict, Dict]]:
+    """
+    读取指定日期的多个快照，返回与 times 顺序相同的 (titles_by_id, id_to_name, unchanged) 列表
 
-        final_id_to_name.update(file_id_to_name)
+    txt 存储且快照较多时（如冷启动重建当日聚合）在进程池中并行解析，进程数由 storage.load_workers 配置。
+    """
+    if use_sqlite_storage():
+        return [load_day_snapshot(date_folder, time_info) for time_info in times]
 
-        for source_id, title_data in titles_by_id.items():
-            process_source_data(
-                source_id, title_data, time_info, all_results, title_info
-            )
+    from storage.snapshot_loader import parse_snapshot_files
 
-    return all_results, final_id_to_name, title_info
+    txt_dir = Path("output") / date_folder / "txt"
+    snapshots = []
+    for parsed in parse_snapshot_files(
+        [txt_dir / f"{time_info}.txt" for time_info in times],
+        CONFIG["STORAGE"]["LOAD_WORKERS"],
+    ):
+        if isinstance(parsed, Exception):
+            raise parsed
+        stored_titles, id_to_name, _, unchanged = parsed
+        snapshots.append((to_news_items(stored_titles), id_to_name, unchanged))
+    return snapshots
+
+
+def read_all_today_titles(
+    current_platform_ids: Optional[List[str]] = None,
+) -> Tuple[Dict, Dict, Dict]:
+    """读取当天所有标题数据（基于当日聚合，只解析新增快照），支持按当前监控平台过滤"""
+    return get_day_aggregate().get_view(current_platform_ids)
 
 
 def process_source_data(
     source_id: str,
     title_data: Dict,
-    time_info: str,
+    timeline: List[str],
+    index: int,
     all_results: Dict,
     title_info: Dict,
 ) -> None:
-    """处理来源数据，合并重复标题"""
+    """处理来源数据，合并重复标题
+
+    title_data 为 timeline[index] 快照中该平台的记录。all_results 与 title_info 共享同一批 NewsItem 记录，
+    合并时把排名追加到已有记录的排名历史中，不再复制字典。
+    """
     if source_id not in all_results:
         all_results[source_id] = title_data
+        source_info = title_info.setdefault(source_id, {})
 
-        if source_id not in title_info:
-            title_info[source_id] = {}
-
-        for title, data in title_data.items():
-            ranks = data.get("ranks", [])
-            url = data.get("url", "")
-            mobile_url = data.get("mobileUrl", "")
-
-            title_info[source_id][title] = {
-                "first_time": time_info,
-                "last_time": time_info,
-                "count": 1,
-                "ranks": ranks,
-                "url": url,
-                "mobileUrl": mobile_url,
-            }
+        for title, item in title_data.items():
+            item.stamp(timeline, index)
+            source_info[title] = item
     else:
-        for title, data in title_data.items():
-            ranks = data.get("ranks", [])
-            url = data.get("url", "")
-            mobile_url = data.get("mobileUrl", "")
+        existing_titles = all_results[source_id]
+        source_info = title_info.setdefault(source_id, {})
+
+        for title, item in title_data.items():
+            existing = existing_titles.get(title)
+            if existing is None:
+                item.stamp(timeline, index)
+                existing_titles[title] = item
+                source_info[title] = item
+            else:
+                existing.merge(item, index)
+                if not existing.url:
+                    existing.url = item.url
+                if not existing.mobile_url:
+                    existing.mobile_url = item.mobile_url
 
-            if title not in all_results[source_id]:
-                all_results[source_id][title] = {
-                    "ranks": ranks,
-                    "url": url,
-                    "mobileUrl": mobile_url,
-                }
-                title_info[source_id][title] = {
-                    "first_time": time_info,
-                    "last_time": time_info,
-                    "count": 1,
-                    "ranks": ranks,
-                    "url": url,
-                    "mobileUrl": mobile_url,
-                }
+
+def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -> Dict:
+    """检测当日最新批次的新增标题，支持按当前监控平台过滤"""
+    return get_day_aggregate().detect_new_titles(current_platform_ids)
+
+
+# === 当日聚合 ===
+DAY_AGGREGATE_FILENAME = ".day_aggregate.json"
+
+
+class DayAggregate:
+    """当日标题聚合：title_info 持久化到日期目录，每次运行只合并新增的快照"""
+
+    FORMAT_VERSION = 3
+
+    def __init__(self, date_folder: str):
+        self.date_folder = date_folder
+        self.sidecar_path = day_sidecar_path(date_folder, DAY_AGGREGATE_FILENAME)
+        self._reset()
+
+    def _reset(self) -> None:
+        self.all_results: Dict[str, Dict[str, NewsItem]] = {}
+        self.title_info: Dict[str, Dict[str, NewsItem]] = {}
+        self.id_to_name: Dict[str, str] = {}
+        # 已合并的快照：[时间, 签名]（txt 为文件大小，sqlite 为标题数），用于判断聚合是否与存储一致
+        self.snapshots: List[List] = []
+        # 已合并快照的时间，记录的排名历史以其下标表示快照
+        self.timeline: List[str] = []
+        # 各平台当天第一次抓取到标题的快照时间（该快照只作为基准，其中的标题不算新增）
+        self.baseline_times: Dict[str, str] = {}
+        # 最近合并的快照中首次出现的标题 {平台ID: {标题: NewsItem}}，及该快照的时间
+        self._new_titles: Dict[str, Dict[str, NewsItem]] = {}
+        self._new_titles_time: Optional[str] = None
+        self._dirty = False
+
+    @property
+    def latest_time(self) -> Optional[str]:
+        return self.snapshots[-1][0] if self.snapshots else None
+
+    def load(self) -> None:
+        """读取持久化的聚合数据，格式不符时忽略"""
+        self._reset()
+        if not self.sidecar_path.exists():
+            return
+
+        try:
+            with open(self.sidecar_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.FORMAT_VERSION:
+                return
+
+            self.snapshots = data["snapshots"]
+            self.timeline.extend(time_info for time_info, _ in self.snapshots)
+            for source_id, titles in data["titles"].items():
+                source_titles = {}
+                for title, (indexes, ranks, url, mobile_url) in titles.items():
+                    source_titles[title] = NewsItem.from_history(
+                        self.timeline, indexes, ranks, url, mobile_url
+                    )
+                self.all_results[source_id] = source_titles
+                self.title_info[source_id] = dict(source_titles)
+
+            self.id_to_name = data["id_to_name"]
+            self.baseline_times = data["baseline_times"]
+        except Exception as e:
+            print(f"读取当日聚合数据失败，将重新构建: {e}")
+            self._reset()
+
+    def save(self) -> None:
+        """持久化聚合数据（无变化时跳过）"""
+        if not self._dirty:
+            return
+
+        titles = {}
+        for source_id, source_titles in self.all_results.items():
+            titles[source_id] = {
+                title: [
+                    item.snapshot_indexes.tolist(),
+                    item.rank_history.tolist(),
+                    item.url,
+                    item.mobile_url,
+                ]
+                for title, item in source_titles.items()
+            }
+
+        data = {
+            "version": self.FORMAT_VERSION,
+            "snapshots": self.snapshots,
+            "id_to_name": self.id_to_name,
+            "baseline_times": self.baseline_times,
+            "titles": titles,
+        }
+
+        try:
+            self.sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.sidecar_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.sidecar_path)
+            self._dirty = False
+        except Exception as e:
+            print(f"保存当日聚合数据失败: {e}")
+
+    def add_snapshot(
+        self,
+        time_info: str,
+        titles_by_id: Dict,
+        id_to_name: Dict,
+        size: int,
+        unchanged: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """合并一个快照，unchanged 中的平台内容与其上次抓取相同，直接顺延而不重新合并"""
+        self.id_to_name.update(id_to_name)
+        # 合并时顺带记录首次出现的标题（增量快照中即进榜的标题），新增标题检测不再扫描全天数据
+        self._new_titles = {}
+        self._new_titles_time = time_info
+        self.timeline.append(time_info)
+        index = len(self.timeline) - 1
+        for source_id, title_data in titles_by_id.items():
+            # 平台当天的第一次抓取（如按 interval 爬取的平台在当天晚些时候才首次到期）只作为基准，不算新增
+            if source_id not in self.baseline_times:
+                if title_data:
+                    self.baseline_times[source_id] = time_info
             else:
-                existing_data = all_results[source_id][title]
-                existing_ranks = existing_data.get("ranks", [])
-                existing_url = existing_data.get("url", "")
-                existing_mobile_url = existing_data.get("mobileUrl", "")
-
-                merged_ranks = existing_ranks.copy()
-                for rank in ranks:
-                    if rank not in merged_ranks:
-                        merged_ranks.append(rank)
-
-                all_results[source_id][title] = {
-                    "ranks": merged_ranks,
-                    "url": existing_url or url,
-                    "mobileUrl": existing_mobile_url or mobile_url,
+                existing_titles = self.all_results.get(source_id, {})
+                source_new_titles = {
+                    title: item
+                    for title, item in title_data.items()
+                    if title not in existing_titles
                 }
+                if source_new_titles:
+                    self._new_titles[source_id] = source_new_titles
+            process_source_data(
+                source_id, title_data, self.timeline, index, self.all_results, self.title_info
+            )
+        for source_id in unchanged or {}:
+            self._touch_source(source_id, index)
+        self.snapshots.append([time_info, size])
+        self._dirty = True
+
+    def _touch_source(self, source_id: str, index: int) -> None:
+        """平台最近一次抓取的标题以相同排名再次出现（等价于合并同样的内容）"""
+        source_titles = self.all_results.get(source_id)
+        if not source_titles:
+            return
 
-                title_info[source_id][title]["last_time"] = time_info
-                title_info[source_id][title]["ranks"] = merged_ranks
-                title_info[source_id][title]["count"] += 1
-                if not title_info[source_id][title].get("url"):
-                    title_info[source_id][title]["url"] = url
-                if not title_info[source_id][title].get("mobileUrl"):
-                    title_info[source_id][title]["mobileUrl"] = mobile_url
+        latest_index = max(item.last_index for item in source_titles.values())
+        for item in source_titles.values():
+            if item.last_index == latest_index:
+                item.repeat_latest(index)
 
+    def add_saved_snapshot(
+        self,
+        time_info: str,
+        titles_by_id: Dict,
+        id_to_name: Dict,
+        unchanged: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """合并本次运行刚写入的快照（内存中的数据），不再回读；存储中还有其他变化时按 refresh 处理"""
+        signatures = list_day_snapshots(self.date_folder)
+        processed = len(self.snapshots)
+        if (
+            len(signatures) != processed + 1
+            or signatures[:processed] != self.snapshots
+            or signatures[-1][0] != time_info
+        ):
+            self.refresh()
+            return
 
-def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -> Dict:
-    """检测当日最新批次的新增标题，支持按当前监控平台过滤"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
+        self.add_snapshot(
+            time_info, titles_by_id, id_to_name, signatures[-1][1], unchanged
+        )
+        self.save()
+
+    def refresh(self) -> int:
+        """合并尚未处理的快照，返回本次读取的快照数"""
+        signatures = list_day_snapshots(self.date_folder)
+        if not signatures:
+            if self.snapshots:
+                self._reset()
+            return 0
+
+        processed = len(self.snapshots)
+        if signatures[:processed] != self.snapshots:
+            # 已合并的快照被修改、删除或有更早的快照插入，重新构建
+            if self.snapshots:
+                print("当日聚合数据与快照文件不一致，重新构建")
+            self._reset()
+            processed = 0
+
+        pending = signatures[processed:]
+        snapshots = load_day_snapshots(
+            self.date_folder, [time_info for time_info, _ in pending]
+        )
+        for (time_info, size), (titles_by_id, file_id_to_name, unchanged) in zip(
+            pending, snapshots
+        ):
+            self.add_snapshot(time_info, titles_by_id, file_id_to_name, size, unchanged)
+
+        self.save()
+        return len(signatures) - processed
+
+    def get_view(
+        self, platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict, Dict]:
+        """返回 (all_results, id_to_name, title_info)，可按平台过滤"""
+        if platform_ids is None:
+            return self.all_results, self.id_to_name, self.title_info
+
+        wanted = set(platform_ids)
+        return (
+            {k: v for k, v in self.all_results.items() if k in wanted},
+            {k: v for k, v in self.id_to_name.items() if k in wanted},
+            {k: v for k, v in self.title_info.items() if k in wanted},
+        )
 
-    if not txt_dir.exists():
-        return {}
+    def detect_new_titles(self, platform_ids: Optional[List[str]] = None) -> Dict:
+        """最新快照中首次出现的标题（首次出现时间等于最新快照时间）"""
+        if len(self.snapshots) < 2:
+            return {}
 
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-    if len(files) < 2:
-        return {}
+        latest_time = self.latest_time
+        wanted = set(platform_ids) if platform_ids is not None else None
 
-    # 解析最新文件
-    latest_file = files[-1]
-    latest_titles, _ = parse_file_titles(latest_file)
-
-    # 如果指定了当前平台列表，过滤最新文件数据
-    if current_platform_ids is not None:
-        filtered_latest_titles = {}
-        for source_id, title_data in latest_titles.items():
-            if source_id in current_platform_ids:
-                filtered_latest_titles[source_id] = title_data
-        latest_titles = filtered_latest_titles
-
-    # 汇总历史标题（按平台过滤）
-    historical_titles = {}
-    for file_path in files[:-1]:
-        historical_data, _ = parse_file_titles(file_path)
-
-        # 过滤历史数据
-        if current_platform_ids is not None:
-            filtered_historical_data = {}
-            for source_id, title_data in historical_data.items():
-                if source_id in current_platform_ids:
-                    filtered_historical_data[source_id] = title_data
-            historical_data = filtered_historical_data
-
-        for source_id, titles_data in historical_data.items():
-            if source_id not in historical_titles:
-                historical_titles[source_id] = set()
-            for title in titles_data.keys():
-                historical_titles[source_id].add(title)
-
-    # 找出新增标题
-    new_titles = {}
-    for source_id, latest_source_titles in latest_titles.items():
-        historical_set = historical_titles.get(source_id, set())
-        source_new_titles = {}
-
-        for title, title_data in latest_source_titles.items():
-            if title not in historical_set:
-                source_new_titles[title] = title_data
-
-        if source_new_titles:
-            new_titles[source_id] = source_new_titles
-
-    return new_titles
+        new_titles = {}
+        if self._new_titles_time == latest_time:
+            for source_id in self.title_info:
+                if source_id in self._new_titles and (
+                    wanted is None or source_id in wanted
+                ):
+                    new_titles[source_id] = dict(self._new_titles[source_id])
+            return new_titles
 
+        # 从持久化数据恢复、尚未合并新快照时按首次出现时间扫描
+        for source_id, source_titles in self.title_info.items():
+            if wanted is not None and source_id not in wanted:
+                continue
+            # 最新快照是该平台当天的第一次抓取时只作为基准
+            if self.baseline_times.get(source_id) == latest_time:
+                continue
+            source_new_titles = {
+                title: item
+                for title, item in source_titles.items()
+                if item.first_time == latest_time
+            }
+            if source_new_titles:
+                new_titles[source_id] = source_new_titles
 
-# === 统计和分析 ===
-def calculate_news_weight(
-    title_data: Dict, rank_threshold: int = CONFIG["RANK_THRESHOLD"]
-) -> float:
-    """计算新闻权重，用于排序"""
-    ranks = title_data.get("ranks", [])
-    if not ranks:
-        return 0.0
+        return new_titles
 
-    count = title_data.get("count", len(ranks))
-    weight_config = CONFIG["WEIGHT_CONFIG"]
 
-    # 排名权重：Σ(11 - min(rank, 10)) / 出现次数
-    rank_scores = []
-    for rank in ranks:
-        score = 11 - min(rank, 10)
-        rank_scores.append(score)
+# 进程内缓存的当日聚合（按日期目录）
+_day_aggregates: Dict[str, DayAggregate] = {}
 
-    rank_weight = sum(rank_scores) / len(ranks) if ranks else 0
 
-    # 频次权重：min(出现次数, 10) × 10
-    frequency_weight = min(count, 10) * 10
+def get_day_aggregate(date_folder: Optional[str] = None) -> DayAggregate:
+    """获取指定日期（默认今天）的聚合数据，并合并新增快照"""
+    if date_folder is None:
+        date_folder = format_date_folder()
 
-    # 热度加成：高排名次数 / 总出现次数 × 100
-    high_rank_count = sum(1 for rank in ranks if rank <= rank_threshold)
-    hotness_ratio = high_rank_count / len(ranks) if ranks else 0
-    hotness_weight = hotness_ratio * 100
+    aggregate = _day_aggregates.get(date_folder)
+    if aggregate is None:
+        aggregate = DayAggregate(date_folder)
+        aggregate.load()
+        _day_aggregates[date_folder] = aggregate
 
-    total_weight = (
-        rank_weight * weight_config["RANK_WEIGHT"]
-        + frequency_weight * weight_config["FREQUENCY_WEIGHT"]
-        + hotness_weight * weight_config["HOTNESS_WEIGHT"]
-    )
+    aggregate.refresh()
+    return aggregate
 
-    return total_weight
 
+class RunContext:
+    """
+    单次运行的快照上下文
 
-def matches_word_groups(
-    title: str, word_groups: List[Dict], filter_words: List[str]
-) -> bool:
-    """检查标题是否匹配词组规则"""
-    # 防御性类型检查：确保 title 是有效字符串
-    if not isinstance(title, str):
-        title = str(title) if title is not None else ""
-    if not title.strip():
-        return False
+    本次抓取结果只写入一次，当日聚合直接合并内存中的快照，
+    新增标题和统计所需的当日数据都从这里获取，不再回读刚写入的快照。
+    """
 
-    # 如果没有配置词组，则匹配所有标题（支持显示全部新闻）
-    if not word_groups:
-        return True
+    def __init__(self, results: Dict, id_to_name: Dict, failed_ids: List):
+        self.results = results
+        self.id_to_name = id_to_name
+        self.failed_ids = failed_ids
+        self.date_folder = format_date_folder()
+        self.time_info = format_time_filename()
+        self.snapshot_path: Optional[str] = None
+        self.aggregate: Optional[DayAggregate] = None
+
+    def save(self) -> str:
+        """写入快照并合并到当日聚合，返回快照位置"""
+        # 先合并之前的快照（通常已是最新），再写入本次快照
+        aggregate = get_day_aggregate(self.date_folder)
+        self.snapshot_path, titles_by_id, id_to_name, unchanged = write_snapshot(
+            self.results,
+            self.id_to_name,
+            self.failed_ids,
+            self.date_folder,
+            self.time_info,
+        )
+        aggregate.add_saved_snapshot(self.time_info, titles_by_id, id_to_name, unchanged)
+        self.aggregate = aggregate
+        return self.snapshot_path
 
-    title_lower = title.lower()
+    def get_day_view(
+        self, platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict, Dict]:
+        """当日数据 (all_results, id_to_name, title_info)，可按平台过滤"""
+        return self.aggregate.get_view(platform_ids)
 
-    # 过滤词检查
-    if any(filter_word.lower() in title_lower for filter_word in filter_words):
-        return False
+    def detect_new_titles(self, platform_ids: Optional[List[str]] = None) -> Dict:
+        """本次快照中首次出现的标题"""
+        return self.aggregate.detect_new_titles(platform_ids)
 
-    # 词组匹配检查
-    for group in word_groups:
-        required_words = group["required"]
-        normal_words = group["normal"]
 
-        # 必须词检查
-        if required_words:
-            all_required_present = all(
-                req_word.lower() in title_lower for req_word in required_words
-            )
-            if not all_required_present:
-                continue
+def reset_day_state(date_folder: Optional[str] = None) -> None:
+    """跨日时释放其他日期的聚合数据（守护进程模式下每轮执行前调用）"""
+    if date_folder is None:
+        date_folder = format_date_folder()
 
-        # 普通词检查
-        if normal_words:
-            any_normal_present = any(
-                normal_word.lower() in title_lower for normal_word in normal_words
-            )
-            if not any_normal_present:
-                continue
+    for stale_folder in [k for k in _day_aggregates if k != date_folder]:
+        print(f"日期切换，释放 {stale_folder} 的当日聚合数据")
+        del _day_aggregates[stale_folder]
+    for stale_key in [k for k in _match_caches if k[0] != date_folder]:
+        _match_caches.pop(stale_key).save()
 
-        return True
 
-    return False
+# === 标题匹配缓存 ===
+MATCH_CACHE_FILENAME = ".match_cache.json"
+
+# 进程内缓存的当日标题匹配结果（按日期目录和规则指纹）
+_match_caches: Dict[Tuple[str, str], MatchCache] = {}
+
+
+def get_match_cache(
+    word_groups: List[Dict], filter_words: List[str], date_folder: Optional[str] = None
+) -> MatchCache:
+    """
+    获取指定日期（默认今天）的标题匹配缓存
+
+    缓存保存在日期目录下，每套关键词规则（规则指纹）各有一份，同一轮中交替使用的规则
+    （如全部新闻模式的虚拟词组和报告中的关键词）互不覆盖，当天每个标题在同一规则下只匹配一次。
+    """
+    if date_folder is None:
+        date_folder = format_date_folder()
+
+    matcher = get_word_matcher(word_groups, filter_words)
+    key = (date_folder, matcher.fingerprint)
+    cache = _match_caches.get(key)
+    if cache is None:
+        cache = MatchCache(matcher, day_sidecar_path(date_folder, MATCH_CACHE_FILENAME))
+        _match_caches[key] = cache
+    return cache
+
+
+def save_match_caches() -> None:
+    """持久化本轮新增的标题匹配结果"""
+    for cache in _match_caches.values():
+        cache.save()
+
+
+# === 统计和分析 ===
+def calculate_news_weight(
+    title_data: Dict, rank_threshold: int = CONFIG["RANK_THRESHOLD"]
+) -> float:
+    """计算新闻权重，用于排序（批量计算见 calculate_news_weights）"""
+    return calculate_news_weights([title_data], rank_threshold, CONFIG["WEIGHT_CONFIG"])[0]
+
+
+def matches_word_groups(
+    title: str, word_groups: List[Dict], filter_words: List[str]
+) -> bool:
+    """检查标题是否匹配词组规则（未配置词组时匹配所有标题）"""
+    return get_word_matcher(word_groups, filter_words).matches(title)
 
 
 def format_time_display(first_time: str, last_time: str) -> str:
@@ -1124,25 +2143,27 @@ def count_word_frequency(
     elif mode == "current":
         # current 模式：只处理当前时间批次的新闻，但统计信息来自全部历史
         if title_info:
-            latest_time = None
-            for source_titles in title_info.values():
+            # 按平台取最新时间：按 interval 跳过的平台以其最近一次爬取的榜单为准
+            source_latest_times = {}
+            for source_id, source_titles in title_info.items():
                 for title_data in source_titles.values():
-                    last_time = title_data.get("last_time", "")
-                    if last_time:
-                        if latest_time is None or last_time > latest_time:
-                            latest_time = last_time
+                    last_time = title_data.last_time
+                    if last_time and last_time > source_latest_times.get(source_id, ""):
+                        source_latest_times[source_id] = last_time
+            latest_time = max(source_latest_times.values(), default=None)
 
-            # 只处理 last_time 等于最新时间的新闻
+            # 只处理 last_time 等于所在平台最新时间的新闻
             if latest_time:
                 results_to_process = {}
                 for source_id, source_titles in results.items():
                     if source_id in title_info:
                         filtered_titles = {}
+                        source_info = title_info[source_id]
+                        source_latest_time = source_latest_times.get(source_id)
                         for title, title_data in source_titles.items():
-                            if title in title_info[source_id]:
-                                info = title_info[source_id][title]
-                                if info.get("last_time") == latest_time:
-                                    filtered_titles[title] = title_data
+                            info = source_info.get(title)
+                            if info is not None and info.last_time == source_latest_time:
+                                filtered_titles[title] = title_data
                         if filtered_titles:
                             results_to_process[source_id] = filtered_titles
 
@@ -1180,6 +2201,8 @@ def count_word_frequency(
         group_key = group["group_key"]
         word_stats[group_key] = {"count": 0, "titles": {}}
 
+    matcher = get_match_cache(word_groups, filter_words)
+
     for source_id, titles_data in results_to_process.items():
         total_titles += len(titles_data)
 
@@ -1190,12 +2213,9 @@ def count_word_frequency(
             if title in processed_titles.get(source_id, {}):
                 continue
 
-            # 使用统一的匹配逻辑
-            matches_frequency_words = matches_word_groups(
-                title, word_groups, filter_words
-            )
-
-            if not matches_frequency_words:
+            # 一次扫描得到过滤结果和第一个命中的词组
+            group_index = matcher.match(title)
+            if group_index is None:
                 continue
 
             # 如果是增量模式或 current 模式第一次，统计匹配的新增新闻数量
@@ -1204,119 +2224,70 @@ def count_word_frequency(
             ):
                 matched_new_count += 1
 
-            source_ranks = title_data.get("ranks", [])
-            source_url = title_data.get("url", "")
-            source_mobile_url = title_data.get("mobileUrl", "")
-
-            # 找到匹配的词组（防御性转换确保类型安全）
-            title_lower = str(title).lower() if not isinstance(title, str) else title.lower()
-            for group in word_groups:
-                required_words = group["required"]
-                normal_words = group["normal"]
-
-                # 如果是"全部新闻"模式，所有标题都匹配第一个（唯一的）词组
-                if len(word_groups) == 1 and word_groups[0]["group_key"] == "全部新闻":
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-                else:
-                    # 原有的匹配逻辑
-                    if required_words:
-                        all_required_present = all(
-                            req_word.lower() in title_lower
-                            for req_word in required_words
-                        )
-                        if not all_required_present:
-                            continue
-
-                    if normal_words:
-                        any_normal_present = any(
-                            normal_word.lower() in title_lower
-                            for normal_word in normal_words
-                        )
-                        if not any_normal_present:
-                            continue
-
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-
-                first_time = ""
-                last_time = ""
-                count_info = 1
-                ranks = source_ranks if source_ranks else []
-                url = source_url
-                mobile_url = source_mobile_url
-
-                # 对于 current 模式，从历史统计信息中获取完整数据
-                if (
-                    mode == "current"
-                    and title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-                elif (
-                    title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-
-                if not ranks:
-                    ranks = [99]
-
-                time_display = format_time_display(first_time, last_time)
-
-                source_name = id_to_name.get(source_id, source_id)
-
-                # 判断是否为新增
-                is_new = False
-                if all_news_are_new:
-                    # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
-                    is_new = True
-                elif new_titles and source_id in new_titles:
-                    # 检查是否在新增列表中
-                    new_titles_for_source = new_titles[source_id]
-                    is_new = title in new_titles_for_source
-
-                word_stats[group_key]["titles"][source_id].append(
-                    {
-                        "title": title,
-                        "source_name": source_name,
-                        "first_time": first_time,
-                        "last_time": last_time,
-                        "time_display": time_display,
-                        "count": count_info,
-                        "ranks": ranks,
-                        "rank_threshold": rank_threshold,
-                        "url": url,
-                        "mobileUrl": mobile_url,
-                        "is_new": is_new,
-                    }
-                )
-
-                if source_id not in processed_titles:
-                    processed_titles[source_id] = {}
-                processed_titles[source_id][title] = True
+            source_ranks = title_data.ranks
+            source_url = title_data.url
+            source_mobile_url = title_data.mobile_url
+
+            group_key = word_groups[group_index]["group_key"]
+            word_stats[group_key]["count"] += 1
+            if source_id not in word_stats[group_key]["titles"]:
+                word_stats[group_key]["titles"][source_id] = []
+
+            first_time = ""
+            last_time = ""
+            count_info = 1
+            ranks = source_ranks if source_ranks else []
+            url = source_url
+            mobile_url = source_mobile_url
+
+            # 从统计信息中获取完整数据（current 模式下为全天历史统计）
+            info = title_info.get(source_id, {}).get(title) if title_info else None
+            if info is not None:
+                first_time = info.first_time
+                last_time = info.last_time
+                count_info = info.count
+                if info.ranks:
+                    ranks = info.ranks
+                url = info.url
+                mobile_url = info.mobile_url
+
+            if not ranks:
+                ranks = [99]
+
+            time_display = format_time_display(first_time, last_time)
+
+            source_name = id_to_name.get(source_id, source_id)
+
+            # 判断是否为新增
+            is_new = False
+            if all_news_are_new:
+                # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
+                is_new = True
+            elif new_titles and source_id in new_titles:
+                # 检查是否在新增列表中
+                new_titles_for_source = new_titles[source_id]
+                is_new = title in new_titles_for_source
+
+            # 直接构建渲染所需的结构，报告和通知阶段无需再次复制
+            word_stats[group_key]["titles"][source_id].append(
+                {
+                    "title": title,
+                    "source_name": source_name,
+                    "first_time": first_time,
+                    "last_time": last_time,
+                    "time_display": time_display,
+                    "count": count_info,
+                    "ranks": ranks,
+                    "rank_threshold": rank_threshold,
+                    "url": expand_url(source_id, "url", title, url),
+                    "mobile_url": expand_url(source_id, "mobile_url", title, mobile_url),
+                    "is_new": is_new,
+                }
+            )
 
-                break
+            if source_id not in processed_titles:
+                processed_titles[source_id] = {}
+            processed_titles[source_id][title] = True
 
     # 最后统一打印汇总信息
     if mode == "incremental":
@@ -1377,29 +2348,41 @@ def count_word_frequency(
         group["group_key"]: group.get("max_count", 0) for group in word_groups
     }
 
+    # 所有词组命中的新闻一次性计算权重
+    group_titles = {}
     for group_key, data in word_stats.items():
         all_titles = []
-        for source_id, title_list in data["titles"].items():
+        for title_list in data["titles"].values():
             all_titles.extend(title_list)
-
-        # 按权重排序
-        sorted_titles = sorted(
-            all_titles,
-            key=lambda x: (
-                -calculate_news_weight(x, rank_threshold),
-                min(x["ranks"]) if x["ranks"] else 999,
-                -x["count"],
-            ),
+        group_titles[group_key] = all_titles
+    weights = iter(
+        calculate_news_weights(
+            [item for all_titles in group_titles.values() for item in all_titles],
+            rank_threshold,
+            CONFIG["WEIGHT_CONFIG"],
         )
+    )
+
+    for group_key, data in word_stats.items():
+        all_titles = group_titles[group_key]
 
-        # 应用最大显示数量限制（优先级：单独配置 > 全局配置）
+        # 最大显示数量限制（优先级：单独配置 > 全局配置）
         group_max_count = group_key_to_max_count.get(group_key, 0)
         if group_max_count == 0:
             # 使用全局配置
             group_max_count = CONFIG.get("MAX_NEWS_PER_KEYWORD", 0)
 
-        if group_max_count > 0:
-            sorted_titles = sorted_titles[:group_max_count]
+        # 按权重排序，有数量限制时只选出前 group_max_count 条
+        sort_keys = [
+            (
+                -next(weights),
+                min(item["ranks"]) if item["ranks"] else 999,
+                -item["count"],
+            )
+            for item in all_titles
+        ]
+        order = top_k(range(len(all_titles)), group_max_count, key=sort_keys.__getitem__)
+        sorted_titles = [all_titles[index] for index in order]
 
         stats.append(
             {
@@ -1445,10 +2428,11 @@ def prepare_report_data(
         filtered_new_titles = {}
         if new_titles and id_to_name:
             word_groups, filter_words = load_frequency_words()
+            matcher = get_match_cache(word_groups, filter_words)
             for source_id, titles_data in new_titles.items():
                 filtered_titles = {}
                 for title, title_data in titles_data.items():
-                    if matches_word_groups(title, word_groups, filter_words):
+                    if matcher.matches(title):
                         filtered_titles[title] = title_data
                 if filtered_titles:
                     filtered_new_titles[source_id] = filtered_titles
@@ -1459,19 +2443,17 @@ def prepare_report_data(
                 source_titles = []
 
                 for title, title_data in titles_data.items():
-                    url = title_data.get("url", "")
-                    mobile_url = title_data.get("mobileUrl", "")
-                    ranks = title_data.get("ranks", [])
-
                     processed_title = {
                         "title": title,
                         "source_name": source_name,
                         "time_display": "",
                         "count": 1,
-                        "ranks": ranks,
+                        "ranks": title_data.ranks,
                         "rank_threshold": CONFIG["RANK_THRESHOLD"],
-                        "url": url,
-                        "mobile_url": mobile_url,
+                        "url": expand_url(source_id, "url", title, title_data.url),
+                        "mobile_url": expand_url(
+                            source_id, "mobile_url", title, title_data.mobile_url
+                        ),
                         "is_new": True,
                     }
                     source_titles.append(processed_title)
@@ -1490,27 +2472,13 @@ def prepare_report_data(
         if stat["count"] <= 0:
             continue
 
-        processed_titles = []
-        for title_data in stat["titles"]:
-            processed_title = {
-                "title": title_data["title"],
-                "source_name": title_data["source_name"],
-                "time_display": title_data["time_display"],
-                "count": title_data["count"],
-                "ranks": title_data["ranks"],
-                "rank_threshold": title_data["rank_threshold"],
-                "url": title_data.get("url", ""),
-                "mobile_url": title_data.get("mobileUrl", ""),
-                "is_new": title_data.get("is_new", False),
-            }
-            processed_titles.append(processed_title)
-
+        # count_word_frequency 已生成渲染所需结构，直接复用
         processed_stats.append(
             {
                 "word": stat["word"],
                 "count": stat["count"],
                 "percentage": stat.get("percentage", 0),
-                "titles": processed_titles,
+                "titles": stat["titles"],
             }
         )
 
@@ -1702,16 +2670,15 @@ def generate_html_report(
     else:
         filename = f"{format_time_filename()}.html"
 
-    file_path = get_output_path("html", filename)
-
     report_data = prepare_report_data(stats, failed_ids, new_titles, id_to_name, mode)
 
     html_content = render_html_content(
         report_data, total_titles, is_daily_summary, mode, update_info
     )
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
+    file_path = str(
+        get_storage().write_text(f"{format_date_folder()}/html/{filename}", html_content)
+    )
 
     if is_daily_summary:
         root_file_path = Path("index.html")
@@ -3531,10 +4498,7 @@ def send_to_feishu(
     mode: str = "daily",
 ) -> bool:
     """发送到飞书（支持分批发送）"""
-    headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
+    headers = JSON_HEADERS
 
     # 获取分批内容，使用飞书专用的批次大小
     batches = split_content_into_batches(
@@ -3582,8 +4546,8 @@ def send_to_feishu(
         }
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = get_http_client().post(
+                webhook_url, headers=headers, json=payload, proxy_url=proxy_url, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -3621,10 +4585,7 @@ def send_to_dingtalk(
     mode: str = "daily",
 ) -> bool:
     """发送到钉钉（支持分批发送）"""
-    headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
+    headers = JSON_HEADERS
 
     # 获取分批内容，使用钉钉专用的批次大小
     batches = split_content_into_batches(
@@ -3665,8 +4626,8 @@ def send_to_dingtalk(
         }
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = get_http_client().post(
+                webhook_url, headers=headers, json=payload, proxy_url=proxy_url, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -3746,10 +4707,7 @@ def send_to_wework(
     mode: str = "daily",
 ) -> bool:
     """发送到企业微信（支持分批发送，支持 markdown 和 text 两种格式）"""
-    headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
+    headers = JSON_HEADERS
 
     # 获取消息类型配置（markdown 或 text）
     msg_type = CONFIG.get("WEWORK_MSG_TYPE", "markdown").lower()
@@ -3791,8 +4749,8 @@ def send_to_wework(
         )
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = get_http_client().post(
+                webhook_url, headers=headers, json=payload, proxy_url=proxy_url, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -3829,13 +4787,9 @@ def send_to_telegram(
     mode: str = "daily",
 ) -> bool:
     """发送到Telegram（支持分批发送）"""
-    headers = {"Content-Type": "application/json"}
+    headers = JSON_HEADERS
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
 
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
-
     # 获取分批内容
     batches = split_content_into_batches(
         report_data, "telegram", update_info, mode=mode
@@ -3863,8 +4817,8 @@ def send_to_telegram(
         }
 
         try:
-            response = requests.post(
-                url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = get_http_client().post(
+                url, headers=headers, json=payload, proxy_url=proxy_url, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -4069,10 +5023,6 @@ def send_to_ntfy(
         base_url = f"https://{base_url}"
     url = f"{base_url}/{topic}"
 
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
-
     # 获取分批内容，使用ntfy专用的4KB限制
     batches = split_content_into_batches(
         report_data, "ntfy", update_info, max_bytes=3800, mode=mode
@@ -4112,11 +5062,11 @@ def send_to_ntfy(
             )
 
         try:
-            response = requests.post(
+            response = get_http_client().post(
                 url,
                 headers=current_headers,
                 data=batch_content.encode("utf-8"),
-                proxies=proxies,
+                proxy_url=proxy_url,
                 timeout=30,
             )
 
@@ -4133,11 +5083,11 @@ def send_to_ntfy(
                 )
                 time.sleep(10)  # 等待10秒后重试
                 # 重试一次
-                retry_response = requests.post(
+                retry_response = get_http_client().post(
                     url,
                     headers=current_headers,
                     data=batch_content.encode("utf-8"),
-                    proxies=proxies,
+                    proxy_url=proxy_url,
                     timeout=30,
                 )
                 if retry_response.status_code == 200:
@@ -4190,9 +5140,6 @@ def send_to_bark(
     mode: str = "daily",
 ) -> bool:
     """发送到Bark（支持分批发送，使用纯文本格式）"""
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
 
     # 获取分批内容（Bark 限制为 3600 字节以避免 413 错误）
     batches = split_content_into_batches(
@@ -4242,10 +5189,10 @@ def send_to_bark(
         }
 
         try:
-            response = requests.post(
+            response = get_http_client().post(
                 bark_url,
                 json=payload,
-                proxies=proxies,
+                proxy_url=proxy_url,
                 timeout=30,
             )
 
@@ -4318,10 +5265,7 @@ def send_to_slack(
     mode: str = "daily",
 ) -> bool:
     """发送到Slack（支持分批发送，使用 mrkdwn 格式）"""
-    headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
+    headers = JSON_HEADERS
 
     # 获取分批内容（使用 Slack 批次大小）
     batches = split_content_into_batches(
@@ -4351,8 +5295,8 @@ def send_to_slack(
         }
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = get_http_client().post(
+                webhook_url, headers=headers, json=payload, proxy_url=proxy_url, timeout=30
             )
 
             # Slack Incoming Webhooks 成功时返回 "ok" 文本
@@ -4419,13 +5363,13 @@ class NewsAnalyzer:
         self.update_info = None
         self.proxy_url = None
         self._setup_proxy()
-        self.data_fetcher = DataFetcher(self.proxy_url)
+        self.data_fetcher = DataFetcher(self.proxy_url, CONFIG["MAX_CONCURRENCY"])
         
         # 初始化RSS服务
         self.rss_service = None
         if CONFIG["ENABLE_RSS"]:
             from rss.service import RSSService
-            self.rss_service = RSSService()
+            self.rss_service = RSSService(storage_backend=get_storage())
 
         if self.is_github_actions:
             self._check_version_update()
@@ -4514,9 +5458,9 @@ class NewsAnalyzer:
             return has_matched_news or has_new_news
 
     def _load_analysis_data(
-        self,
+        self, context: Optional[RunContext] = None
     ) -> Optional[Tuple[Dict, Dict, Dict, Dict, List, List]]:
-        """统一的数据加载和预处理，使用当前监控平台列表过滤历史数据"""
+        """统一的数据加载和预处理，使用当前监控平台列表过滤历史数据（传入 context 时直接使用本次运行的当日聚合）"""
         try:
             # 获取当前配置的监控平台ID列表
             current_platform_ids = []
@@ -4525,9 +5469,14 @@ class NewsAnalyzer:
 
             print(f"当前监控平台: {current_platform_ids}")
 
-            all_results, id_to_name, title_info = read_all_today_titles(
-                current_platform_ids
-            )
+            if context is not None:
+                all_results, id_to_name, title_info = context.get_day_view(
+                    current_platform_ids
+                )
+            else:
+                all_results, id_to_name, title_info = read_all_today_titles(
+                    current_platform_ids
+                )
 
             if not all_results:
                 print("没有找到当天的数据")
@@ -4536,7 +5485,10 @@ class NewsAnalyzer:
             total_titles = sum(len(titles) for titles in all_results.values())
             print(f"读取到 {total_titles} 个标题（已按当前监控平台过滤）")
 
-            new_titles = detect_latest_new_titles(current_platform_ids)
+            if context is not None:
+                new_titles = context.detect_new_titles(current_platform_ids)
+            else:
+                new_titles = detect_latest_new_titles(current_platform_ids)
             word_groups, filter_words = load_frequency_words()
 
             return (
@@ -4552,23 +5504,14 @@ class NewsAnalyzer:
             return None
 
     def _prepare_current_title_info(self, results: Dict, time_info: str) -> Dict:
-        """从当前抓取结果构建标题信息"""
+        """从当前抓取结果构建标题信息（直接复用抓取得到的 NewsItem 记录）"""
         title_info = {}
+        timeline = [time_info]
         for source_id, titles_data in results.items():
-            title_info[source_id] = {}
-            for title, title_data in titles_data.items():
-                ranks = title_data.get("ranks", [])
-                url = title_data.get("url", "")
-                mobile_url = title_data.get("mobileUrl", "")
-
-                title_info[source_id][title] = {
-                    "first_time": time_info,
-                    "last_time": time_info,
-                    "count": 1,
-                    "ranks": ranks,
-                    "url": url,
-                    "mobileUrl": mobile_url,
-                }
+            source_info = title_info[source_id] = {}
+            for title, item in titles_data.items():
+                item.stamp(timeline, 0)
+                source_info[title] = item
         return title_info
 
     def _run_analysis_pipeline(
@@ -4662,7 +5605,9 @@ class NewsAnalyzer:
 
         return False
 
-    def _generate_summary_report(self, mode_strategy: Dict) -> Optional[str]:
+    def _generate_summary_report(
+        self, mode_strategy: Dict, context: Optional[RunContext] = None
+    ) -> Optional[str]:
         """生成汇总报告（带通知）"""
         summary_type = (
             "当前榜单汇总" if mode_strategy["summary_mode"] == "current" else "当日汇总"
@@ -4670,7 +5615,7 @@ class NewsAnalyzer:
         print(f"生成{summary_type}报告...")
 
         # 加载分析数据
-        analysis_data = self._load_analysis_data()
+        analysis_data = self._load_analysis_data(context)
         if not analysis_data:
             return None
 
@@ -4705,13 +5650,15 @@ class NewsAnalyzer:
 
         return html_file
 
-    def _generate_summary_html(self, mode: str = "daily") -> Optional[str]:
+    def _generate_summary_html(
+        self, mode: str = "daily", context: Optional[RunContext] = None
+    ) -> Optional[str]:
         """生成汇总HTML"""
         summary_type = "当前榜单汇总" if mode == "current" else "当日汇总"
         print(f"生成{summary_type}HTML...")
 
         # 加载分析数据
-        analysis_data = self._load_analysis_data()
+        analysis_data = self._load_analysis_data(context)
         if not analysis_data:
             return None
 
@@ -4755,10 +5702,27 @@ class NewsAnalyzer:
         print(f"报告模式: {self.report_mode}")
         print(f"运行模式: {mode_strategy['description']}")
 
-    def _crawl_data(self) -> Tuple[Dict, Dict, List]:
-        """执行数据爬取"""
+    def _crawl_data(self) -> RunContext:
+        """执行数据爬取（只爬取按 interval 配置本轮到期、且未熔断的平台），快照只写入一次"""
+        now = get_beijing_time()
+        scheduler = CrawlScheduler()
+        due_platforms, skipped_platforms = scheduler.split_due(CONFIG["PLATFORMS"], now)
+        if skipped_platforms:
+            print(
+                f"未到爬取间隔，本轮跳过: {[p.get('name', p['id']) for p in skipped_platforms]}"
+            )
+
+        health = PlatformHealth()
+        due_platforms, open_platforms = health.split_available(due_platforms, now)
+        if open_platforms:
+            print(
+                f"连续失败已熔断，本轮跳过: {[p.get('name', p['id']) for p in open_platforms]}"
+            )
+        if health.probe_ids:
+            print(f"熔断冷却结束，本轮试探: {sorted(health.probe_ids)}")
+
         ids = []
-        for platform in CONFIG["PLATFORMS"]:
+        for platform in due_platforms:
             if "name" in platform:
                 ids.append((platform["id"], platform["name"]))
             else:
@@ -4767,33 +5731,57 @@ class NewsAnalyzer:
         print(
             f"配置的监控平台: {[p.get('name', p['id']) for p in CONFIG['PLATFORMS']]}"
         )
-        print(f"开始爬取数据，请求间隔 {self.request_interval} 毫秒")
+        if CONFIG["MAX_CONCURRENCY"] > 1:
+            print(
+                f"开始并发爬取数据，并发数 {CONFIG['MAX_CONCURRENCY']}，请求间隔 {self.request_interval} 毫秒"
+            )
+        else:
+            print(f"开始爬取数据，请求间隔 {self.request_interval} 毫秒")
         ensure_directory_exists("output")
 
         results, id_to_name, failed_ids = self.data_fetcher.crawl_websites(
-            ids, self.request_interval
+            ids,
+            self.request_interval,
+            health=health,
+            priorities={p["id"]: get_platform_priority(p) for p in due_platforms},
+            deadline_seconds=CONFIG["CRAWL_DEADLINE"],
+        )
+        scheduler.record(list(results.keys()), now)
+        health.save()
+
+        open_summary = health.summary(
+            {p["id"]: p.get("name", p["id"]) for p in CONFIG["PLATFORMS"]}
         )
+        if open_summary:
+            print("熔断中的平台:")
+            for line in open_summary:
+                print(f"  {line}")
 
-        title_file = save_titles_to_file(results, id_to_name, failed_ids)
+        context = RunContext(results, id_to_name, failed_ids)
+        title_file = context.save()
         print(f"标题已保存到: {title_file}")
 
-        return results, id_to_name, failed_ids
+        return context
 
     def _execute_mode_strategy(
-        self, mode_strategy: Dict, results: Dict, id_to_name: Dict, failed_ids: List
+        self, mode_strategy: Dict, context: RunContext
     ) -> Optional[str]:
-        """执行模式特定逻辑"""
+        """执行模式特定逻辑（当日数据和新增标题来自本次运行的上下文）"""
+        results = context.results
+        id_to_name = context.id_to_name
+        failed_ids = context.failed_ids
+
         # 获取当前监控平台ID列表
         current_platform_ids = [platform["id"] for platform in CONFIG["PLATFORMS"]]
 
-        new_titles = detect_latest_new_titles(current_platform_ids)
-        time_info = Path(save_titles_to_file(results, id_to_name, failed_ids)).stem
+        new_titles = context.detect_new_titles(current_platform_ids)
+        time_info = context.time_info
         word_groups, filter_words = load_frequency_words()
 
         # current模式下，实时推送需要使用完整的历史数据来保证统计信息的完整性
         if self.report_mode == "current":
-            # 加载完整的历史数据（已按当前平台过滤）
-            analysis_data = self._load_analysis_data()
+            # 当日完整数据（已按当前平台过滤）
+            analysis_data = self._load_analysis_data(context)
             if analysis_data:
                 (
                     all_results,
@@ -4847,8 +5835,8 @@ class NewsAnalyzer:
                         html_file_path=html_file,
                     )
             else:
-                print("❌ 严重错误：无法读取刚保存的数据文件")
-                raise RuntimeError("数据一致性检查失败：保存后立即读取失败")
+                print("❌ 严重错误：当日没有可分析的数据")
+                raise RuntimeError("当日没有可分析的数据")
         else:
             title_info = self._prepare_current_title_info(results, time_info)
             stats, html_file = self._run_analysis_pipeline(
@@ -4893,11 +5881,11 @@ class NewsAnalyzer:
             if mode_strategy["should_send_realtime"]:
                 # 如果已经发送了实时通知，汇总只生成HTML不发送通知
                 summary_html = self._generate_summary_html(
-                    mode_strategy["summary_mode"]
+                    mode_strategy["summary_mode"], context
                 )
             else:
                 # daily模式：直接生成汇总报告并发送通知
-                summary_html = self._generate_summary_report(mode_strategy)
+                summary_html = self._generate_summary_report(mode_strategy, context)
 
         # 打开浏览器（仅在非容器环境）
         if self._should_open_browser() and html_file:
@@ -4924,19 +5912,54 @@ class NewsAnalyzer:
 
             mode_strategy = self._get_mode_strategy()
 
-            results, id_to_name, failed_ids = self._crawl_data()
+            context = self._crawl_data()
 
-            self._execute_mode_strategy(mode_strategy, results, id_to_name, failed_ids)
+            self._execute_mode_strategy(mode_strategy, context)
+
+            get_http_client().print_connection_stats()
 
         except Exception as e:
             print(f"分析流程执行出错: {e}")
             raise
+        finally:
+            save_match_caches()
+            # 对象存储时上传本轮剩余的快照和报告
+            get_storage().flush()
+
+    def run_daemon(self, interval_minutes: Optional[int] = None) -> None:
+        """守护进程模式：常驻执行，当日聚合、已编译的匹配器和HTTP连接池在各轮之间复用
+
+        执行时间按北京时间从零点起以 interval_minutes 对齐，config.yaml 修改需重启生效，频率词文件修改在下一轮自动生效。
+        """
+        if interval_minutes is None:
+            interval_minutes = CONFIG["DAEMON_INTERVAL"]
+
+        print(f"守护进程模式启动，每 {interval_minutes} 分钟执行一次")
+
+        while True:
+            reset_day_state()
+            try:
+                self.run()
+            except Exception as e:
+                print(f"本轮执行失败，将在下一轮重试: {e}")
+
+            now = get_beijing_time()
+            elapsed = now.hour * 60 + now.minute + now.second / 60
+            next_tick = min((int(elapsed // interval_minutes) + 1) * interval_minutes, 24 * 60)
+            sleep_seconds = max(1.0, (next_tick - elapsed) * 60)
+            print(f"下一轮将在 {sleep_seconds / 60:.1f} 分钟后执行")
+            time.sleep(sleep_seconds)
 
 
 def main():
     try:
         analyzer = NewsAnalyzer()
-        analyzer.run()
+        if "--daemon" in sys.argv[1:]:
+            analyzer.run_daemon()
+        else:
+            analyzer.run()
+    except KeyboardInterrupt:
+        print("已停止")
     except FileNotFoundError as e:
         print(f"❌ 配置文件错误: {e}")
         print("\n请确保以下文件存在:")
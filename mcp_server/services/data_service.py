@@ -507,19 +507,14 @@ class DataService:
             >>> earliest, latest = service.get_available_date_range()
             >>> print(f"可用日期范围：{earliest} 至 {latest}")
         """
-        output_dir = self.parser.project_root / "output"
-
-        if not output_dir.exists():
-            return (None, None)
-
         available_dates = []
 
-        # 遍历日期文件夹
-        for date_folder in output_dir.iterdir():
-            if date_folder.is_dir() and not date_folder.name.startswith('.'):
+        # 遍历日期文件夹（对象存储时列举远端目录）
+        for folder_name in self.parser.get_output_storage().list_dirs():
+            if not folder_name.startswith('.'):
                 # 解析日期（格式: YYYY年MM月DD日）
                 try:
-                    date_match = re.match(r'(\d{4})年(\d{2})月(\d{2})日', date_folder.name)
+                    date_match = re.match(r'(\d{4})年(\d{2})月(\d{2})日', folder_name)
                     if date_match:
                         folder_date = datetime(
                             int(date_match.group(1)),
@@ -530,6 +525,12 @@ class DataService:
                 except Exception:
                     pass
 
+        # SQLite快照存储中的日期（导入后 txt 目录可能已清理）
+        store = self.parser.get_snapshot_store()
+        if store is not None:
+            for date_str in store.list_dates():
+                available_dates.append(datetime.strptime(date_str, "%Y-%m-%d"))
+
         if not available_dates:
             return (None, None)
 
@@ -4,11 +4,13 @@
 提供txt格式新闻数据和YAML配置文件的解析功能。
 """
 
+import copy
 import re
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 
+import pytz
 import yaml
 
 from ..utils.errors import FileParseError, DataNotFoundError
@@ -35,6 +37,13 @@ class ParserService:
         # 初始化缓存服务
         self.cache = get_cache()
 
+        # 快照存储后端（按配置懒加载）
+        self._storage_config = None
+        self._storage_backend = None
+        self._snapshot_store = None
+        # output 目录的存储位置（本地或对象存储，按配置懒加载）
+        self._output_storage = None
+
     @staticmethod
     def clean_title(title: str) -> str:
         """
@@ -52,12 +61,19 @@ class ParserService:
         title = title.strip()
         return title
 
-    def parse_txt_file(self, file_path: Path) -> Tuple[Dict, Dict]:
+    def parse_txt_file(
+        self,
+        file_path: Path,
+        parsed_snapshots: Optional[Dict[str, Tuple]] = None
+    ) -> Tuple[Dict, Dict]:
         """
         解析单个txt文件的标题数据
 
+        内容未变化的平台（[UNCHANGED:时间] 标记）从引用的快照中读取，增量记录的平台还原为完整内容。
+
         Args:
             file_path: txt文件路径
+            parsed_snapshots: 同目录快照的解析缓存 {快照时间: parse_snapshot_file 结果}，解析多个快照时共用
 
         Returns:
             (titles_by_id, id_to_name) 元组
@@ -67,80 +83,33 @@ class ParserService:
         Raises:
             FileParseError: 文件解析错误
         """
+        from storage.day_archive import day_snapshot_loader
+        from storage.txt_format import parse_snapshot_file, resolve_unchanged
+        from storage.url_templates import expand_url
+
         if not file_path.exists():
             raise FileParseError(str(file_path), "文件不存在")
 
-        titles_by_id = {}
-        id_to_name = {}
-
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                sections = content.split("\n\n")
-
-                for section in sections:
-                    if not section.strip() or "==== 以下ID请求失败 ====" in section:
-                        continue
-
-                    lines = section.strip().split("\n")
-                    if len(lines) < 2:
-                        continue
-
-                    # 解析header: id | name 或 id
-                    header_line = lines[0].strip()
-                    if " | " in header_line:
-                        parts = header_line.split(" | ", 1)
-                        source_id = parts[0].strip()
-                        name = parts[1].strip()
-                        id_to_name[source_id] = name
-                    else:
-                        source_id = header_line
-                        id_to_name[source_id] = source_id
-
-                    titles_by_id[source_id] = {}
-
-                    # 解析标题行
-                    for line in lines[1:]:
-                        if line.strip():
-                            try:
-                                title_part = line.strip()
-                                rank = None
-
-                                # 提取排名
-                                if ". " in title_part and title_part.split(". ")[0].isdigit():
-                                    rank_str, title_part = title_part.split(". ", 1)
-                                    rank = int(rank_str)
-
-                                # 提取 MOBILE URL
-                                mobile_url = ""
-                                if " [MOBILE:" in title_part:
-                                    title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
-                                    if mobile_part.endswith("]"):
-                                        mobile_url = mobile_part[:-1]
-
-                                # 提取 URL
-                                url = ""
-                                if " [URL:" in title_part:
-                                    title_part, url_part = title_part.rsplit(" [URL:", 1)
-                                    if url_part.endswith("]"):
-                                        url = url_part[:-1]
-
-                                title = self.clean_title(title_part.strip())
-                                ranks = [rank] if rank is not None else [1]
-
-                                titles_by_id[source_id][title] = {
-                                    "ranks": ranks,
-                                    "url": url,
-                                    "mobileUrl": mobile_url,
-                                }
-
-                            except Exception as e:
-                                # 忽略单行解析错误
-                                continue
-
+            load_base = day_snapshot_loader(file_path.parent, parsed_snapshots)
+            raw_titles, id_to_name, _, _ = resolve_unchanged(
+                parse_snapshot_file(file_path, load_base), load_base
+            )
         except Exception as e:
             raise FileParseError(str(file_path), str(e))
 
+        titles_by_id = {
+            source_id: {
+                title: {
+                    "ranks": [rank],
+                    "url": expand_url(source_id, "url", title, url),
+                    "mobileUrl": expand_url(source_id, "mobile_url", title, mobile_url),
+                }
+                for title, (rank, url, mobile_url) in titles.items()
+            }
+            for source_id, titles in raw_titles.items()
+        }
+
         return titles_by_id, id_to_name
 
     def get_date_folder_name(self, date: datetime = None) -> str:
@@ -178,47 +147,249 @@ class ParserService:
         Raises:
             DataNotFoundError: 数据不存在
         """
-        # 生成缓存键
-        date_str = self.get_date_folder_name(date)
-        platform_key = ','.join(sorted(platform_ids)) if platform_ids else 'all'
-        cache_key = f"read_all_titles:{date_str}:{platform_key}"
-
-        # 尝试从缓存获取
-        # 对于历史数据（非今天），使用更长的缓存时间（1小时）
-        # 对于今天的数据，使用较短的缓存时间（15分钟），因为可能有新数据
-        is_today = (date is None) or (date.date() == datetime.now().date())
-        ttl = 900 if is_today else 3600  # 15分钟 vs 1小时
-
-        cached = self.cache.get(cache_key, ttl=ttl)
+        cache_key = self._titles_cache_key(date, platform_ids)
+        cached = self.cache.get(cache_key, ttl=self._titles_cache_ttl(date))
         if cached:
             return cached
 
-        # 缓存未命中，读取文件
+        # 缓存未命中，读取快照
         date_folder = self.get_date_folder_name(date)
-        txt_dir = self.project_root / "output" / date_folder / "txt"
+        store = self.get_snapshot_store()
+        if store is not None:
+            result = self._read_titles_from_store(store, date_folder, platform_ids)
+            self.cache.set(cache_key, result)
+            return result
+
+        day_files = self._list_day_snapshots(date_folder)
 
-        if not txt_dir.exists():
+        if day_files is None:
             raise DataNotFoundError(
                 f"未找到 {date_folder} 的数据目录",
                 suggestion="请先运行爬虫或检查日期是否正确"
             )
 
-        all_titles = {}
-        id_to_name = {}
-        all_timestamps = {}
-
-        # 读取所有txt文件
-        txt_files = sorted(txt_dir.glob("*.txt"))
+        # 读取所有txt文件（已归档的日期从归档读取）
+        txt_files, archive = day_files
 
-        if not txt_files:
+        if not txt_files and archive is None:
             raise DataNotFoundError(
                 f"{date_folder} 没有数据文件",
                 suggestion="请等待爬虫任务完成"
             )
 
-        for txt_file in txt_files:
+        from storage.snapshot_loader import parse_snapshot_files
+
+        # 指定平台时按快照的平台偏移索引只读取这些平台
+        result = self._merge_txt_snapshots(
+            self._collect_day_snapshots(
+                txt_files,
+                parse_snapshot_files(txt_files, self.get_load_workers(), platform_ids or None),
+                archive,
+                platform_ids or None,
+            ),
+            platform_ids,
+        )
+        if not result[0]:
+            raise DataNotFoundError(
+                f"{date_folder} 没有有效的数据",
+                suggestion="请检查数据文件格式或重新运行爬虫"
+            )
+
+        # 缓存结果
+        self.cache.set(cache_key, result)
+
+        return result
+
+    def preload_date_range(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        platform_ids: Optional[List[str]] = None
+    ) -> None:
+        """
+        预加载日期范围内的标题数据到缓存
+
+        日期范围查询前调用：把所有未缓存日期的txt文件放在一个进程池批次中并行解析，
+        之后逐日调用 read_all_titles_for_date 直接命中缓存。SQLite存储无需预加载。
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期（包含）
+            platform_ids: 平台ID列表，None表示所有平台（需与之后的查询参数一致）
+        """
+        if self.get_snapshot_store() is not None:
+            return
+
+        pending = []
+        date = start_date
+        while date <= end_date:
+            cache_key = self._titles_cache_key(date, platform_ids)
+            if not self.cache.get(cache_key, ttl=self._titles_cache_ttl(date)):
+                day_files = self._list_day_snapshots(self.get_date_folder_name(date))
+                if day_files is not None and (day_files[0] or day_files[1] is not None):
+                    pending.append((cache_key,) + day_files)
+            date += timedelta(days=1)
+
+        if not pending:
+            return
+
+        from storage.snapshot_loader import parse_snapshot_files
+
+        parsed_files = parse_snapshot_files(
+            [txt_file for _, txt_files, _ in pending for txt_file in txt_files],
+            self.get_load_workers(),
+            platform_ids or None,
+        )
+        offset = 0
+        for cache_key, txt_files, archive in pending:
+            result = self._merge_txt_snapshots(
+                self._collect_day_snapshots(
+                    txt_files,
+                    parsed_files[offset:offset + len(txt_files)],
+                    archive,
+                    platform_ids or None,
+                ),
+                platform_ids,
+            )
+            offset += len(txt_files)
+            # 没有有效数据的日期不缓存，由 read_all_titles_for_date 报告错误
+            if result[0]:
+                self.cache.set(cache_key, result)
+
+    def _titles_cache_key(self, date: datetime, platform_ids: Optional[List[str]]) -> str:
+        """生成 read_all_titles_for_date 的缓存键"""
+        date_str = self.get_date_folder_name(date)
+        platform_key = ','.join(sorted(platform_ids)) if platform_ids else 'all'
+        return f"read_all_titles:{date_str}:{platform_key}"
+
+    @staticmethod
+    def _titles_cache_ttl(date: datetime) -> int:
+        """
+        标题数据的缓存时间
+
+        对于历史数据（非今天），使用更长的缓存时间（1小时）
+        对于今天的数据，使用较短的缓存时间（15分钟），因为可能有新数据
+        """
+        is_today = (date is None) or (date.date() == datetime.now().date())
+        return 900 if is_today else 3600  # 15分钟 vs 1小时
+
+    def _list_day_snapshots(self, date_folder: str) -> Optional[Tuple]:
+        """
+        列出一天的快照来源
+
+        Returns:
+            (未归档的txt文件, DayArchive 或 None)；日期目录下既没有 txt 目录也没有归档时返回 None
+        """
+        from storage.day_archive import DayArchive
+
+        # 对象存储时先下载其他节点写入的快照和归档
+        self.get_output_storage().sync(f"{date_folder}/")
+        day_dir = self.get_output_storage().local_path(date_folder)
+        txt_dir = day_dir / "txt"
+        archive = DayArchive.open(day_dir) if day_dir.exists() else None
+        if archive is None and not txt_dir.exists():
+            return None
+
+        txt_files = sorted(txt_dir.glob("*.txt")) if txt_dir.exists() else []
+        if archive is not None:
+            txt_files = [txt_file for txt_file in txt_files if txt_file.stem not in archive]
+        return txt_files, archive
+
+    @staticmethod
+    def _collect_day_snapshots(
+        txt_files: List[Path],
+        parsed_files: List,
+        archive=None,
+        platform_ids: Optional[List[str]] = None
+    ) -> List[Tuple]:
+        """
+        汇总一天的快照解析结果，按文件名（即快照时间）排序
+
+        Args:
+            txt_files: 未归档的txt文件
+            parsed_files: 与 txt_files 对应的 parse_snapshot_file 结果（解析失败时为异常对象）
+            archive: 当天的 DayArchive，归档中的快照在当前进程解析
+            platform_ids: 只解析归档快照中的这些平台，None表示所有平台
+
+        Returns:
+            [(文件名, 修改时间, 解析结果或异常对象)]
+        """
+        snapshots = []
+        if archive is not None:
+            load = archive.loader(platform_ids=platform_ids)
+            for time_info in archive.times():
+                mtime = archive.mtime(time_info)
+                try:
+                    parsed = load(time_info)
+                except Exception as e:
+                    parsed = e
+                snapshots.append((f"{time_info}.txt", mtime, parsed))
+
+        for txt_file, parsed in zip(txt_files, parsed_files):
             try:
-                titles_by_id, file_id_to_name = self.parse_txt_file(txt_file)
+                mtime = txt_file.stat().st_mtime
+            except OSError as e:
+                mtime, parsed = 0, e
+            snapshots.append((txt_file.name, mtime, parsed))
+
+        snapshots.sort(key=lambda snapshot: snapshot[0])
+        return snapshots
+
+    def _merge_txt_snapshots(
+        self,
+        snapshots: List[Tuple],
+        platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        按时间顺序合并同一天的txt快照解析结果
+
+        Args:
+            snapshots: _collect_day_snapshots 的返回值
+            platform_ids: 平台ID列表，None表示所有平台
+
+        Returns:
+            (all_titles, id_to_name, all_timestamps) 元组，结构同 read_all_titles_for_date
+        """
+        from storage.txt_format import resolve_unchanged
+        from storage.url_templates import expand_url
+
+        parsed_by_stem = {
+            file_name[:-len(".txt")]: parsed for file_name, _, parsed in snapshots
+        }
+        resolved = {}
+
+        def load(stem: str) -> Optional[Tuple]:
+            """按快照时间取解析结果，引用的快照不存在时返回 None"""
+            parsed = parsed_by_stem.get(stem)
+            if isinstance(parsed, Exception):
+                raise parsed
+            return parsed
+
+        def resolve(stem: str) -> Tuple[Dict, Dict]:
+            """转换一个快照的解析结果，内容未变化的平台从引用的快照中读取"""
+            if stem not in resolved:
+                stored_titles, file_id_to_name, _, _ = resolve_unchanged(load(stem), load)
+                titles_by_id = {
+                    source_id: {
+                        title: {
+                            "ranks": [rank],
+                            "url": expand_url(source_id, "url", title, url),
+                            "mobileUrl": expand_url(source_id, "mobile_url", title, mobile_url),
+                        }
+                        for title, (rank, url, mobile_url) in titles.items()
+                    }
+                    for source_id, titles in stored_titles.items()
+                }
+                resolved[stem] = (titles_by_id, file_id_to_name)
+            return resolved[stem]
+
+        all_titles = {}
+        id_to_name = {}
+        all_timestamps = {}
+
+        for file_name, mtime, _ in snapshots:
+            try:
+                titles_by_id, file_id_to_name = resolve(file_name[:-len(".txt")])
 
                 # 更新id_to_name
                 id_to_name.update(file_id_to_name)
@@ -240,24 +411,131 @@ class ParserService:
                             all_titles[platform_id][title] = info.copy()
 
                 # 记录文件时间戳
-                all_timestamps[txt_file.name] = txt_file.stat().st_mtime
+                all_timestamps[file_name] = mtime
 
             except Exception as e:
                 # 忽略单个文件的解析错误，继续处理其他文件
-                print(f"Warning: 解析文件 {txt_file} 失败: {e}")
+                print(f"Warning: 解析文件 {file_name} 失败: {e}")
                 continue
 
+        return all_titles, id_to_name, all_timestamps
+
+    def _get_storage_config(self) -> Dict:
+        """读取 config.yaml 的 storage 配置（缓存）"""
+        if self._storage_config is None:
+            try:
+                self._storage_config = self.parse_yaml_config().get("storage") or {}
+            except FileParseError:
+                self._storage_config = {}
+        return self._storage_config
+
+    def get_load_workers(self) -> int:
+        """并行解析txt快照的进程数（storage.load_workers，0=CPU核数）"""
+        return int(self._get_storage_config().get("load_workers") or 0)
+
+    def get_output_storage(self):
+        """
+        获取 output 目录的存储后端（storage.object_store 配置，环境变量优先）
+
+        Returns:
+            StorageBackend，本地目录为 project_root/output；对象存储时该目录为本地缓存
+        """
+        if self._output_storage is None:
+            from storage.backend import create_storage
+
+            self._output_storage = create_storage(
+                self._get_storage_config().get("object_store"),
+                self.project_root / "output",
+            )
+        return self._output_storage
+
+    def get_snapshot_store(self):
+        """
+        获取SQLite快照存储
+
+        Returns:
+            配置 storage.backend 为 sqlite 时返回 SQLiteSnapshotStore，否则返回 None
+        """
+        if self._storage_backend is None:
+            storage_config = self._get_storage_config()
+            self._storage_backend = storage_config.get("backend", "txt")
+            if self._storage_backend == "sqlite":
+                from storage.sqlite_store import DEFAULT_DB_PATH, SQLiteSnapshotStore
+
+                db_path = Path(storage_config.get("sqlite_path") or DEFAULT_DB_PATH)
+                if not db_path.is_absolute():
+                    db_path = self.project_root / db_path
+                self._snapshot_store = SQLiteSnapshotStore(str(db_path))
+
+        return self._snapshot_store
+
+    def _read_titles_from_store(
+        self,
+        store,
+        date_folder: str,
+        platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        从SQLite快照存储读取指定日期的所有标题，返回结构与读取txt文件时相同
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        from storage.sqlite_store import folder_to_date
+        from storage.txt_format import resolve_unchanged
+        from storage.url_templates import expand_url
+
+        date = folder_to_date(date_folder)
+        all_titles = {}
+        all_timestamps = {}
+        beijing_tz = pytz.timezone("Asia/Shanghai")
+
+        # 按快照组织为与 parse_snapshot_file 相同的结构，未变化的平台复用其引用快照的标题
+        snapshots = {}
+
+        def snapshot(time_info: str) -> Tuple:
+            if time_info not in snapshots:
+                snapshots[time_info] = ({}, {}, [], {})
+            return snapshots[time_info]
+
+        for _, time_info, platform_id, title, rank, url, mobile_url in store.iter_rows(
+            date, date, platform_ids
+        ):
+            snapshot(time_info)[0].setdefault(platform_id, {})[title] = (rank, url, mobile_url)
+        for time_info, platform_id, since_time in store.list_unchanged(date):
+            if platform_ids and platform_id not in platform_ids:
+                continue
+            snapshot(time_info)[3][platform_id] = since_time
+
+        for time_info in sorted(snapshots):
+            titles_by_id = resolve_unchanged(snapshots[time_info], snapshots.get)[0]
+            if not titles_by_id:
+                continue
+            for platform_id, titles in titles_by_id.items():
+                platform_titles = all_titles.setdefault(platform_id, {})
+                for title, (rank, url, mobile_url) in titles.items():
+                    if title in platform_titles:
+                        # 合并排名
+                        platform_titles[title]["ranks"].append(rank)
+                    else:
+                        platform_titles[title] = {
+                            "ranks": [rank],
+                            "url": expand_url(platform_id, "url", title, url),
+                            "mobileUrl": expand_url(platform_id, "mobile_url", title, mobile_url),
+                        }
+
+            # 记录快照时间戳
+            if time_info not in all_timestamps:
+                snapshot_time = datetime.strptime(f"{date} {time_info}", "%Y-%m-%d %H时%M分")
+                all_timestamps[time_info] = beijing_tz.localize(snapshot_time).timestamp()
+
         if not all_titles:
             raise DataNotFoundError(
-                f"{date_folder} 没有有效的数据",
-                suggestion="请检查数据文件格式或重新运行爬虫"
+                f"未找到 {date_folder} 的数据",
+                suggestion="请先运行爬虫或检查日期是否正确"
             )
 
-        # 缓存结果
-        result = (all_titles, id_to_name, all_timestamps)
-        self.cache.set(cache_key, result)
-
-        return result
+        return all_titles, store.get_platform_names(date), all_timestamps
 
     def parse_yaml_config(self, config_path: str = None) -> dict:
         """
@@ -289,17 +567,19 @@ class ParserService:
 
     def parse_frequency_words(self, words_file: str = None) -> List[Dict]:
         """
-        解析关键词配置文件
+        解析关键词配置文件（与 main.py 共用解析和编译结果，文件修改后下一次调用即生效）
 
         Args:
             words_file: 关键词文件路径，默认为 config/frequency_words.txt
 
         Returns:
-            词组列表
+            词组列表（required / normal / group_key / max_count / filter_words）
 
         Raises:
             FileParseError: 文件解析错误
         """
+        from analysis.keyword_config import load_keyword_config
+
         if words_file is None:
             words_file = self.project_root / "config" / "frequency_words.txt"
         else:
@@ -308,48 +588,8 @@ class ParserService:
         if not words_file.exists():
             return []
 
-        word_groups = []
-
         try:
-            with open(words_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-
-                    # 使用 | 分隔符
-                    parts = [p.strip() for p in line.split("|")]
-                    if not parts:
-                        continue
-
-                    group = {
-                        "required": [],
-                        "normal": [],
-                        "filter_words": []
-                    }
-
-                    for part in parts:
-                        if not part:
-                            continue
-
-                        words = [w.strip() for w in part.split(",")]
-                        for word in words:
-                            if not word:
-                                continue
-                            if word.endswith("+"):
-                                # 必须词
-                                group["required"].append(word[:-1])
-                            elif word.endswith("!"):
-                                # 过滤词
-                                group["filter_words"].append(word[:-1])
-                            else:
-                                # 普通词
-                                group["normal"].append(word)
-
-                    if group["required"] or group["normal"]:
-                        word_groups.append(group)
-
+            # 返回副本：词组与 main 共用的已编译配置（匹配器、匹配缓存指纹）是同一份对象，不能被调用方修改
+            return copy.deepcopy(load_keyword_config(words_file).word_groups)
         except Exception as e:
             raise FileParseError(str(words_file), str(e))
-
-        return word_groups
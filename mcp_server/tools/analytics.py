@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from difflib import SequenceMatcher
 
+from analysis.news_weight import calculate_news_weights, top_news_by_weight
+from analysis.top_k import top_k
 from ..services.data_service import DataService
 from ..utils.validators import (
     validate_platforms,
@@ -25,11 +27,13 @@ def calculate_news_weight(news_data: Dict, rank_threshold: int = 5) -> float:
     """
     计算新闻权重（用于排序）
 
-    基于 main.py 的权重算法实现，综合考虑：
+    与 main.py 使用同一权重算法（analysis.news_weight），综合考虑：
     - 排名权重 (60%)：新闻在榜单中的排名
     - 频次权重 (30%)：新闻出现的次数
     - 热度权重 (10%)：高排名出现的比例
 
+    对列表排序时使用 top_news_by_weight，一次计算所有新闻的权重。
+
     Args:
         news_data: 新闻数据字典，包含 ranks 和 count 字段
         rank_threshold: 高排名阈值，默认5
@@ -37,41 +41,7 @@ def calculate_news_weight(news_data: Dict, rank_threshold: int = 5) -> float:
     Returns:
         权重分数（0-100之间的浮点数）
     """
-    ranks = news_data.get("ranks", [])
-    if not ranks:
-        return 0.0
-
-    count = news_data.get("count", len(ranks))
-
-    # 权重配置（与 config.yaml 保持一致）
-    RANK_WEIGHT = 0.6
-    FREQUENCY_WEIGHT = 0.3
-    HOTNESS_WEIGHT = 0.1
-
-    # 1. 排名权重：Σ(11 - min(rank, 10)) / 出现次数
-    rank_scores = []
-    for rank in ranks:
-        score = 11 - min(rank, 10)
-        rank_scores.append(score)
-
-    rank_weight = sum(rank_scores) / len(ranks) if ranks else 0
-
-    # 2. 频次权重：min(出现次数, 10) × 10
-    frequency_weight = min(count, 10) * 10
-
-    # 3. 热度加成：高排名次数 / 总出现次数 × 100
-    high_rank_count = sum(1 for rank in ranks if rank <= rank_threshold)
-    hotness_ratio = high_rank_count / len(ranks) if ranks else 0
-    hotness_weight = hotness_ratio * 100
-
-    # 综合权重
-    total_weight = (
-        rank_weight * RANK_WEIGHT
-        + frequency_weight * FREQUENCY_WEIGHT
-        + hotness_weight * HOTNESS_WEIGHT
-    )
-
-    return total_weight
+    return calculate_news_weights([news_data], rank_threshold)[0]
 
 
 class AnalyticsTools:
@@ -308,6 +278,7 @@ class AnalyticsTools:
 
             # 收集趋势数据
             trend_data = []
+            self.data_service.parser.preload_date_range(start_date, end_date)
             current_date = start_date
 
             while current_date <= end_date:
@@ -449,6 +420,7 @@ class AnalyticsTools:
             })
 
             # 遍历日期范围
+            self.data_service.parser.preload_date_range(start_date, end_date)
             current_date = start_date
             while current_date <= end_date:
                 try:
@@ -693,6 +665,9 @@ class AnalyticsTools:
 
             # 收集新闻数据（支持多天）
             all_news_items = []
+            self.data_service.parser.preload_date_range(
+                start_date, end_date, platform_ids=platforms
+            )
             current_date = start_date
 
             while current_date <= end_date:
@@ -753,15 +728,11 @@ class AnalyticsTools:
 
             deduplicated_news = list(unique_news.values())
 
-            # 按权重排序（如果启用）
+            # 按权重选出前 limit 条（如果启用），否则按原顺序截取
             if sort_by_weight:
-                deduplicated_news.sort(
-                    key=lambda x: calculate_news_weight(x),
-                    reverse=True
-                )
-
-            # 限制返回数量
-            selected_news = deduplicated_news[:limit]
+                selected_news = top_news_by_weight(deduplicated_news, limit)
+            else:
+                selected_news = deduplicated_news[:limit]
 
             # 生成 AI 提示词
             ai_prompt = self._create_sentiment_analysis_prompt(
@@ -984,11 +955,8 @@ class AnalyticsTools:
 
                         similar_items.append(news_item)
 
-            # 按相似度排序
-            similar_items.sort(key=lambda x: x["similarity"], reverse=True)
-
-            # 限制数量
-            result_items = similar_items[:limit]
+            # 按相似度选出前 limit 条
+            result_items = top_k(similar_items, limit, key=lambda x: x["similarity"], reverse=True)
 
             if not result_items:
                 raise DataNotFoundError(
@@ -1114,18 +1082,11 @@ class AnalyticsTools:
             if entity in entity_context:
                 del entity_context[entity]
 
-            # 按权重排序（如果启用）
+            # 按权重选出前 limit 条（如果启用），否则按排名
             if sort_by_weight:
-                related_news.sort(
-                    key=lambda x: calculate_news_weight(x),
-                    reverse=True
-                )
+                result_news = top_news_by_weight(related_news, limit)
             else:
-                # 按排名排序
-                related_news.sort(key=lambda x: x["rank"])
-
-            # 限制返回数量
-            result_news = related_news[:limit]
+                result_news = top_k(related_news, limit, key=lambda x: x["rank"])
 
             return {
                 "success": True,
@@ -1207,6 +1168,7 @@ class AnalyticsTools:
             all_platforms_news = defaultdict(int)
             all_titles_list = []
 
+            self.data_service.parser.preload_date_range(start_date, end_date)
             current_date = start_date
             while current_date <= end_date:
                 try:
@@ -1380,6 +1342,7 @@ class AnalyticsTools:
             })
 
             # 遍历日期范围
+            self.data_service.parser.preload_date_range(start_date, end_date)
             current_date = start_date
             while current_date <= end_date:
                 try:
@@ -1509,6 +1472,7 @@ class AnalyticsTools:
 
             # 收集话题历史数据
             lifecycle_data = []
+            self.data_service.parser.preload_date_range(start_date, end_date)
             current_date = start_date
             while current_date <= end_date:
                 try:
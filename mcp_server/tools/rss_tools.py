@@ -8,6 +8,7 @@ import json
 from typing import Dict, List, Optional
 
 from rss.service import RSSService
+from ..services.parser_service import ParserService
 from ..utils.errors import MCPError
 
 
@@ -21,7 +22,9 @@ class RssTools:
         Args:
             project_root: 项目根目录
         """
-        self.rss_service = RSSService()
+        # RSS 文件与抓取结果保存在同一存储后端的 rss/ 目录下
+        output_storage = ParserService(project_root).get_output_storage()
+        self.rss_service = RSSService(storage_backend=output_storage)
 
     def get_rss_subscriptions(self) -> Dict:
         """
@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 from difflib import SequenceMatcher
 from typing import Dict, List, Optional, Tuple
 
+from analysis.news_weight import top_news_by_weight
+from analysis.top_k import top_k
 from ..services.data_service import DataService
 from ..utils.validators import validate_keyword, validate_limit
 from ..utils.errors import MCPError, InvalidParameterError, DataNotFoundError
@@ -122,6 +124,9 @@ class SearchTools:
 
             # 收集所有匹配的新闻
             all_matches = []
+            self.data_service.parser.preload_date_range(
+                start_date, end_date, platform_ids=platforms
+            )
             current_date = start_date
 
             while current_date <= end_date:
@@ -183,17 +188,17 @@ class SearchTools:
                 }
                 return result
 
-            # 统一排序逻辑
+            # 统一排序逻辑：只选出前 limit 条
             if sort_by == "relevance":
-                all_matches.sort(key=lambda x: x.get("similarity_score", 1.0), reverse=True)
+                results = top_k(
+                    all_matches, limit, key=lambda x: x.get("similarity_score", 1.0), reverse=True
+                )
             elif sort_by == "weight":
-                from .analytics import calculate_news_weight
-                all_matches.sort(key=lambda x: calculate_news_weight(x), reverse=True)
+                results = top_news_by_weight(all_matches, limit)
             elif sort_by == "date":
-                all_matches.sort(key=lambda x: x.get("date", ""), reverse=True)
-
-            # 限制返回数量
-            results = all_matches[:limit]
+                results = top_k(all_matches, limit, key=lambda x: x.get("date", ""), reverse=True)
+            else:
+                results = all_matches[:limit]
 
             # 构建时间范围描述（正确判断是否为今天）
             if start_date.date() == datetime.now().date() and start_date == end_date:
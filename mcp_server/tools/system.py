@@ -272,72 +272,84 @@ class SystemManagementTools:
                         cleaned_title = cleaned_title.strip()
                         return cleaned_title
 
-                    # 辅助函数：创建目录
-                    def ensure_directory_exists(directory: str):
-                        """确保目录存在"""
-                        Path(directory).mkdir(parents=True, exist_ok=True)
-
                     # 格式化日期和时间
                     date_folder = now.strftime("%Y年%m月%d日")
                     time_filename = now.strftime("%H时%M分")
 
-                    # 创建 txt 文件路径
-                    txt_dir = self.project_root / "output" / date_folder / "txt"
-                    ensure_directory_exists(str(txt_dir))
-                    txt_file_path = txt_dir / f"{time_filename}.txt"
-
-                    # 创建 html 文件路径
-                    html_dir = self.project_root / "output" / date_folder / "html"
-                    ensure_directory_exists(str(html_dir))
-                    html_file_path = html_dir / f"{time_filename}.html"
-
-                    # 保存 txt 文件（按照 main.py 的格式）
-                    with open(txt_file_path, "w", encoding="utf-8") as f:
-                        for id_value, title_data in results.items():
-                            # id | name 或 id
-                            name = id_to_name.get(id_value)
-                            if name and name != id_value:
-                                f.write(f"{id_value} | {name}\n")
+                    # 与 main.py 使用同一存储后端（本地目录或对象存储）
+                    output_storage = self.data_service.parser.get_output_storage()
+
+                    # 保存 txt 文件（按照 main.py 的格式，链接按模板压缩）
+                    from storage.txt_format import format_snapshot, format_title_line
+                    from storage.url_templates import compact_url
+
+                    sections = []
+                    for id_value, title_data in results.items():
+                        # id | name 或 id
+                        name = id_to_name.get(id_value)
+                        if name and name != id_value:
+                            lines = [f"{id_value} | {name}"]
+                        else:
+                            lines = [id_value]
+
+                        # 按排名排序标题
+                        sorted_titles = []
+                        for title, info in title_data.items():
+                            cleaned = clean_title(title)
+                            if isinstance(info, dict):
+                                ranks = info.get("ranks", [])
+                                url = info.get("url", "")
+                                mobile_url = info.get("mobileUrl", "")
                             else:
-                                f.write(f"{id_value}\n")
-
-                            # 按排名排序标题
-                            sorted_titles = []
-                            for title, info in title_data.items():
-                                cleaned = clean_title(title)
-                                if isinstance(info, dict):
-                                    ranks = info.get("ranks", [])
-                                    url = info.get("url", "")
-                                    mobile_url = info.get("mobileUrl", "")
-                                else:
-                                    ranks = info if isinstance(info, list) else []
-                                    url = ""
-                                    mobile_url = ""
-
-                                rank = ranks[0] if ranks else 1
-                                sorted_titles.append((rank, cleaned, url, mobile_url))
-
-                            sorted_titles.sort(key=lambda x: x[0])
-
-                            for rank, cleaned, url, mobile_url in sorted_titles:
-                                line = f"{rank}. {cleaned}"
-                                if url:
-                                    line += f" [URL:{url}]"
-                                if mobile_url:
-                                    line += f" [MOBILE:{mobile_url}]"
-                                f.write(line + "\n")
-
-                            f.write("\n")
-
-                        if failed_ids:
-                            f.write("==== 以下ID请求失败 ====\n")
-                            for id_value in failed_ids:
-                                f.write(f"{id_value}\n")
+                                ranks = info if isinstance(info, list) else []
+                                url = ""
+                                mobile_url = ""
+
+                            rank = ranks[0] if ranks else 1
+                            url = compact_url(id_value, "url", cleaned, url)
+                            mobile_url = compact_url(id_value, "mobile_url", cleaned, mobile_url)
+                            sorted_titles.append((rank, cleaned, url, mobile_url))
+
+                        sorted_titles.sort(key=lambda x: x[0])
+
+                        for rank, cleaned, url, mobile_url in sorted_titles:
+                            lines.append(format_title_line(rank, cleaned, url, mobile_url))
+
+                        sections.append((id_value, "\n".join(lines) + "\n\n"))
+
+                    footer = ""
+                    if failed_ids:
+                        footer = "==== 以下ID请求失败 ====\n" + "".join(
+                            f"{id_value}\n" for id_value in failed_ids
+                        )
+
+                    # 首行为平台偏移索引
+                    txt_file_path = output_storage.write_bytes(
+                        f"{date_folder}/txt/{time_filename}.txt",
+                        format_snapshot(sections, footer),
+                    )
+
+                    # 配置了 SQLite 存储时同步写入快照库
+                    store = self.data_service.parser.get_snapshot_store()
+                    if store is not None:
+                        from storage.sqlite_store import folder_to_date
+                        from storage.txt_format import parse_snapshot_file
+
+                        titles_by_id, saved_id_to_name, saved_failed_ids, _ = parse_snapshot_file(txt_file_path)
+                        store.save_snapshot(
+                            folder_to_date(date_folder),
+                            time_filename,
+                            titles_by_id,
+                            saved_id_to_name,
+                            saved_failed_ids
+                        )
 
                     # 保存 html 文件（简化版）
                     html_content = self._generate_simple_html(results, id_to_name, failed_ids, now)
-                    with open(html_file_path, "w", encoding="utf-8") as f:
-                        f.write(html_content)
+                    html_file_path = output_storage.write_text(
+                        f"{date_folder}/html/{time_filename}.html", html_content
+                    )
+                    output_storage.flush()
 
                     print(f"数据已保存到:")
                     print(f"  TXT: {txt_file_path}")
@@ -4,14 +4,19 @@ from typing import Dict, List, Optional
 from rss.generator import RSSGenerator
 from rss.models import RSSFeed, RSSItem
 from rss.storage import RSSStorage
+from storage.url_templates import expand_url
 
 
 class RSSService:
     """RSS服务接口类"""
 
-    def __init__(self):
+    def __init__(self, storage_backend=None):
+        """
+        Args:
+            storage_backend: output 目录的存储后端（storage.backend），RSS 文件写入其 rss/ 下；默认写入本地 output/rss
+        """
         self.generator = RSSGenerator()
-        self.storage = RSSStorage()
+        self.storage = RSSStorage(backend=storage_backend)
         self.base_url = "https://trendradar.example.com"
 
     def generate_rss_feed(self, frequency_results: Dict, id_to_name: Dict) -> RSSFeed:
@@ -82,17 +87,25 @@ class RSSService:
             for title, info in title_data.items():
                 # 提取新闻信息
                 cleaned_title = title
-                if isinstance(info, dict):
+                if isinstance(info, list):
+                    ranks = info
+                    url = ""
+                    mobile_url = ""
+                elif hasattr(info, "get"):
+                    # 字典或 main.py 中的 NewsItem 记录
                     ranks = info.get("ranks", [])
                     url = info.get("url", "")
                     mobile_url = info.get("mobileUrl", "")
                 else:
-                    ranks = info if isinstance(info, list) else []
+                    ranks = []
                     url = ""
                     mobile_url = ""
 
                 rank = ranks[0] if ranks else 1
                 pub_date = datetime.now()
+                # 快照中按模板压缩的链接
+                url = expand_url(source_id, "url", cleaned_title, url)
+                mobile_url = expand_url(source_id, "mobile_url", cleaned_title, mobile_url)
 
                 # 生成描述
                 description = f"来源: {source_name} | 排名: {rank}"
@@ -6,13 +6,25 @@ from typing import Dict, List, Optional, Set
 
 from rss.generator import RSSGenerator
 from rss.models import RSSFeed, RSSItem
+from storage.backend import LocalStorage, StorageBackend
 
 
 class RSSStorage:
     """RSS数据持久化存储类"""
 
-    def __init__(self, base_dir: str = "output/rss"):
-        self.base_dir = Path(base_dir)
+    def __init__(self, base_dir: str = "output/rss", backend: Optional[StorageBackend] = None):
+        """
+        Args:
+            base_dir: 未指定存储后端时的本地存储目录
+            backend: output 目录的存储后端，指定时 RSS 文件保存在其 rss/ 下（可为对象存储）
+        """
+        if backend is None:
+            self.backend = LocalStorage(Path(base_dir))
+            self.key_prefix = ""
+        else:
+            self.backend = backend
+            self.key_prefix = "rss/"
+        self.base_dir = self.backend.local_path(self.key_prefix)
         self.generator = RSSGenerator()
         self._ensure_directory_exists()
 
@@ -33,6 +45,10 @@ class RSSStorage:
         filename = f"{keyword}.xml"
         return self.base_dir / filename
 
+    def _get_key(self, keyword: str) -> str:
+        """RSS文件在存储后端中的键"""
+        return f"{self.key_prefix}{keyword}.xml"
+
     def _read_existing_rss(self, keyword: str) -> Optional[RSSFeed]:
         """读取已存在的RSS文件"""
         file_path = self._get_file_path(keyword)
@@ -61,28 +77,16 @@ class RSSStorage:
         # 生成RSS内容
         rss_content = self.generator.generate_rss(feed)
         
-        # 获取文件路径
-        file_path = self._get_file_path(keyword)
-        
         # 写入文件
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(rss_content)
-        
-        return file_path
+        return self.backend.write_text(self._get_key(keyword), rss_content)
 
     def save_rss_by_keyword(self, feed: RSSFeed, keyword: str) -> Path:
         """根据关键词保存RSS，实现增量更新"""
         # 生成关键词相关的RSS内容
         rss_content = self.generator.generate_rss_by_keyword(feed, keyword)
         
-        # 获取文件路径
-        file_path = self._get_file_path(keyword)
-        
         # 写入文件
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(rss_content)
-        
-        return file_path
+        return self.backend.write_text(self._get_key(keyword), rss_content)
 
     def save_multiple_feeds(self, feed: RSSFeed) -> Dict[str, Path]:
         """保存多个关键词的RSS"""
@@ -105,13 +109,10 @@ class RSSStorage:
 
     def read_rss(self, keyword: str) -> Optional[str]:
         """读取指定关键词的RSS内容"""
-        file_path = self._get_file_path(keyword)
-        if not file_path.exists():
-            return None
-        
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
+            return self.backend.read_text(self._get_key(keyword))
+        except FileNotFoundError:
+            return None
         except Exception as e:
             print(f"读取RSS内容失败: {e}")
             return None
@@ -119,10 +120,10 @@ class RSSStorage:
     def list_available_keywords(self) -> List[str]:
         """列出所有可用的RSS关键词"""
         keywords = []
-        for file_path in self.base_dir.iterdir():
-            if file_path.suffix == ".xml":
-                keyword = file_path.stem
-                keywords.append(keyword)
+        for key in self.backend.list_keys(self.key_prefix):
+            name = key[len(self.key_prefix):]
+            if "/" not in name and name.endswith(".xml"):
+                keywords.append(name[:-len(".xml")])
         return keywords
 
     def delete_old_rss(self, days: int = 30) -> int:
@@ -134,7 +135,7 @@ class RSSStorage:
             if file_path.suffix == ".xml":
                 mtime = file_path.stat().st_mtime
                 if mtime < cutoff_date:
-                    file_path.unlink()
+                    self.backend.delete(self._get_key(file_path.stem))
                     deleted_count += 1
         
         return deleted_count
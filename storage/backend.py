@@ -0,0 +1,450 @@
+"""
+存储后端
+
+output 目录下的快照、报告和 RSS 文件统一按键（相对 output 目录的路径，如 `2025年11月01日/txt/10时00分.txt`）读写：
+
+- LocalStorage: 只保存在本地 output 目录（默认）
+- S3Storage: S3 兼容对象存储（AWS S3、MinIO 等）。本地 output 目录作为读写缓存：写入先落到本地，
+  累计到 batch_size 个或调用 flush() 时并发上传；读取一天的数据前调用 sync() 下载远端新增或变化的对象
+  （按 ETag 判断，列举结果在 list_ttl 秒内复用）。解析、归档等按路径工作的代码继续读取本地缓存文件。
+
+抓取任务和多个 MCP 服务配置同一个桶即可共享数据，不再依赖提交到 git 的 output 文件。
+
+    storage:
+      object_store:
+        type: "s3"
+        bucket: "trendradar"
+        endpoint_url: "http://127.0.0.1:9000"  # MinIO
+
+访问密钥通过环境变量 S3_ACCESS_KEY_ID / S3_SECRET_ACCESS_KEY 提供（未设置时使用 boto3 默认的凭证链）。
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# S3 存储在本地缓存目录中记录已同步对象 ETag 的文件
+S3_MANIFEST_FILENAME = ".s3_manifest.json"
+
+# 对象存储配置项 -> 覆盖它的环境变量
+_ENV_OVERRIDES = {
+    "type": "OBJECT_STORE_TYPE",
+    "bucket": "S3_BUCKET",
+    "endpoint_url": "S3_ENDPOINT_URL",
+    "region": "S3_REGION",
+    "prefix": "S3_PREFIX",
+    "access_key_id": "S3_ACCESS_KEY_ID",
+    "secret_access_key": "S3_SECRET_ACCESS_KEY",
+}
+
+
+class StorageBackend(ABC):
+    """存储后端接口：键为相对 output 目录、以 / 分隔的路径"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def local_path(self, key: str) -> Path:
+        """键对应的本地文件路径（S3 存储为本地缓存文件）"""
+        return self.root / key
+
+    @abstractmethod
+    def write_bytes(self, key: str, data: bytes) -> Path:
+        """写入对象，返回本地文件路径"""
+
+    @abstractmethod
+    def read_bytes(self, key: str) -> bytes:
+        """
+        读取对象
+
+        Raises:
+            FileNotFoundError: 对象不存在
+        """
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """对象是否存在"""
+
+    @abstractmethod
+    def list_keys(self, prefix: str = "") -> List[str]:
+        """按键排序列出以 prefix 开头的所有对象"""
+
+    @abstractmethod
+    def list_dirs(self, prefix: str = "") -> List[str]:
+        """列出 prefix（以 / 结尾或为空）下一级的目录名"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """删除对象（不存在时忽略）"""
+
+    def write_text(self, key: str, text: str) -> Path:
+        return self.write_bytes(key, text.encode("utf-8"))
+
+    def read_text(self, key: str) -> str:
+        return self.read_bytes(key).decode("utf-8")
+
+    def sync(self, prefix: str = "") -> int:
+        """把 prefix 下远端新增或变化的对象下载到本地，返回下载数（本地存储无需同步）"""
+        return 0
+
+    def flush(self) -> int:
+        """上传尚未上传的写入，返回上传数（本地存储无需上传）"""
+        return 0
+
+    def has_pending(self, prefix: str = "") -> bool:
+        """是否还有以 prefix 开头、尚未上传成功的写入"""
+        return False
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """先写临时文件再替换，读取方不会看到写了一半的文件"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class LocalStorage(StorageBackend):
+    """本地目录存储"""
+
+    def write_bytes(self, key: str, data: bytes) -> Path:
+        path = self.local_path(key)
+        _atomic_write(path, data)
+        return path
+
+    def read_bytes(self, key: str) -> bytes:
+        return self.local_path(key).read_bytes()
+
+    def exists(self, key: str) -> bool:
+        return self.local_path(key).is_file()
+
+    def list_keys(self, prefix: str = "") -> List[str]:
+        base = self.root / prefix
+        search_dir = base if prefix.endswith("/") or not prefix or base.is_dir() else base.parent
+        if not search_dir.is_dir():
+            return []
+        keys = []
+        for path in search_dir.rglob("*"):
+            if path.is_file() and not path.name.endswith(".tmp"):
+                key = path.relative_to(self.root).as_posix()
+                if key.startswith(prefix):
+                    keys.append(key)
+        return sorted(keys)
+
+    def list_dirs(self, prefix: str = "") -> List[str]:
+        base = self.root / prefix
+        if not base.is_dir():
+            return []
+        return sorted(path.name for path in base.iterdir() if path.is_dir())
+
+    def delete(self, key: str) -> None:
+        path = self.local_path(key)
+        if path.is_file():
+            path.unlink()
+
+
+class S3Storage(StorageBackend):
+    """S3 兼容对象存储，本地目录作为读写缓存（见模块说明）"""
+
+    def __init__(
+        self,
+        bucket: str,
+        root: Path = Path("output"),
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        batch_size: int = 20,
+        max_workers: int = 4,
+        list_ttl: int = 60,
+        client=None,
+    ):
+        """
+        Args:
+            bucket: 桶名称
+            root: 本地缓存目录
+            prefix: 对象键前缀（多套部署共用一个桶时区分）
+            endpoint_url: 非 AWS 服务的地址，如 MinIO 的 http://127.0.0.1:9000
+            batch_size: 待上传文件累计到该数量时批量上传
+            max_workers: 并发上传/下载的线程数
+            list_ttl: 同一前缀的列举结果复用时间（秒）
+            client: 已创建的 S3 客户端（测试时传入），默认用 boto3 创建
+        """
+        super().__init__(root)
+        if not bucket:
+            raise ValueError("S3 存储需要配置 bucket")
+        if client is None:
+            try:
+                import boto3
+            except ImportError as e:
+                raise ImportError("使用 S3 存储需要安装 boto3: pip install boto3") from e
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url or None,
+                region_name=region or None,
+                aws_access_key_id=access_key_id or None,
+                aws_secret_access_key=secret_access_key or None,
+            )
+        self.client = client
+        self.bucket = bucket
+        self.prefix = f"{prefix.strip('/')}/" if prefix.strip("/") else ""
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers)
+        self.list_ttl = list_ttl
+
+        self._lock = threading.Lock()
+        # 已写入本地、尚未上传的键
+        self._pending: List[str] = []
+        # 各前缀最近一次列举的时间和结果 {键: (大小, ETag, 修改时间戳)}
+        self._listings: Dict[str, Tuple[float, Dict[str, Tuple[int, str, float]]]] = {}
+        # 本地缓存文件对应的远端 ETag，进程重启后从清单文件恢复
+        self._manifest_path = self.root / S3_MANIFEST_FILENAME
+        self._manifest: Dict[str, str] = self._load_manifest()
+
+    # === 本地缓存清单 ===
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self._manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"读取 S3 缓存清单失败，将重新下载: {e}")
+            return {}
+
+    def _save_manifest(self) -> None:
+        with self._lock:
+            data = json.dumps(self._manifest, ensure_ascii=False).encode("utf-8")
+        try:
+            _atomic_write(self._manifest_path, data)
+        except Exception as e:
+            print(f"保存 S3 缓存清单失败: {e}")
+
+    # === 远端操作 ===
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _list_remote(self, prefix: str) -> Dict[str, Tuple[int, str, float]]:
+        """列举远端对象（list_ttl 内复用），返回 {键: (大小, ETag, 修改时间戳)}"""
+        cached = self._listings.get(prefix)
+        if cached is not None and time.time() - cached[0] < self.list_ttl:
+            return cached[1]
+
+        objects = {}
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._object_key(prefix)):
+            for obj in page.get("Contents", []):
+                key = obj["Key"][len(self.prefix):]
+                modified = obj.get("LastModified")
+                objects[key] = (
+                    obj.get("Size", 0),
+                    obj.get("ETag", ""),
+                    modified.timestamp() if modified is not None else time.time(),
+                )
+        self._listings[prefix] = (time.time(), objects)
+        return objects
+
+    def _download(self, key: str, mtime: Optional[float] = None) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+        data = response["Body"].read()
+        path = self.local_path(key)
+        _atomic_write(path, data)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        with self._lock:
+            self._manifest[key] = response.get("ETag", "")
+        return data
+
+    def _upload(self, key: str) -> None:
+        data = self.local_path(key).read_bytes()
+        response = self.client.put_object(
+            Bucket=self.bucket, Key=self._object_key(key), Body=data
+        )
+        with self._lock:
+            self._manifest[key] = response.get("ETag", "")
+
+    def _forget_listings(self, key: str) -> None:
+        """键发生变化后作废包含它的列举缓存"""
+        for prefix in [p for p in self._listings if key.startswith(p)]:
+            del self._listings[prefix]
+
+    # === StorageBackend ===
+    def write_bytes(self, key: str, data: bytes) -> Path:
+        path = self.local_path(key)
+        _atomic_write(path, data)
+        with self._lock:
+            if key not in self._pending:
+                self._pending.append(key)
+            full = len(self._pending) >= self.batch_size
+        self._forget_listings(key)
+        if full:
+            self.flush()
+        return path
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+            for key, error in zip(
+                pending, executor.map(self._try, [self._upload] * len(pending), pending)
+            ):
+                if error is not None:
+                    print(f"上传 {key} 失败: {error}")
+                    failed.append(key)
+
+        # 上传失败的文件留到下次 flush 重试
+        with self._lock:
+            self._pending = failed + [key for key in self._pending if key not in failed]
+        self._save_manifest()
+        return len(pending) - len(failed)
+
+    def has_pending(self, prefix: str = "") -> bool:
+        with self._lock:
+            return any(key.startswith(prefix) for key in self._pending)
+
+    def read_bytes(self, key: str) -> bytes:
+        path = self.local_path(key)
+        with self._lock:
+            cached = key in self._pending or key in self._manifest
+        if cached and path.is_file():
+            return path.read_bytes()
+        try:
+            data = self._download(key)
+        except Exception as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(key) from e
+            raise
+        self._save_manifest()
+        return data
+
+    def exists(self, key: str) -> bool:
+        with self._lock:
+            if key in self._pending:
+                return True
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except Exception as e:
+            if _is_not_found(e):
+                return False
+            raise
+
+    def list_keys(self, prefix: str = "") -> List[str]:
+        keys = set(self._list_remote(prefix))
+        with self._lock:
+            keys.update(key for key in self._pending if key.startswith(prefix))
+        return sorted(keys)
+
+    def list_dirs(self, prefix: str = "") -> List[str]:
+        names = set()
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(
+            Bucket=self.bucket, Prefix=self._object_key(prefix), Delimiter="/"
+        ):
+            for common in page.get("CommonPrefixes", []):
+                names.add(common["Prefix"][len(self._object_key(prefix)):].rstrip("/"))
+        with self._lock:
+            for key in self._pending:
+                if key.startswith(prefix) and "/" in key[len(prefix):]:
+                    names.add(key[len(prefix):].split("/", 1)[0])
+        return sorted(names)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+        path = self.local_path(key)
+        if path.is_file():
+            path.unlink()
+        with self._lock:
+            self._manifest.pop(key, None)
+            if key in self._pending:
+                self._pending.remove(key)
+        self._forget_listings(key)
+        self._save_manifest()
+
+    def sync(self, prefix: str = "") -> int:
+        remote = self._list_remote(prefix)
+        with self._lock:
+            stale = [
+                (key, mtime)
+                for key, (_, etag, mtime) in remote.items()
+                if key not in self._pending
+                and (self._manifest.get(key) != etag or not self.local_path(key).is_file())
+            ]
+        if not stale:
+            return 0
+
+        downloaded = 0
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(stale))) as executor:
+            results = executor.map(
+                lambda item: self._try(self._download, item[0], item[1]), stale
+            )
+            for (key, _), error in zip(stale, results):
+                if error is not None:
+                    print(f"下载 {key} 失败: {error}")
+                else:
+                    downloaded += 1
+        self._save_manifest()
+        return downloaded
+
+    @staticmethod
+    def _try(func, *args) -> Optional[Exception]:
+        try:
+            func(*args)
+            return None
+        except Exception as e:
+            return e
+
+
+def _is_not_found(error: Exception) -> bool:
+    """S3 客户端错误是否表示对象不存在"""
+    code = str(getattr(error, "response", {}).get("Error", {}).get("Code", ""))
+    return code in ("404", "NoSuchKey", "NotFound")
+
+
+def resolve_object_store_config(config: Optional[Dict]) -> Dict:
+    """读取 storage.object_store 配置，环境变量优先"""
+    resolved = dict(config or {})
+    for name, env_name in _ENV_OVERRIDES.items():
+        value = os.environ.get(env_name, "").strip()
+        if value:
+            resolved[name] = value
+    resolved["type"] = str(resolved.get("type") or "local").lower()
+    return resolved
+
+
+def create_storage(config: Optional[Dict], root: Path = Path("output")) -> StorageBackend:
+    """
+    按 storage.object_store 配置创建存储后端
+
+    Args:
+        config: object_store 配置（已应用环境变量覆盖时原样使用）
+        root: 本地目录（S3 存储的本地缓存目录）
+    """
+    config = resolve_object_store_config(config)
+    if config["type"] == "local":
+        return LocalStorage(root)
+    if config["type"] == "s3":
+        return S3Storage(
+            config.get("bucket", ""),
+            root,
+            prefix=config.get("prefix", ""),
+            endpoint_url=config.get("endpoint_url"),
+            region=config.get("region"),
+            access_key_id=config.get("access_key_id"),
+            secret_access_key=config.get("secret_access_key"),
+            batch_size=int(config.get("batch_size", 20)),
+            max_workers=int(config.get("max_workers", 4)),
+            list_ttl=int(config.get("list_ttl", 60)),
+        )
+    raise ValueError(f"不支持的存储类型: {config['type']}")
@@ -0,0 +1,432 @@
+"""
+按天归档的快照压缩包
+
+已结束的日期不会再写入新快照，把当天的 txt 快照打包成一个压缩文件（output/<日期>/txt.archive）。
+相邻快照内容高度重复，因此按时间顺序每 block_size 个快照压缩成一个块，文件末尾的索引记录
+每个快照所在的块和块内偏移：读取单个快照只需解压它所在的块，不需要解压整天的数据。
+
+文件结构：
+
+    MAGIC | 块 0 | 块 1 | ... | 索引(JSON) | 索引偏移(8 字节大端)
+
+打包（默认打包北京时间今天之前的所有日期，校验无误后删除 txt 目录）：
+
+    python -m storage.day_archive pack output
+
+还原为 txt 文件：
+
+    python -m storage.day_archive extract output/2025年11月01日
+
+配置了对象存储（storage.object_store）时，先同步当天的数据，归档经存储后端上传，txt 文件从远端一并删除。
+"""
+
+import argparse
+import json
+import lzma
+import os
+import struct
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from storage.backend import LocalStorage, StorageBackend, create_storage
+
+ARCHIVE_FILE_NAME = "txt.archive"
+MAGIC = b"TRENDRADAR-ARCHIVE\x001\n"
+DEFAULT_CODEC = "lzma"
+DEFAULT_BLOCK_SIZE = 8
+
+_FOOTER = struct.Struct(">Q")
+CODECS = {
+    "lzma": (lzma.compress, lzma.decompress),
+    "zlib": (lambda data: zlib.compress(data, 9), zlib.decompress),
+}
+
+
+class DayArchive:
+    """一天的快照归档（只读）"""
+
+    def __init__(self, path: Path):
+        """
+        打开归档并读取索引
+
+        Raises:
+            ValueError: 文件不是有效的归档
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"不是有效的快照归档: {self.path}")
+            f.seek(-_FOOTER.size, os.SEEK_END)
+            index_end = f.tell()
+            (index_offset,) = _FOOTER.unpack(f.read(_FOOTER.size))
+            f.seek(index_offset)
+            index = json.loads(f.read(index_end - index_offset).decode("utf-8"))
+
+        if index["codec"] not in CODECS:
+            raise ValueError(f"不支持的压缩方式: {index['codec']}")
+        self.codec = index["codec"]
+        # 块列表 [(文件偏移, 压缩后长度)]
+        self._blocks: List[Tuple[int, int]] = [tuple(block) for block in index["blocks"]]
+        # 快照时间 -> (块下标, 块内偏移, 长度, 原文件修改时间)，按时间排序
+        self._snapshots: Dict[str, Tuple[int, int, int, float]] = {
+            time_info: (block, start, size, mtime)
+            for time_info, block, start, size, mtime in index["snapshots"]
+        }
+        # 最近解压的块（顺序读取同一块内的快照时复用）
+        self._cached_block: Optional[Tuple[int, bytes]] = None
+
+    @classmethod
+    def open(cls, day_dir: Path) -> Optional["DayArchive"]:
+        """打开日期目录下的归档，不存在时返回 None"""
+        path = Path(day_dir) / ARCHIVE_FILE_NAME
+        return cls(path) if path.is_file() else None
+
+    def __contains__(self, time_info: str) -> bool:
+        return time_info in self._snapshots
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def times(self) -> List[str]:
+        """按时间顺序返回所有快照时间"""
+        return list(self._snapshots)
+
+    def mtime(self, time_info: str) -> float:
+        """快照原 txt 文件的修改时间"""
+        return self._snapshots[time_info][3]
+
+    def read_bytes(self, time_info: str) -> bytes:
+        """读取单个快照的原始内容（只解压所在的块）"""
+        block, start, size, _ = self._snapshots[time_info]
+        return self._read_block(block)[start:start + size]
+
+    def read_text(self, time_info: str) -> str:
+        """读取单个快照的文本内容"""
+        return self.read_bytes(time_info).decode("utf-8")
+
+    def iter_snapshots(self) -> Iterator[Tuple[str, float, str]]:
+        """按时间顺序产出 (快照时间, 修改时间, 文本内容)，每个块只解压一次"""
+        for time_info, (_, _, _, mtime) in self._snapshots.items():
+            yield time_info, mtime, self.read_text(time_info)
+
+    def loader(self, cache: Optional[Dict] = None, platform_ids: Optional[Iterable[str]] = None):
+        """
+        按快照时间解析归档中快照的函数（作为增量快照的 load_base），解析结果缓存在 cache 中
+
+        指定 platform_ids 时按快照的平台偏移索引只解析这些平台。
+        """
+        from storage.txt_format import parse_snapshot_text, select_platform_sections
+
+        cache = {} if cache is None else cache
+        if platform_ids is not None:
+            platform_ids = frozenset(platform_ids)
+
+        def load(time_info: str):
+            if time_info not in cache:
+                # 先占位，防止损坏的快照循环引用
+                cache[time_info] = None
+                if time_info in self._snapshots:
+                    data = self.read_bytes(time_info)
+                    if platform_ids is not None:
+                        data = select_platform_sections(data, platform_ids)
+                    cache[time_info] = parse_snapshot_text(
+                        data.decode("utf-8"), load, platform_ids
+                    )
+            return cache[time_info]
+
+        return load
+
+    def _read_block(self, block: int) -> bytes:
+        if self._cached_block is not None and self._cached_block[0] == block:
+            return self._cached_block[1]
+        offset, length = self._blocks[block]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = CODECS[self.codec][1](f.read(length))
+        self._cached_block = (block, data)
+        return data
+
+
+def day_snapshot_loader(
+    txt_dir: Path,
+    cache: Optional[Dict] = None,
+    platform_ids: Optional[Iterable[str]] = None,
+):
+    """
+    按快照时间读取一天快照的函数：先读 txt 目录，不存在的快照再从当天的归档读取
+
+    打包后又写入的 txt 快照可能以归档中的快照为增量基准或未变化引用，只读 txt 目录时这些平台的标题会丢失。
+    """
+    from storage.txt_format import directory_loader
+
+    archive = DayArchive.open(Path(txt_dir).parent)
+    fallback = archive.loader(platform_ids=platform_ids) if archive is not None else None
+    return directory_loader(txt_dir, cache, platform_ids, fallback)
+
+
+def build_archive(
+    snapshots: List[Tuple[str, float, bytes]],
+    codec: str = DEFAULT_CODEC,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> bytes:
+    """
+    生成归档内容
+
+    Args:
+        snapshots: [(快照时间, 修改时间, 原始内容)]，按时间排序
+        codec: 压缩方式，lzma 或 zlib
+        block_size: 每个压缩块包含的快照数
+    """
+    compress = CODECS[codec][0]
+    block_size = max(1, block_size)
+    blocks = []
+    entries = []
+
+    parts = [MAGIC]
+    offset = len(MAGIC)
+    for block_start in range(0, len(snapshots), block_size):
+        chunk = snapshots[block_start:block_start + block_size]
+        start = 0
+        for time_info, mtime, data in chunk:
+            entries.append([time_info, len(blocks), start, len(data), mtime])
+            start += len(data)
+        compressed = compress(b"".join(data for _, _, data in chunk))
+        blocks.append([offset, len(compressed)])
+        parts.append(compressed)
+        offset += len(compressed)
+
+    index = {"codec": codec, "blocks": blocks, "snapshots": entries}
+    parts.append(json.dumps(index, ensure_ascii=False).encode("utf-8"))
+    parts.append(_FOOTER.pack(offset))
+    return b"".join(parts)
+
+
+def write_archive(
+    path: Path,
+    snapshots: List[Tuple[str, float, bytes]],
+    codec: str = DEFAULT_CODEC,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> None:
+    """写入归档（先写临时文件再替换，中途失败不会留下损坏的归档），参数同 build_archive"""
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(build_archive(snapshots, codec, block_size))
+    os.replace(tmp_path, path)
+
+
+def _day_storage(day_dir: Path, storage: Optional[StorageBackend]) -> StorageBackend:
+    """未指定存储后端时直接读写日期目录所在的本地目录"""
+    return storage if storage is not None else LocalStorage(Path(day_dir).parent)
+
+
+def pack_day(
+    day_dir: Path,
+    codec: str = DEFAULT_CODEC,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    remove_txt: bool = True,
+    storage: Optional[StorageBackend] = None,
+) -> Optional[Path]:
+    """
+    把一天的 txt 快照打包为归档
+
+    已有归档时与其合并（同名快照以 txt 文件为准）。写入后逐个校验内容，校验通过才删除 txt 文件，
+    同时删除日期目录下的隐藏 JSON 文件（当日聚合、匹配缓存、平台指纹等，均可由快照重建），
+    避免已结束的日期仍以明文 JSON 保存一份近似全量的数据。
+
+    读写都经过 storage（默认为日期目录所在的本地目录）：对象存储时先同步当天的数据，
+    归档上传成功后才删除远端和本地的 txt 文件。
+
+    Returns:
+        归档的本地路径，没有 txt 快照时返回 None
+
+    Raises:
+        OSError: 归档上传失败（txt 文件保持不变）
+    """
+    storage = _day_storage(day_dir, storage)
+    folder = Path(day_dir).name
+    storage.sync(f"{folder}/")
+    txt_keys = [
+        key
+        for key in storage.list_keys(f"{folder}/txt/")
+        if key.endswith(".txt") and key.count("/") == 2
+    ]
+    if not txt_keys:
+        return None
+
+    contents: Dict[str, Tuple[float, bytes]] = {}
+    existing = DayArchive.open(storage.local_path(folder))
+    if existing is not None:
+        for time_info in existing.times():
+            contents[time_info] = (existing.mtime(time_info), existing.read_bytes(time_info))
+    for key in txt_keys:
+        data = storage.read_bytes(key)
+        contents[Path(key).stem] = (storage.local_path(key).stat().st_mtime, data)
+
+    archive_key = f"{folder}/{ARCHIVE_FILE_NAME}"
+    path = storage.write_bytes(
+        archive_key,
+        build_archive(
+            [(time_info, mtime, data) for time_info, (mtime, data) in sorted(contents.items())],
+            codec,
+            block_size,
+        ),
+    )
+
+    archive = DayArchive(path)
+    for time_info, (_, data) in contents.items():
+        if archive.read_bytes(time_info) != data:
+            raise ValueError(f"归档校验失败: {path} {time_info}")
+
+    storage.flush()
+    if storage.has_pending(archive_key):
+        raise OSError(f"归档上传失败，保留 txt 文件: {archive_key}")
+
+    if remove_txt:
+        for key in txt_keys:
+            storage.delete(key)
+        txt_dir = storage.local_path(f"{folder}/txt")
+        if txt_dir.is_dir() and not any(txt_dir.iterdir()):
+            txt_dir.rmdir()
+        # 隐藏 JSON 文件可能只在本地（如当日聚合），也可能已上传
+        sidecars = {
+            key
+            for key in storage.list_keys(f"{folder}/")
+            if key.count("/") == 1 and Path(key).name.startswith(".") and key.endswith(".json")
+        }
+        sidecars.update(f"{folder}/{p.name}" for p in storage.local_path(folder).glob(".*.json"))
+        for key in sorted(sidecars):
+            storage.delete(key)
+    return path
+
+
+def extract_day(
+    day_dir: Path, remove_archive: bool = False, storage: Optional[StorageBackend] = None
+) -> int:
+    """
+    把归档还原为 txt 文件（保留原修改时间），读写经过 storage（默认为日期目录所在的本地目录）
+
+    Returns:
+        还原的快照数
+    """
+    storage = _day_storage(day_dir, storage)
+    folder = Path(day_dir).name
+    storage.sync(f"{folder}/")
+    archive = DayArchive.open(storage.local_path(folder))
+    if archive is None:
+        return 0
+
+    for time_info in archive.times():
+        txt_file = storage.write_bytes(f"{folder}/txt/{time_info}.txt", archive.read_bytes(time_info))
+        mtime = archive.mtime(time_info)
+        os.utime(txt_file, (mtime, mtime))
+    storage.flush()
+
+    if remove_archive:
+        storage.delete(f"{folder}/{ARCHIVE_FILE_NAME}")
+    return len(archive)
+
+
+def pack_output_dir(
+    output_dir: str = "output",
+    before: Optional[str] = None,
+    codec: str = DEFAULT_CODEC,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    remove_txt: bool = True,
+    storage: Optional[StorageBackend] = None,
+) -> List[Path]:
+    """
+    打包 output 目录下已结束日期的 txt 快照
+
+    Args:
+        output_dir: output 目录
+        before: 只打包该日期（YYYY-MM-DD，不含）之前的日期，默认为北京时间今天
+        storage: output 目录的存储后端，默认为本地目录 output_dir
+
+    Returns:
+        写入的归档路径列表
+    """
+    from storage.sqlite_store import folder_to_date
+
+    if before is None:
+        import pytz
+
+        before = datetime.now(pytz.timezone("Asia/Shanghai")).strftime("%Y-%m-%d")
+    if storage is None:
+        storage = LocalStorage(Path(output_dir))
+
+    packed = []
+    for folder in storage.list_dirs():
+        try:
+            date = folder_to_date(folder)
+        except ValueError:
+            continue
+        if date >= before:
+            continue
+        path = pack_day(storage.local_path(folder), codec, block_size, remove_txt, storage)
+        if path is not None:
+            packed.append(path)
+    return packed
+
+
+def load_output_storage(output_dir: str) -> StorageBackend:
+    """按 config.yaml（CONFIG_PATH 环境变量可指定路径）的 storage.object_store 创建 output 目录的存储后端"""
+    config_path = Path(os.environ.get("CONFIG_PATH", "config/config.yaml"))
+    object_store = None
+    if config_path.exists():
+        import yaml
+
+        with open(config_path, "r", encoding="utf-8") as f:
+            config_data = yaml.safe_load(f) or {}
+        object_store = (config_data.get("storage") or {}).get("object_store")
+    return create_storage(object_store, Path(output_dir))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TrendRadar 快照归档工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pack_parser = subparsers.add_parser("pack", help="打包已结束日期的 txt 快照")
+    pack_parser.add_argument(
+        "output_dir", nargs="?", default="output", help="output 目录（默认: output）"
+    )
+    pack_parser.add_argument(
+        "--before", help="只打包该日期之前的数据，格式 YYYY-MM-DD（默认: 北京时间今天）"
+    )
+    pack_parser.add_argument(
+        "--codec", choices=sorted(CODECS), default=DEFAULT_CODEC, help=f"压缩方式（默认: {DEFAULT_CODEC}）"
+    )
+    pack_parser.add_argument(
+        "--block-size",
+        type=int,
+        default=DEFAULT_BLOCK_SIZE,
+        help=f"每个压缩块的快照数，越大压缩率越高、随机读取越慢（默认: {DEFAULT_BLOCK_SIZE}）",
+    )
+    pack_parser.add_argument("--keep-txt", action="store_true", help="打包后保留 txt 文件")
+
+    extract_parser = subparsers.add_parser("extract", help="把日期目录下的归档还原为 txt 文件")
+    extract_parser.add_argument("day_dir", help="日期目录，如 output/2025年11月01日")
+    extract_parser.add_argument("--remove", action="store_true", help="还原后删除归档")
+
+    args = parser.parse_args()
+    if args.command == "pack":
+        packed = pack_output_dir(
+            args.output_dir,
+            args.before,
+            args.codec,
+            args.block_size,
+            not args.keep_txt,
+            load_output_storage(args.output_dir),
+        )
+        for path in packed:
+            print(f"已归档: {path} ({path.stat().st_size / 1024:.1f} KB)")
+        print(f"归档完成: {len(packed)} 天")
+    elif args.command == "extract":
+        day_dir = Path(args.day_dir)
+        count = extract_day(day_dir, args.remove, load_output_storage(str(day_dir.parent)))
+        print(f"还原完成: {count} 个快照")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+快照并行加载
+
+冷启动读取一天或多天的 txt 快照时，在进程池中并行解析文件，结果按输入顺序返回，
+由调用方按快照时间顺序合并（合并依赖顺序，不能并行）。进程池在进程内复用。
+
+增量快照需要读取同一天之前的快照，因此同一目录的连续文件按块分配给子进程，块内共用解析缓存，
+引用链上的文件只解析一次。
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from storage.day_archive import day_snapshot_loader
+from storage.txt_format import SnapshotLoader, parse_snapshot_file
+
+# 文件数少于该值时直接在当前进程解析（启动进程和传输结果的开销大于并行收益）
+MIN_PARALLEL_FILES = 8
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """解析进程数配置：0 或未配置时使用 CPU 核数"""
+    if not workers or workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executor_workers = workers
+    return _executor
+
+
+def shutdown() -> None:
+    """关闭进程池"""
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+        _executor_workers = 0
+
+
+def _parse_or_error(
+    file_path: Path,
+    loaders: Dict[Path, Tuple[Dict, SnapshotLoader]],
+    platform_ids: Optional[FrozenSet[str]] = None,
+) -> Union[Tuple[Dict, Dict, List[str], Dict], Exception]:
+    """解析单个文件，出错时返回异常对象（避免一个文件出错导致整批失败）"""
+    try:
+        if file_path.parent not in loaders:
+            # 当天已归档时，引用的基准快照可能只在归档中
+            cache: Dict = {}
+            loaders[file_path.parent] = (
+                cache,
+                day_snapshot_loader(file_path.parent, cache, platform_ids),
+            )
+        cache, load = loaders[file_path.parent]
+        parsed = load(file_path.stem) if file_path.exists() else None
+        if parsed is None:
+            # 不符合 <时间>.txt 命名或已不存在的文件，直接解析以得到相应异常
+            parsed = cache[file_path.stem] = parse_snapshot_file(
+                file_path, load, platform_ids
+            )
+        return parsed
+    except Exception as e:
+        return e
+
+
+def _parse_chunk(
+    file_paths: List[Path],
+    platform_ids: Optional[FrozenSet[str]] = None,
+) -> List[Union[Tuple[Dict, Dict, List[str], Dict], Exception]]:
+    """顺序解析一组文件，同一目录的文件共用解析缓存"""
+    loaders: Dict[Path, Tuple[Dict, SnapshotLoader]] = {}
+    return [_parse_or_error(p, loaders, platform_ids) for p in file_paths]
+
+
+def parse_snapshot_files(
+    file_paths: Iterable[Path],
+    workers: Optional[int] = 0,
+    platform_ids: Optional[Iterable[str]] = None,
+) -> List[Union[Tuple[Dict, Dict, List[str], Dict], Exception]]:
+    """
+    解析多个txt快照文件
+
+    Args:
+        file_paths: 快照文件路径
+        workers: 进程数，0=CPU 核数，1=在当前进程顺序解析
+        platform_ids: 只读取这些平台（按快照的平台偏移索引定位），None 表示所有平台
+
+    Returns:
+        与 file_paths 顺序相同的 parse_snapshot_file 结果列表，解析失败的文件对应位置为异常对象
+    """
+    file_paths = [Path(p) for p in file_paths]
+    if platform_ids is not None:
+        platform_ids = frozenset(platform_ids)
+    workers = resolve_workers(workers)
+    if workers <= 1 or len(file_paths) < MIN_PARALLEL_FILES:
+        return _parse_chunk(file_paths, platform_ids)
+
+    # 进程池复用时子进程的工作目录可能与当前不同，统一传绝对路径
+    file_paths = [p.absolute() for p in file_paths]
+
+    try:
+        executor = _get_executor(workers)
+        chunksize = max(1, len(file_paths) // (workers * 4))
+        chunks = [
+            file_paths[start:start + chunksize]
+            for start in range(0, len(file_paths), chunksize)
+        ]
+        results = []
+        parse_chunk = partial(_parse_chunk, platform_ids=platform_ids)
+        for chunk_results in executor.map(parse_chunk, chunks):
+            results.extend(chunk_results)
+        return results
+    except (BrokenProcessPool, OSError) as e:
+        # 受限环境（无法创建进程）或子进程异常退出时退回顺序解析
+        print(f"并行解析快照失败，改为顺序解析: {e}")
+        shutdown()
+        return _parse_chunk(file_paths, platform_ids)
@@ -0,0 +1,463 @@
+"""
+SQLite快照存储
+
+将每次爬取的快照写入带索引的 SQLite 数据库（平台、标题、快照、排名、URL 分表），
+按日期范围和平台过滤的查询直接走索引，无需逐个解析 txt 文件。
+
+导入已有的 output 目录：
+
+    python -m storage.sqlite_store import output --db output/trendradar.db
+"""
+
+import argparse
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from storage.day_archive import DayArchive
+from storage.txt_format import directory_loader, parse_snapshot_file
+
+DEFAULT_DB_PATH = "output/trendradar.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS platforms (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    title_count INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (date, time)
+);
+CREATE TABLE IF NOT EXISTS snapshot_platforms (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    platform_id TEXT NOT NULL REFERENCES platforms(id),
+    name TEXT NOT NULL,
+    unchanged_since TEXT,
+    PRIMARY KEY (snapshot_id, platform_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshot_failures (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    platform_id TEXT NOT NULL,
+    PRIMARY KEY (snapshot_id, platform_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS titles (
+    id INTEGER PRIMARY KEY,
+    platform_id TEXT NOT NULL REFERENCES platforms(id),
+    title TEXT NOT NULL,
+    UNIQUE (platform_id, title)
+);
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS ranks (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title_id INTEGER NOT NULL REFERENCES titles(id),
+    rank INTEGER NOT NULL,
+    url_id INTEGER REFERENCES urls(id),
+    mobile_url_id INTEGER REFERENCES urls(id),
+    PRIMARY KEY (snapshot_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_ranks_title ON ranks (title_id);
+"""
+
+
+def folder_to_date(date_folder: str) -> str:
+    """日期目录名（YYYY年MM月DD日）转换为 ISO 日期（YYYY-MM-DD）"""
+    return datetime.strptime(date_folder, "%Y年%m月%d日").strftime("%Y-%m-%d")
+
+
+def date_to_folder(date: str) -> str:
+    """ISO 日期（YYYY-MM-DD）转换为日期目录名（YYYY年MM月DD日）"""
+    return datetime.strptime(date, "%Y-%m-%d").strftime("%Y年%m月%d日")
+
+
+class SQLiteSnapshotStore:
+    """SQLite快照存储类"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """
+        初始化存储，数据库文件不存在时自动创建
+
+        Args:
+            db_path: 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """为旧版本创建的数据库补齐新增的列"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(snapshot_platforms)")}
+        if "unchanged_since" not in columns:
+            conn.execute("ALTER TABLE snapshot_platforms ADD COLUMN unchanged_since TEXT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开连接，正常退出时提交事务"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA foreign_keys=ON")
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _url_id(conn: sqlite3.Connection, url: str) -> Optional[int]:
+        if not url:
+            return None
+        conn.execute("INSERT OR IGNORE INTO urls (url) VALUES (?)", (url,))
+        return conn.execute("SELECT id FROM urls WHERE url = ?", (url,)).fetchone()[0]
+
+    def _write_snapshot(
+        self,
+        conn: sqlite3.Connection,
+        date: str,
+        time_info: str,
+        titles_by_id: Dict,
+        id_to_name: Dict,
+        failed_ids: Optional[List[str]],
+        unchanged: Optional[Dict[str, str]] = None,
+    ) -> int:
+        # 同一时间的快照整体覆盖，与 txt 文件覆盖写入的行为一致
+        row = conn.execute(
+            "SELECT id FROM snapshots WHERE date = ? AND time = ?", (date, time_info)
+        ).fetchone()
+        if row:
+            snapshot_id = row[0]
+            conn.execute("DELETE FROM ranks WHERE snapshot_id = ?", (snapshot_id,))
+            conn.execute(
+                "DELETE FROM snapshot_platforms WHERE snapshot_id = ?", (snapshot_id,)
+            )
+            conn.execute(
+                "DELETE FROM snapshot_failures WHERE snapshot_id = ?", (snapshot_id,)
+            )
+        else:
+            snapshot_id = conn.execute(
+                "INSERT INTO snapshots (date, time) VALUES (?, ?)", (date, time_info)
+            ).lastrowid
+
+        unchanged = unchanged or {}
+        position = 0
+        for platform_id in list(titles_by_id) + [
+            pid for pid in unchanged if pid not in titles_by_id
+        ]:
+            # 平台名称可能随配置变化，快照内保留当时的名称
+            name = id_to_name.get(platform_id) or platform_id
+            conn.execute(
+                "INSERT INTO platforms (id, name) VALUES (?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET name = excluded.name",
+                (platform_id, name),
+            )
+            unchanged_since = unchanged.get(platform_id)
+            conn.execute(
+                "INSERT INTO snapshot_platforms VALUES (?, ?, ?, ?)",
+                (snapshot_id, platform_id, name, unchanged_since),
+            )
+            if unchanged_since is not None:
+                # 内容与之前的快照相同，只记录引用，不重复写入标题
+                continue
+
+            for title, (rank, url, mobile_url) in titles_by_id[platform_id].items():
+                conn.execute(
+                    "INSERT OR IGNORE INTO titles (platform_id, title) VALUES (?, ?)",
+                    (platform_id, title),
+                )
+                title_id = conn.execute(
+                    "SELECT id FROM titles WHERE platform_id = ? AND title = ?",
+                    (platform_id, title),
+                ).fetchone()[0]
+                conn.execute(
+                    "INSERT INTO ranks VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        snapshot_id,
+                        position,
+                        title_id,
+                        rank,
+                        self._url_id(conn, url),
+                        self._url_id(conn, mobile_url),
+                    ),
+                )
+                position += 1
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO snapshot_failures VALUES (?, ?)",
+            [(snapshot_id, platform_id) for platform_id in failed_ids or []],
+        )
+        conn.execute(
+            "UPDATE snapshots SET title_count = ? WHERE id = ?", (position, snapshot_id)
+        )
+        return snapshot_id
+
+    def save_snapshot(
+        self,
+        date: str,
+        time_info: str,
+        titles_by_id: Dict,
+        id_to_name: Dict,
+        failed_ids: Optional[List[str]] = None,
+        unchanged: Optional[Dict[str, str]] = None,
+    ) -> int:
+        """
+        保存一次快照
+
+        Args:
+            date: ISO 日期，如 2025-11-01
+            time_info: 快照时间，如 10时30分
+            titles_by_id: {platform_id: {title: (rank, url, mobile_url)}}，按写入顺序保存
+            id_to_name: 平台ID到名称的映射
+            failed_ids: 请求失败的平台ID列表
+            unchanged: {platform_id: 快照时间}，内容与当天该快照相同、只记录引用的平台
+
+        Returns:
+            快照ID
+        """
+        with self._connect() as conn:
+            return self._write_snapshot(
+                conn, date, time_info, titles_by_id, id_to_name, failed_ids, unchanged
+            )
+
+    def list_dates(self) -> List[str]:
+        """返回有快照的所有日期（ISO 格式，升序）"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT date FROM snapshots ORDER BY date"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def list_snapshots(self, date: str) -> List[Tuple[str, int]]:
+        """
+        返回指定日期的快照列表
+
+        Returns:
+            [(time_info, title_count), ...]，按时间升序；title_count 与 txt 文件大小的作用相同，
+            用于判断已读取的快照是否被改写
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT time, title_count FROM snapshots WHERE date = ? ORDER BY time",
+                (date,),
+            ).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def read_snapshot(
+        self, date: str, time_info: str, platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict]:
+        """
+        读取单个快照
+
+        Returns:
+            (titles_by_id, id_to_name) 元组，titles_by_id 结构与 save_snapshot 的输入相同
+        """
+        titles_by_id = {}
+        for _, _, platform_id, title, rank, url, mobile_url in self.iter_rows(
+            date, date, platform_ids, time_info=time_info
+        ):
+            titles_by_id.setdefault(platform_id, {})[title] = (rank, url, mobile_url)
+        return titles_by_id, self.get_platform_names(date, time_info)
+
+    def list_unchanged(
+        self, date: str, time_info: Optional[str] = None
+    ) -> List[Tuple[str, str, str]]:
+        """
+        返回指定日期（可限定单个快照）中记录为未变化的平台
+
+        Returns:
+            [(time_info, platform_id, unchanged_since), ...]，按时间升序
+        """
+        sql = (
+            "SELECT s.time, p.platform_id, p.unchanged_since FROM snapshot_platforms p "
+            "JOIN snapshots s ON s.id = p.snapshot_id "
+            "WHERE s.date = ? AND p.unchanged_since IS NOT NULL"
+        )
+        params = [date]
+        if time_info is not None:
+            sql += " AND s.time = ?"
+            params.append(time_info)
+
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY s.time", params).fetchall()
+        return [(row[0], row[1], row[2]) for row in rows]
+
+    def read_failed_ids(self, date: str, time_info: str) -> List[str]:
+        """读取快照中请求失败的平台ID"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT f.platform_id FROM snapshot_failures f "
+                "JOIN snapshots s ON s.id = f.snapshot_id "
+                "WHERE s.date = ? AND s.time = ?",
+                (date, time_info),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_platform_names(
+        self, date: Optional[str] = None, time_info: Optional[str] = None
+    ) -> Dict:
+        """
+        返回平台ID到名称的映射
+
+        Args:
+            date: 只取该日期快照中记录的名称（同一平台以较晚的快照为准），None 表示最新名称
+            time_info: 配合 date 只取单个快照中的名称
+        """
+        with self._connect() as conn:
+            if date is None:
+                rows = conn.execute("SELECT id, name FROM platforms").fetchall()
+            else:
+                sql = (
+                    "SELECT p.platform_id, p.name FROM snapshot_platforms p "
+                    "JOIN snapshots s ON s.id = p.snapshot_id WHERE s.date = ?"
+                )
+                params = [date]
+                if time_info is not None:
+                    sql += " AND s.time = ?"
+                    params.append(time_info)
+                rows = conn.execute(sql + " ORDER BY s.time", params).fetchall()
+        return dict(rows)
+
+    def iter_rows(
+        self,
+        start_date: str,
+        end_date: str,
+        platform_ids: Optional[List[str]] = None,
+        time_info: Optional[str] = None,
+    ) -> Iterator[Tuple[str, str, str, str, int, str, str]]:
+        """
+        按日期范围（含两端）和平台过滤遍历快照行
+
+        Yields:
+            (date, time_info, platform_id, title, rank, url, mobile_url)，
+            按日期、时间、快照内写入顺序排列
+        """
+        sql = (
+            "SELECT s.date, s.time, t.platform_id, t.title, r.rank, "
+            "COALESCE(u.url, ''), COALESCE(m.url, '') "
+            "FROM snapshots s "
+            "JOIN ranks r ON r.snapshot_id = s.id "
+            "JOIN titles t ON t.id = r.title_id "
+            "LEFT JOIN urls u ON u.id = r.url_id "
+            "LEFT JOIN urls m ON m.id = r.mobile_url_id "
+            "WHERE s.date BETWEEN ? AND ?"
+        )
+        params: List = [start_date, end_date]
+        if time_info is not None:
+            sql += " AND s.time = ?"
+            params.append(time_info)
+        if platform_ids is not None:
+            sql += f" AND t.platform_id IN ({','.join('?' * len(platform_ids))})"
+            params.extend(platform_ids)
+        sql += " ORDER BY s.date, s.time, r.position"
+
+        with self._connect() as conn:
+            yield from conn.execute(sql, params)
+
+    def import_output_dir(
+        self, output_dir: str = "output", overwrite: bool = False
+    ) -> Tuple[int, int]:
+        """
+        一次性导入 output 目录下的所有 txt 快照（包括已归档日期的快照）
+
+        Args:
+            output_dir: output 目录
+            overwrite: 是否覆盖数据库中已存在的同名快照
+
+        Returns:
+            (导入数, 跳过数)
+        """
+        imported = skipped = 0
+        for day_dir in sorted(Path(output_dir).iterdir()):
+            txt_dir = day_dir / "txt"
+            archive = DayArchive.open(day_dir) if day_dir.is_dir() else None
+            if not txt_dir.is_dir() and archive is None:
+                continue
+            try:
+                date = folder_to_date(day_dir.name)
+            except ValueError:
+                continue
+
+            # 快照时间 -> (来源描述, 解析函数)，同名快照以 txt 文件为准
+            sources = {}
+            # 同一天的快照共用解析缓存，增量快照的引用链只解析一次
+            if archive is not None:
+                load_archived = archive.loader()
+                for time_info in archive.times():
+                    sources[time_info] = (
+                        f"{archive.path}:{time_info}",
+                        lambda t=time_info: load_archived(t),
+                    )
+            if txt_dir.is_dir():
+                # 打包后写入的 txt 快照可能引用归档中的快照
+                load_txt = directory_loader(
+                    txt_dir, fallback=load_archived if archive is not None else None
+                )
+                for txt_file in txt_dir.glob("*.txt"):
+                    sources[txt_file.stem] = (
+                        txt_file,
+                        lambda f=txt_file: parse_snapshot_file(f, load_txt),
+                    )
+
+            existing = {time_info for time_info, _ in self.list_snapshots(date)}
+            with self._connect() as conn:
+                for time_info in sorted(sources):
+                    if time_info in existing and not overwrite:
+                        skipped += 1
+                        continue
+                    source, parse = sources[time_info]
+                    try:
+                        titles_by_id, id_to_name, failed_ids, unchanged = parse()
+                    except Exception as e:
+                        print(f"解析文件 {source} 失败: {e}")
+                        skipped += 1
+                        continue
+                    self._write_snapshot(
+                        conn,
+                        date,
+                        time_info,
+                        titles_by_id,
+                        id_to_name,
+                        failed_ids,
+                        unchanged,
+                    )
+                    imported += 1
+
+        return imported, skipped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TrendRadar SQLite 快照存储工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="导入 output 目录下的 txt 快照")
+    import_parser.add_argument(
+        "output_dir", nargs="?", default="output", help="output 目录（默认: output）"
+    )
+    import_parser.add_argument(
+        "--db", default=DEFAULT_DB_PATH, help=f"数据库路径（默认: {DEFAULT_DB_PATH}）"
+    )
+    import_parser.add_argument(
+        "--overwrite", action="store_true", help="覆盖数据库中已存在的快照"
+    )
+
+    args = parser.parse_args()
+    if args.command == "import":
+        store = SQLiteSnapshotStore(args.db)
+        imported, skipped = store.import_output_dir(args.output_dir, args.overwrite)
+        print(f"导入完成: {imported} 个快照，跳过 {skipped} 个 -> {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,537 @@
+"""
+txt快照格式
+
+解析 main.py 写出的 `rank. title [URL:...] [MOBILE:...]` 文本快照，main.py、MCP 服务和导入工具共用。
+
+增量快照：平台首行之后为 `[DELTA:基准快照时间]`，其后每行为完整标题行，或 `=rank,pos,count` 复制行，
+表示基准快照中该平台第 pos 个（从 0 开始）起的 count 个标题依次以 rank、rank+1... 的排名出现（链接不变）。
+基准快照本身也可能是增量快照，解析时沿引用链读取同目录（或同一归档）中的快照还原完整内容。
+
+平台偏移索引：文件首行为 `[INDEX:平台ID:偏移:长度,...]`，偏移和长度为该平台段落（含首行和结尾空行）
+相对首行之后的字节位置，最后一个段落之后为失败列表。只需要部分平台时按索引直接读取对应字节，不解析整个文件。
+"""
+
+import io
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+FAILED_SECTION_MARKER = "==== 以下ID请求失败 ===="
+# 平台内容与之前某个快照完全相同时，标题行替换为该标记：[UNCHANGED:快照时间]
+UNCHANGED_PREFIX = "[UNCHANGED:"
+# 平台内容以之前某个快照为基准增量记录时，首行之后的标记：[DELTA:基准快照时间]
+DELTA_PREFIX = "[DELTA:"
+COPY_PREFIX = "="
+# 文件首行的平台偏移索引：[INDEX:平台ID:偏移:长度,...]
+INDEX_PREFIX = "[INDEX:"
+
+# 解析记录类型（iter_snapshot_records 产出的记录第一项）
+# (RECORD_PLATFORM, platform_id, name, unchanged_since)，unchanged_since 为内容相同的快照时间，没有时为 None
+RECORD_PLATFORM = "platform"
+RECORD_TITLE = "title"  # (RECORD_TITLE, platform_id, rank, title, url, mobile_url)
+RECORD_FAILED = "failed"  # (RECORD_FAILED, platform_id)
+RECORD_ERROR = "error"  # (RECORD_ERROR, platform_id, 原始行, 异常)
+RECORD_DELTA = "delta"  # (RECORD_DELTA, platform_id, 基准快照时间)，紧跟在对应的 RECORD_PLATFORM 之后
+RECORD_COPY = "copy"  # (RECORD_COPY, platform_id, rank, 基准位置, 数量)
+
+# 按快照时间读取同一天的其他快照（解析增量快照的基准），返回 parse_snapshot_file 的结果，不存在时返回 None
+SnapshotLoader = Callable[[str], Optional[Tuple[Dict, Dict, List[str], Dict]]]
+
+# 需要完整清理的标题：含连续空白或空格以外的空白字符
+_NEEDS_CLEANING = re.compile(r"\s{2,}|[^\S ]")
+_WHITESPACE_RUN = re.compile(r"\s+")
+# 常见标题行的快速匹配（标题不含 "["、链接不含 "]"），_match_title_line 再排除需要清理或可能有歧义的行
+_TITLE_LINE = re.compile(
+    r"([0-9]+)\. ([^\[]*)(?: \[URL:([^\]]*)\])?(?: \[MOBILE:([^\]]*)\])?"
+)
+
+
+def parse_unchanged_marker(line: str) -> Optional[str]:
+    """解析未变化标记，返回引用的快照时间，不是标记时返回 None"""
+    line = line.strip()
+    if line.startswith(UNCHANGED_PREFIX) and line.endswith("]"):
+        return line[len(UNCHANGED_PREFIX):-1]
+    return None
+
+
+def parse_delta_marker(line: str) -> Optional[str]:
+    """解析增量标记，返回基准快照时间，不是标记时返回 None"""
+    line = line.strip()
+    if line.startswith(DELTA_PREFIX) and line.endswith("]"):
+        return line[len(DELTA_PREFIX):-1]
+    return None
+
+
+def format_snapshot(sections: List[Tuple[str, str]], footer: str = "") -> bytes:
+    """
+    拼接快照文件内容，首行写入平台偏移索引
+
+    Args:
+        sections: [(platform_id, 段落文本)]，段落文本包含首行和结尾空行
+        footer: 失败列表段落
+
+    Returns:
+        UTF-8 编码的文件内容
+    """
+    encoded = [(source_id, text.encode("utf-8")) for source_id, text in sections]
+    entries = []
+    offset = 0
+    for source_id, data in encoded:
+        entries.append(f"{source_id}:{offset}:{len(data)}")
+        offset += len(data)
+    index_line = f"{INDEX_PREFIX}{','.join(entries)}]\n".encode("utf-8")
+    return index_line + b"".join(data for _, data in encoded) + footer.encode("utf-8")
+
+
+def parse_index_line(line: str) -> Optional[Dict[str, Tuple[int, int]]]:
+    """解析平台偏移索引，返回 {platform_id: (偏移, 长度)}，不是索引时返回 None"""
+    line = line.strip()
+    if not (line.startswith(INDEX_PREFIX) and line.endswith("]")):
+        return None
+    index = {}
+    for entry in filter(None, line[len(INDEX_PREFIX):-1].split(",")):
+        source_id, offset, length = entry.rsplit(":", 2)
+        index[source_id] = (int(offset), int(length))
+    return index
+
+
+def _selected_ranges(
+    index: Dict[str, Tuple[int, int]], platform_ids: Iterable[str]
+) -> Tuple[List[Tuple[int, int]], int]:
+    """按文件顺序返回所选平台段落的 (偏移, 长度)，以及失败列表的偏移"""
+    wanted = set(platform_ids)
+    ranges = sorted(span for source_id, span in index.items() if source_id in wanted)
+    footer_offset = max((offset + length for offset, length in index.values()), default=0)
+    return ranges, footer_offset
+
+
+def read_platform_sections(file_path: Path, platform_ids: Iterable[str]) -> Optional[str]:
+    """
+    按平台偏移索引只读取指定平台的段落和失败列表
+
+    Returns:
+        所选段落拼成的快照文本，文件没有索引时返回 None
+    """
+    with open(file_path, "rb") as f:
+        first_line = f.readline()
+        index = parse_index_line(first_line.decode("utf-8", errors="replace"))
+        if index is None:
+            return None
+
+        body_start = len(first_line)
+        ranges, footer_offset = _selected_ranges(index, platform_ids)
+        chunks = []
+        for offset, length in ranges:
+            f.seek(body_start + offset)
+            chunks.append(f.read(length))
+        f.seek(body_start + footer_offset)
+        chunks.append(f.read())
+    return b"".join(chunks).decode("utf-8")
+
+
+def select_platform_sections(data: bytes, platform_ids: Iterable[str]) -> bytes:
+    """从内存中的快照内容（如归档中的快照）截取指定平台的段落和失败列表，没有索引时原样返回"""
+    first_end = data.find(b"\n") + 1
+    index = parse_index_line(data[:first_end].decode("utf-8", errors="replace"))
+    if index is None:
+        return data
+
+    body = memoryview(data)[first_end:]
+    ranges, footer_offset = _selected_ranges(index, platform_ids)
+    return b"".join(
+        [bytes(body[offset:offset + length]) for offset, length in ranges]
+        + [bytes(body[footer_offset:])]
+    )
+
+
+def format_title_line(rank: int, title: str, url: str = "", mobile_url: str = "") -> str:
+    """格式化标题行（不含换行符）"""
+    line = f"{rank}. {title}"
+    if url:
+        line += f" [URL:{url}]"
+    if mobile_url:
+        line += f" [MOBILE:{mobile_url}]"
+    return line
+
+
+def encode_delta_lines(
+    base_items: List[Tuple[str, Tuple[int, str, str]]],
+    items: List[Tuple[str, Tuple[int, str, str]]],
+) -> List[str]:
+    """
+    以基准快照中该平台的标题列表为基准，编码增量行
+
+    Args:
+        base_items: 基准标题列表 [(title, (rank, url, mobile_url))]，顺序即解析顺序
+        items: 本次标题列表，结构同上
+
+    Returns:
+        增量行列表（不含 DELTA 标记），按行还原后与 items 完全相同
+    """
+    base_positions = {title: pos for pos, (title, _) in enumerate(base_items)}
+    lines = []
+    # 当前复制段：[起始排名, 起始位置, 数量]
+    run = None
+
+    for title, (rank, url, mobile_url) in items:
+        pos = base_positions.get(title)
+        if pos is not None and base_items[pos][1][1:] == (url, mobile_url):
+            if run is not None and rank == run[0] + run[2] and pos == run[1] + run[2]:
+                run[2] += 1
+                continue
+            if run is not None:
+                lines.append(f"{COPY_PREFIX}{run[0]},{run[1]},{run[2]}")
+            run = [rank, pos, 1]
+            continue
+
+        if run is not None:
+            lines.append(f"{COPY_PREFIX}{run[0]},{run[1]},{run[2]}")
+            run = None
+        lines.append(format_title_line(rank, title, url, mobile_url))
+
+    if run is not None:
+        lines.append(f"{COPY_PREFIX}{run[0]},{run[1]},{run[2]}")
+    return lines
+
+
+def clean_title(title: str) -> str:
+    """清理标题中的换行和多余空白（与 main.py 保持一致）"""
+    if not isinstance(title, str):
+        title = str(title)
+    if not _NEEDS_CLEANING.search(title):
+        return title.strip()
+    return _WHITESPACE_RUN.sub(" ", title).strip()
+
+
+def _match_title_line(text: str) -> Optional[Tuple[int, str, str, str]]:
+    """
+    快速解析常见形式的标题行，结果与 parse_title_line 的逐段解析完全相同
+
+    标题需已是清理后的形式（isprintable 排除了空格以外的所有空白字符，且没有多余空格），
+    链接中不含 "["（保证 URL/MOBILE 标记不会出现在链接内），否则返回 None 由逐段解析处理。
+    """
+    matched = _TITLE_LINE.fullmatch(text)
+    if matched is None:
+        return None
+    rank, title, url, mobile_url = matched.groups()
+    if (
+        not title.isprintable()
+        or title.startswith(" ")
+        or title.endswith(" ")
+        or "  " in title
+    ):
+        return None
+    if url is None:
+        url = ""
+    elif "[" in url:
+        return None
+    if mobile_url is None:
+        mobile_url = ""
+    elif "[" in mobile_url:
+        return None
+    return int(rank), title, url, mobile_url
+
+
+def parse_title_line(line: str) -> Tuple[int, str, str, str]:
+    """
+    解析单行标题
+
+    Returns:
+        (rank, title, url, mobile_url)，缺少排名时 rank 为 1
+    """
+    title_part = line.strip()
+    parsed = _match_title_line(title_part)
+    if parsed is not None:
+        return parsed
+
+    rank = 1
+    dot = title_part.find(". ")
+    if dot > 0 and title_part[:dot].isdigit():
+        rank = int(title_part[:dot])
+        title_part = title_part[dot + 2:]
+
+    mobile_url = ""
+    marker = title_part.rfind(" [MOBILE:")
+    if marker >= 0:
+        mobile_part = title_part[marker + 9:]
+        title_part = title_part[:marker]
+        if mobile_part.endswith("]"):
+            mobile_url = mobile_part[:-1]
+
+    url = ""
+    marker = title_part.rfind(" [URL:")
+    if marker >= 0:
+        url_part = title_part[marker + 6:]
+        title_part = title_part[:marker]
+        if url_part.endswith("]"):
+            url = url_part[:-1]
+
+    return rank, clean_title(title_part), url, mobile_url
+
+
+def iter_snapshot_records(file_path: Path) -> Iterator[Tuple]:
+    """逐行解析txt快照文件，依次产出记录（见 RECORD_* 说明）"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        yield from iter_snapshot_lines(f)
+
+
+def iter_snapshot_lines(lines: Iterable[str]) -> Iterator[Tuple]:
+    """
+    逐行解析快照内容，依次产出记录（见 RECORD_* 说明）
+
+    空行分隔平台段落，段落首行为 `id | name` 或 `id`；只有首行没有内容的平台不产出记录，
+    未变化标记必须紧跟在首行之后。失败段落中每行一个平台ID。
+
+    Args:
+        lines: 带换行符的行（文本模式打开的文件或 io.StringIO）
+    """
+    # 段落状态：None=段落之间，"header"=已读到首行、等待第一行内容，"titles"/"delta"/"failed"=段落内
+    state = None
+    header = None
+    source_id = None
+
+    for line in lines:
+        if state == "titles" or state == "delta":
+            parsed = _match_title_line(line.rstrip("\n"))
+            if parsed is not None:
+                yield (RECORD_TITLE, source_id) + parsed
+                continue
+            if state == "delta" and line.startswith(COPY_PREFIX):
+                try:
+                    rank, base_pos, count = (int(v) for v in line[1:].split(","))
+                except ValueError as e:
+                    yield RECORD_ERROR, source_id, line.strip(), e
+                    continue
+                yield RECORD_COPY, source_id, rank, base_pos, count
+                continue
+
+        stripped = line.strip()
+        if not stripped:
+            if line in ("\n", ""):
+                state = None
+            continue
+
+        if FAILED_SECTION_MARKER in stripped:
+            # 失败列表总是独立成段，标记之后的行都是平台ID
+            state = "failed"
+            continue
+
+        if state is None:
+            if stripped.startswith(INDEX_PREFIX):
+                continue
+            state = "header"
+            header = stripped
+            continue
+
+        if state == "failed":
+            yield RECORD_FAILED, stripped
+            continue
+
+        if state == "header":
+            if " | " in header:
+                source_id, name = header.split(" | ", 1)
+                source_id = source_id.strip()
+                name = name.strip()
+            else:
+                source_id = name = header
+
+            since_time = parse_unchanged_marker(stripped)
+            yield RECORD_PLATFORM, source_id, name, since_time
+            if since_time is not None:
+                state = "unchanged"
+                continue
+            base_time = parse_delta_marker(stripped)
+            if base_time is not None:
+                yield RECORD_DELTA, source_id, base_time
+                state = "delta"
+                continue
+            state = "titles"
+        elif state == "unchanged":
+            continue
+
+        try:
+            rank, title, url, mobile_url = parse_title_line(stripped)
+        except Exception as e:
+            yield RECORD_ERROR, source_id, stripped, e
+            continue
+        yield RECORD_TITLE, source_id, rank, title, url, mobile_url
+
+
+def parse_snapshot_file(
+    file_path: Path,
+    load_base: Optional[SnapshotLoader] = None,
+    platform_ids: Optional[Iterable[str]] = None,
+) -> Tuple[Dict, Dict, List[str], Dict]:
+    """
+    解析单个txt快照文件
+
+    Args:
+        file_path: txt文件路径
+        load_base: 读取增量快照基准的函数，默认读取同目录的快照文件
+        platform_ids: 只读取这些平台（有平台偏移索引时直接定位，否则解析后过滤），None 表示所有平台
+
+    Returns:
+        (titles_by_id, id_to_name, failed_ids, unchanged) 元组
+        - titles_by_id: {platform_id: {title: (rank, url, mobile_url)}}，增量记录的平台已还原为完整内容
+        - id_to_name: {platform_id: platform_name}
+        - failed_ids: 请求失败的平台ID列表
+        - unchanged: {platform_id: 内容相同的快照时间}，这些平台不在 titles_by_id 中
+    """
+    if platform_ids is not None:
+        platform_ids = frozenset(platform_ids)
+    if load_base is None:
+        load_base = directory_loader(Path(file_path).parent, platform_ids=platform_ids)
+    if platform_ids is None:
+        return _collect_records(iter_snapshot_records(file_path), load_base)
+
+    text = read_platform_sections(file_path, platform_ids)
+    if text is not None:
+        return parse_snapshot_text(text, load_base)
+    return _filter_platforms(
+        _collect_records(iter_snapshot_records(file_path), load_base), platform_ids
+    )
+
+
+def parse_snapshot_text(
+    text: str,
+    load_base: Optional[SnapshotLoader] = None,
+    platform_ids: Optional[Iterable[str]] = None,
+) -> Tuple[Dict, Dict, List[str], Dict]:
+    """解析快照文本（如归档中的快照），返回值同 parse_snapshot_file；未提供 load_base 时增量平台的基准视为空"""
+    parsed = _collect_records(
+        iter_snapshot_lines(io.StringIO(text, newline=None)), load_base
+    )
+    return parsed if platform_ids is None else _filter_platforms(parsed, platform_ids)
+
+
+def _filter_platforms(
+    parsed: Tuple[Dict, Dict, List[str], Dict], platform_ids: Iterable[str]
+) -> Tuple[Dict, Dict, List[str], Dict]:
+    """只保留指定平台（失败列表不过滤）"""
+    wanted = set(platform_ids)
+    titles_by_id, id_to_name, failed_ids, unchanged = parsed
+    return (
+        {k: v for k, v in titles_by_id.items() if k in wanted},
+        {k: v for k, v in id_to_name.items() if k in wanted},
+        failed_ids,
+        {k: v for k, v in unchanged.items() if k in wanted},
+    )
+
+
+def directory_loader(
+    directory: Path,
+    cache: Optional[Dict] = None,
+    platform_ids: Optional[Iterable[str]] = None,
+    fallback: Optional[SnapshotLoader] = None,
+) -> SnapshotLoader:
+    """
+    按快照时间读取目录中快照的函数，解析结果缓存在 cache（{快照时间: 解析结果}）中
+
+    同一天的多个快照共用一个 cache 时，增量引用链上的每个文件只解析一次。
+    指定 platform_ids 时只读取这些平台（同一个 cache 只能用于同一组平台）。
+    目录中没有对应文件时改用 fallback 读取（如当天已归档的快照）。
+    """
+    directory = Path(directory)
+    cache = {} if cache is None else cache
+    if platform_ids is not None:
+        platform_ids = frozenset(platform_ids)
+
+    def load(time_info: str):
+        if time_info not in cache:
+            # 先占位，损坏的快照循环引用时返回 None 而不是无限递归
+            cache[time_info] = None
+            file_path = directory / f"{time_info}.txt"
+            if file_path.exists():
+                cache[time_info] = parse_snapshot_file(file_path, load, platform_ids)
+            elif fallback is not None:
+                cache[time_info] = fallback(time_info)
+        return cache[time_info]
+
+    return load
+
+
+def resolve_unchanged(
+    parsed: Tuple[Dict, Dict, List[str], Dict], load_base: Optional[SnapshotLoader]
+) -> Tuple[Dict, Dict, List[str], Dict]:
+    """
+    把解析结果中内容未变化（[UNCHANGED:时间]）的平台替换为引用快照中的标题（沿引用链查找）
+
+    Args:
+        parsed: parse_snapshot_file / parse_snapshot_text 的返回值（不会被修改）
+        load_base: 按快照时间读取同一天快照的函数，如 directory_loader / DayArchive.loader
+
+    Returns:
+        结构同 parsed；unchanged 中只保留引用的快照不存在或其中没有该平台标题的平台
+    """
+    titles_by_id, id_to_name, failed_ids, unchanged = parsed
+    if not unchanged:
+        return parsed
+
+    titles_by_id = dict(titles_by_id)
+    unresolved = {}
+    for source_id, since_time in unchanged.items():
+        source_titles = _base_platform_titles(load_base, since_time, source_id)
+        if source_titles:
+            titles_by_id[source_id] = dict(source_titles)
+        else:
+            unresolved[source_id] = since_time
+    return titles_by_id, id_to_name, failed_ids, unresolved
+
+
+def _base_platform_titles(
+    load_base: Optional[SnapshotLoader], base_time: str, source_id: str
+) -> List[Tuple[str, Tuple[int, str, str]]]:
+    """基准快照中平台的标题列表（基准中该平台未变化时沿引用继续查找）"""
+    seen = set()
+    while load_base is not None and base_time not in seen:
+        seen.add(base_time)
+        parsed = load_base(base_time)
+        if parsed is None:
+            break
+        titles = parsed[0].get(source_id)
+        if titles is not None:
+            return list(titles.items())
+        base_time = parsed[3].get(source_id)
+        if base_time is None:
+            break
+    return []
+
+
+def _collect_records(
+    records: Iterable[Tuple], load_base: Optional[SnapshotLoader] = None
+) -> Tuple[Dict, Dict, List[str], Dict]:
+    titles_by_id = {}
+    id_to_name = {}
+    failed_ids = []
+    unchanged = {}
+    # 增量平台的基准标题列表
+    base_items = {}
+
+    for record in records:
+        kind = record[0]
+        if kind == RECORD_TITLE:
+            _, source_id, rank, title, url, mobile_url = record
+            titles_by_id[source_id][title] = (rank, url, mobile_url)
+        elif kind == RECORD_COPY:
+            _, source_id, rank, base_pos, count = record
+            source_titles = titles_by_id[source_id]
+            for offset, (title, (_, url, mobile_url)) in enumerate(
+                base_items[source_id][base_pos:base_pos + count]
+            ):
+                source_titles[title] = (rank + offset, url, mobile_url)
+        elif kind == RECORD_DELTA:
+            _, source_id, base_time = record
+            base_items[source_id] = _base_platform_titles(load_base, base_time, source_id)
+        elif kind == RECORD_PLATFORM:
+            _, source_id, name, since_time = record
+            id_to_name[source_id] = name
+            if since_time is None:
+                titles_by_id[source_id] = {}
+            else:
+                unchanged[source_id] = since_time
+        elif kind == RECORD_FAILED:
+            failed_ids.append(record[1])
+        elif kind == RECORD_ERROR:
+            print(f"解析标题行出错: {record[2]}, 错误: {record[3]}")
+
+    return titles_by_id, id_to_name, failed_ids, unchanged
@@ -0,0 +1,144 @@
+"""
+平台链接模板
+
+很多平台的链接可以由标题或一个ID推出（如百度为 `https://www.baidu.com/s?wd=<编码后的标题>`），
+快照和内存中只保存可变部分，渲染时再展开：
+
+    ~<模板序号（一位数字）><可变部分>
+
+模板中 `{title}` 为 quote 编码的标题，`{title+}` 为 quote_plus 编码的标题，`{}` 为保存的可变部分（最多一个）。
+压缩时会校验展开结果与原链接完全相同，不符合模板的链接原样保存；原样保存的链接以 http 开头，不会与压缩形式混淆。
+
+已写入快照的压缩链接依赖模板内容，模板只能追加，不能修改或删除。
+"""
+
+import re
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, quote_plus
+
+COMPACT_PREFIX = "~"
+
+# 平台ID -> {"url" / "mobile_url": 模板列表}，序号即列表下标
+URL_TEMPLATES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "baidu": {"url": ("https://www.baidu.com/s?wd={title+}",)},
+    "bilibili-hot-search": {"url": ("https://search.bilibili.com/all?keyword={title}",)},
+    "weibo": {
+        "url": ("https://s.weibo.com/weibo?q=%23{title}%23",),
+        "mobile_url": (
+            "https://m.weibo.cn/search?containerid=100103type%3D1%26t%3D10%26q%3D%23{title}%23{}",
+        ),
+    },
+    "tieba": {
+        "url": (
+            "https://tieba.baidu.com/hottopic/browse/hottopic?topic_id={}&amp;topic_name={title}",
+        ),
+    },
+    "toutiao": {"url": ("https://www.toutiao.com/trending/{}/",)},
+    "thepaper": {
+        "url": ("https://www.thepaper.cn/newsDetail_forward_{}",),
+        "mobile_url": ("https://m.thepaper.cn/newsDetail_forward_{}",),
+    },
+    "ifeng": {"url": ("https://news.ifeng.com/c/{}",)},
+    "wallstreetcn-hot": {"url": ("https://wallstreetcn.com/articles/{}",)},
+    "cls-hot": {"url": ("https://www.cls.cn/detail/{}",)},
+    "douyin": {"url": ("https://www.douyin.com/hot/{}",)},
+    "zhihu": {"url": ("https://www.zhihu.com/question/{}",)},
+}
+
+_TITLE_ENCODERS = {"{title}": quote, "{title+}": quote_plus}
+_PLACEHOLDER = re.compile(r"\{\}|\{title\+?\}")
+
+
+class UrlTemplate:
+    """单个链接模板"""
+
+    def __init__(self, template: str):
+        self.template = template
+        # 按占位符切分：偶数下标为字面量，奇数下标为占位符
+        self._parts = _PLACEHOLDER.split(template)
+        self._placeholders = _PLACEHOLDER.findall(template)
+        if self._placeholders.count("{}") > 1:
+            raise ValueError(f"链接模板最多包含一个 {{}}: {template}")
+
+        pattern = []
+        for literal, placeholder in zip(self._parts, self._placeholders + [None]):
+            pattern.append(re.escape(literal))
+            if placeholder is not None:
+                pattern.append("(.*?)")
+        self._pattern = re.compile("".join(pattern), re.DOTALL)
+
+    def compact(self, title: str, url: str) -> Optional[str]:
+        """返回链接的可变部分，不符合模板时返回 None"""
+        matched = self._pattern.fullmatch(url)
+        if matched is None:
+            return None
+
+        variable = ""
+        for placeholder, value in zip(self._placeholders, matched.groups()):
+            if placeholder == "{}":
+                variable = value
+            elif value != _TITLE_ENCODERS[placeholder](title):
+                return None
+
+        # 非贪婪匹配可能切分出不同的可变部分，以展开结果为准保证无损
+        if self.expand(title, variable) != url:
+            return None
+        return variable
+
+    def expand(self, title: str, variable: str) -> str:
+        """由标题和可变部分展开完整链接"""
+        pieces = [self._parts[0]]
+        for placeholder, literal in zip(self._placeholders, self._parts[1:]):
+            if placeholder == "{}":
+                pieces.append(variable)
+            else:
+                pieces.append(_TITLE_ENCODERS[placeholder](title))
+            pieces.append(literal)
+        return "".join(pieces)
+
+
+_compiled: Dict[Tuple[str, str], Tuple[UrlTemplate, ...]] = {}
+
+
+def _get_templates(platform_id: str, field: str) -> Tuple[UrlTemplate, ...]:
+    key = (platform_id, field)
+    templates = _compiled.get(key)
+    if templates is None:
+        templates = _compiled[key] = tuple(
+            UrlTemplate(template)
+            for template in URL_TEMPLATES.get(platform_id, {}).get(field, ())
+        )
+    return templates
+
+
+def compact_url(platform_id: str, field: str, title: str, url: str) -> str:
+    """
+    压缩链接
+
+    Args:
+        platform_id: 平台ID
+        field: "url" 或 "mobile_url"
+        title: 清理后的标题（展开时使用同一标题）
+        url: 完整链接
+
+    Returns:
+        压缩形式；没有匹配的模板时返回原链接
+    """
+    if not url or url.startswith(COMPACT_PREFIX):
+        return url
+    for index, template in enumerate(_get_templates(platform_id, field)):
+        variable = template.compact(title, url)
+        if variable is not None:
+            return f"{COMPACT_PREFIX}{index}{variable}"
+    return url
+
+
+def expand_url(platform_id: str, field: str, title: str, url: str) -> str:
+    """展开压缩的链接，完整链接原样返回"""
+    if not url or not url.startswith(COMPACT_PREFIX):
+        return url
+    templates = _get_templates(platform_id, field)
+    index = url[1:2]
+    if not index.isdigit() or int(index) >= len(templates):
+        return url
+    return templates[int(index)].expand(title, url[2:])
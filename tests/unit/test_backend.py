@@ -0,0 +1,240 @@
+import hashlib
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from storage.backend import LocalStorage, S3Storage, create_storage
+from storage.day_archive import DayArchive, extract_day, pack_day
+
+
+class FakeBody:
+    def __init__(self, data):
+        self.data = data
+
+    def read(self):
+        return self.data
+
+
+class FakeClientError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class FakePaginator:
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, Bucket, Prefix="", Delimiter=None):
+        contents = []
+        prefixes = set()
+        for key in sorted(self.client.objects):
+            if not key.startswith(Prefix):
+                continue
+            rest = key[len(Prefix):]
+            if Delimiter and Delimiter in rest:
+                prefixes.add(Prefix + rest.split(Delimiter, 1)[0] + Delimiter)
+                continue
+            data = self.client.objects[key]
+            contents.append({
+                "Key": key,
+                "Size": len(data),
+                "ETag": self.client.etag(key),
+                "LastModified": datetime(2025, 11, 1, tzinfo=timezone.utc),
+            })
+        yield {
+            "Contents": contents,
+            "CommonPrefixes": [{"Prefix": prefix} for prefix in sorted(prefixes)],
+        }
+
+
+class FakeS3Client:
+    """内存中的 S3 客户端，只实现存储后端用到的接口"""
+
+    def __init__(self):
+        self.objects = {}
+        self.calls = []
+
+    def etag(self, key):
+        return hashlib.md5(self.objects[key]).hexdigest()
+
+    def put_object(self, Bucket, Key, Body):
+        self.calls.append(("put", Key))
+        self.objects[Key] = Body
+        return {"ETag": self.etag(Key)}
+
+    def get_object(self, Bucket, Key):
+        self.calls.append(("get", Key))
+        if Key not in self.objects:
+            raise FakeClientError("NoSuchKey")
+        return {"Body": FakeBody(self.objects[Key]), "ETag": self.etag(Key)}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise FakeClientError("404")
+        return {"ETag": self.etag(Key)}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def get_paginator(self, name):
+        assert name == "list_objects_v2"
+        return FakePaginator(self)
+
+
+class TestLocalStorage:
+    """本地存储单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.storage = LocalStorage(self.temp_dir / "output")
+
+    def teardown_method(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_roundtrip(self):
+        """测试读写、列举和删除"""
+        path = self.storage.write_text("2025年11月01日/txt/10时00分.txt", "内容")
+        self.storage.write_text("2025年11月02日/html/当日汇总.html", "<html>")
+
+        assert path == self.temp_dir / "output" / "2025年11月01日" / "txt" / "10时00分.txt"
+        assert self.storage.read_text("2025年11月01日/txt/10时00分.txt") == "内容"
+        assert self.storage.exists("2025年11月01日/txt/10时00分.txt")
+        assert self.storage.list_dirs() == ["2025年11月01日", "2025年11月02日"]
+        assert self.storage.list_keys("2025年11月01日/") == ["2025年11月01日/txt/10时00分.txt"]
+
+        self.storage.delete("2025年11月01日/txt/10时00分.txt")
+        assert not self.storage.exists("2025年11月01日/txt/10时00分.txt")
+        with pytest.raises(FileNotFoundError):
+            self.storage.read_bytes("2025年11月01日/txt/10时00分.txt")
+
+    def test_create_storage_default(self):
+        """测试未配置对象存储时使用本地存储"""
+        storage = create_storage(None, self.temp_dir)
+        assert isinstance(storage, LocalStorage)
+        with pytest.raises(ValueError):
+            create_storage({"type": "ftp"}, self.temp_dir)
+
+
+class TestS3Storage:
+    """S3 存储单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.client = FakeS3Client()
+
+    def teardown_method(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir)
+
+    def create(self, node, **kwargs):
+        return S3Storage(
+            "trendradar", self.temp_dir / node, prefix="radar", client=self.client, **kwargs
+        )
+
+    def test_batched_upload(self):
+        """测试写入先落到本地，累计到 batch_size 个时批量上传"""
+        storage = self.create("crawler", batch_size=3)
+        storage.write_text("2025年11月01日/txt/10时00分.txt", "a")
+        storage.write_text("2025年11月01日/txt/10时05分.txt", "b")
+        assert self.client.objects == {}
+        assert (self.temp_dir / "crawler" / "2025年11月01日" / "txt" / "10时00分.txt").is_file()
+        assert storage.list_dirs() == ["2025年11月01日"]
+
+        storage.write_text("2025年11月01日/txt/10时10分.txt", "c")
+        assert len(self.client.objects) == 3
+        assert self.client.objects["radar/2025年11月01日/txt/10时05分.txt"] == b"b"
+
+        storage.write_text("rss/AI.xml", "<rss/>")
+        assert storage.flush() == 1
+        assert storage.flush() == 0
+
+    def test_read_uses_local_cache(self):
+        """测试已缓存的对象不重复下载"""
+        self.client.objects["radar/rss/AI.xml"] = b"<rss/>"
+        storage = self.create("mcp")
+
+        assert storage.read_text("rss/AI.xml") == "<rss/>"
+        assert storage.read_text("rss/AI.xml") == "<rss/>"
+        assert self.client.calls.count(("get", "radar/rss/AI.xml")) == 1
+        assert storage.exists("rss/AI.xml")
+        assert not storage.exists("rss/other.xml")
+        with pytest.raises(FileNotFoundError):
+            storage.read_bytes("rss/other.xml")
+
+    def test_sync_between_nodes(self):
+        """测试一个节点写入的快照在另一个节点同步后可按路径读取"""
+        crawler = self.create("crawler")
+        crawler.write_text("2025年11月01日/txt/10时00分.txt", "第一次")
+        crawler.flush()
+
+        mcp = self.create("mcp", list_ttl=0)
+        assert mcp.list_dirs() == ["2025年11月01日"]
+        assert mcp.sync("2025年11月01日/") == 1
+        local_file = mcp.local_path("2025年11月01日/txt/10时00分.txt")
+        assert local_file.read_text(encoding="utf-8") == "第一次"
+        assert mcp.sync("2025年11月01日/") == 0
+
+        # 远端对象变化后重新下载，重启后从清单恢复已同步状态
+        crawler.write_text("2025年11月01日/txt/10时00分.txt", "第二次")
+        crawler.flush()
+        assert self.create("mcp", list_ttl=0).sync("2025年11月01日/") == 1
+        assert local_file.read_text(encoding="utf-8") == "第二次"
+        assert self.create("mcp", list_ttl=0).sync("2025年11月01日/") == 0
+
+    def test_delete(self):
+        """测试删除远端对象和本地缓存"""
+        storage = self.create("crawler")
+        storage.write_text("rss/AI.xml", "<rss/>")
+        storage.flush()
+        assert storage.list_keys("rss/") == ["rss/AI.xml"]
+
+        storage.delete("rss/AI.xml")
+        assert self.client.objects == {}
+        assert not storage.local_path("rss/AI.xml").exists()
+        assert storage.list_keys("rss/") == []
+
+    def test_pack_and_extract_day(self):
+        """测试打包经存储后端上传归档并删除远端的 txt 快照和隐藏 JSON 文件，还原时反向操作"""
+        snapshot = "baidu | 百度热搜\n1. 标题\n\n"
+        crawler = self.create("crawler")
+        crawler.write_text("2025年11月01日/txt/10时00分.txt", snapshot)
+        crawler.write_text("2025年11月01日/.match_cache.json", "{}")
+        crawler.flush()
+
+        packer = self.create("packer", list_ttl=0)
+        path = pack_day(packer.local_path("2025年11月01日"), storage=packer)
+        assert sorted(self.client.objects) == ["radar/2025年11月01日/txt.archive"]
+        assert DayArchive(path).read_text("10时00分") == snapshot
+        assert not packer.local_path("2025年11月01日/txt").exists()
+
+        # 其他节点同步后只得到归档，不会重新下载已删除的 txt 快照
+        mcp = self.create("mcp", list_ttl=0)
+        assert mcp.sync("2025年11月01日/") == 1
+        assert [p.name for p in mcp.local_path("2025年11月01日").iterdir()] == ["txt.archive"]
+
+        assert extract_day(mcp.local_path("2025年11月01日"), True, mcp) == 1
+        assert sorted(self.client.objects) == ["radar/2025年11月01日/txt/10时00分.txt"]
+        assert mcp.read_text("2025年11月01日/txt/10时00分.txt") == snapshot
+
+    def test_pack_day_keeps_txt_on_upload_failure(self):
+        """测试归档上传失败时保留远端和本地的 txt 快照"""
+        storage = self.create("packer")
+        storage.write_text("2025年11月01日/txt/10时00分.txt", "baidu\n1. 标题\n\n")
+        storage.flush()
+
+        def fail_put(Bucket, Key, Body):
+            raise FakeClientError("500")
+
+        self.client.put_object = fail_put
+        with pytest.raises(OSError):
+            pack_day(storage.local_path("2025年11月01日"), storage=storage)
+        assert list(self.client.objects) == ["radar/2025年11月01日/txt/10时00分.txt"]
+        assert storage.local_path("2025年11月01日/txt/10时00分.txt").is_file()
+
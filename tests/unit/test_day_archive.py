@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from storage.day_archive import (
+    ARCHIVE_FILE_NAME,
+    DayArchive,
+    day_snapshot_loader,
+    extract_day,
+    pack_day,
+    pack_output_dir,
+)
+from storage.snapshot_loader import parse_snapshot_files
+from storage.txt_format import parse_snapshot_file, parse_snapshot_text, resolve_unchanged
+
+
+def snapshot_text(index):
+    return f"baidu | 百度热搜\n1. 标题{index} [URL:https://example.com/{index}]\n2. 公共标题\n\n"
+
+
+class TestDayArchive:
+    """按天归档单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.day_dir = self.temp_dir / "output" / "2025年11月01日"
+        self.txt_dir = self.day_dir / "txt"
+        self.txt_dir.mkdir(parents=True)
+        for index in range(5):
+            txt_file = self.txt_dir / f"10时{index:02d}分.txt"
+            txt_file.write_text(snapshot_text(index), encoding="utf-8")
+            os.utime(txt_file, (1700000000 + index, 1700000000 + index))
+
+    def teardown_method(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_pack_and_read(self):
+        """测试打包后按快照随机读取，并删除 txt 目录和当天的隐藏 JSON 文件"""
+        expected = {f.stem: f.read_bytes() for f in self.txt_dir.glob("*.txt")}
+        (self.day_dir / ".day_aggregate.json").write_text("{}", encoding="utf-8")
+        (self.day_dir / ".match_cache.json").write_text("{}", encoding="utf-8")
+        path = pack_day(self.day_dir, block_size=2)
+
+        assert path == self.day_dir / ARCHIVE_FILE_NAME
+        assert not self.txt_dir.exists()
+        assert [p.name for p in self.day_dir.iterdir()] == [ARCHIVE_FILE_NAME]
+
+        archive = DayArchive(path)
+        assert archive.times() == sorted(expected)
+        assert archive.read_bytes("10时03分") == expected["10时03分"]
+        assert archive.mtime("10时03分") == 1700000003
+        assert [time_info for time_info, _, _ in archive.iter_snapshots()] == sorted(expected)
+
+    def test_parse_archived_text(self):
+        """测试归档中的快照解析结果与 txt 文件相同"""
+        expected = parse_snapshot_file(self.txt_dir / "10时01分.txt")
+        pack_day(self.day_dir, codec="zlib")
+        archive = DayArchive.open(self.day_dir)
+        assert parse_snapshot_text(archive.read_text("10时01分")) == expected
+
+    def test_repack_merges_existing(self):
+        """测试已有归档时新增的 txt 快照与归档合并"""
+        pack_day(self.day_dir)
+        self.txt_dir.mkdir()
+        (self.txt_dir / "11时00分.txt").write_text(snapshot_text(9), encoding="utf-8")
+        pack_day(self.day_dir)
+
+        archive = DayArchive.open(self.day_dir)
+        assert len(archive) == 6
+        assert archive.read_text("11时00分") == snapshot_text(9)
+
+    def test_txt_snapshot_based_on_archive(self):
+        """测试打包后写入的 txt 快照以归档中的快照为增量基准或未变化引用时能读取完整标题"""
+        pack_day(self.day_dir)
+        self.txt_dir.mkdir()
+        delta_file = self.txt_dir / "11时00分.txt"
+        delta_file.write_text(
+            "baidu | 百度热搜\n[DELTA:10时04分]\n1. 新标题\n=2,1,1\n\n", encoding="utf-8"
+        )
+        unchanged_file = self.txt_dir / "11时05分.txt"
+        unchanged_file.write_text("baidu | 百度热搜\n[UNCHANGED:10时04分]\n\n", encoding="utf-8")
+        expected = {"新标题": (1, "", ""), "公共标题": (2, "", "")}
+
+        load = day_snapshot_loader(self.txt_dir)
+        assert load("11时00分")[0] == {"baidu": expected}
+        assert resolve_unchanged(load("11时05分"), load)[0] == {
+            "baidu": {"标题4": (1, "https://example.com/4", ""), "公共标题": (2, "", "")}
+        }
+        assert parse_snapshot_files([delta_file], workers=1)[0][0] == {"baidu": expected}
+
+    def test_extract(self):
+        """测试还原为 txt 文件并保留修改时间"""
+        expected = {f.name: f.read_bytes() for f in self.txt_dir.glob("*.txt")}
+        pack_day(self.day_dir)
+        assert extract_day(self.day_dir, remove_archive=True) == 5
+
+        assert {f.name: f.read_bytes() for f in self.txt_dir.glob("*.txt")} == expected
+        assert (self.txt_dir / "10时02分.txt").stat().st_mtime == 1700000002
+        assert DayArchive.open(self.day_dir) is None
+
+    def test_pack_output_dir_skips_open_days(self):
+        """测试只打包指定日期之前的日期"""
+        output_dir = self.temp_dir / "output"
+        assert pack_output_dir(str(output_dir), before="2025-11-01") == []
+        assert pack_output_dir(str(output_dir), before="2025-11-02") == [
+            self.day_dir / ARCHIVE_FILE_NAME
+        ]
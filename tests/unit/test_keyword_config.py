@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from analysis.keyword_config import load_keyword_config, parse_frequency_words
+from mcp_server.services.parser_service import ParserService
+
+
+class TestKeywordConfig:
+    """关键词配置单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.path = self.temp_dir / "frequency_words.txt"
+
+    def teardown_method(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, content, mtime):
+        self.path.write_text(content, encoding="utf-8")
+        os.utime(self.path, (mtime, mtime))
+
+    def test_parse(self):
+        """测试必须词、普通词、过滤词和最大显示数量"""
+        word_groups, filter_words = parse_frequency_words(
+            "华为\n鸿蒙\n@5\n\n+AI\n!广告\n\n\n+发布\n芯片\n@abc\n"
+        )
+        assert filter_words == ["广告"]
+        assert word_groups == [
+            {"required": [], "normal": ["华为", "鸿蒙"], "group_key": "华为 鸿蒙", "max_count": 5, "filter_words": []},
+            {"required": ["AI"], "normal": [], "group_key": "AI", "max_count": 0, "filter_words": ["广告"]},
+            {"required": ["发布"], "normal": ["芯片"], "group_key": "芯片", "max_count": 0, "filter_words": []},
+        ]
+
+    def test_reload_on_change(self):
+        """测试文件未修改时复用已编译的配置，修改后重新加载"""
+        self.write("华为\n", 1700000000)
+        config = load_keyword_config(self.path)
+        assert load_keyword_config(self.path) is config
+        assert config.matcher.match("华为新品") == 0
+
+        # 只更新修改时间时沿用原配置
+        self.write("华为\n", 1700000100)
+        assert load_keyword_config(self.path) is config
+
+        self.write("华为\n\n芯片\n", 1700000200)
+        reloaded = load_keyword_config(self.path)
+        assert reloaded is not config
+        assert reloaded.fingerprint != config.fingerprint
+        assert reloaded.matcher.match("芯片出口") == 1
+
+    def test_mcp_groups_are_copies(self):
+        """测试 MCP 返回的词组被修改时不影响共用的已编译配置"""
+        self.write("华为\n+AI\n", 1700000000)
+        config = load_keyword_config(self.path)
+        groups = ParserService(str(self.temp_dir)).parse_frequency_words(str(self.path))
+        groups[0]["normal"].append("芯片")
+        groups[0]["group_key"] = "其他"
+
+        assert config.word_groups[0]["normal"] == ["华为"]
+        assert config.word_groups[0]["group_key"] == "华为"
+        assert load_keyword_config(self.path) is config
+
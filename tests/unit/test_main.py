@@ -0,0 +1,308 @@
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+import main
+from storage.backend import LocalStorage
+from main import CrawlScheduler, DataFetcher, DayAggregate, PlatformHealth, to_news_items
+
+# 固定的当前时间戳（2025-11-01 10:00 北京时间）
+NOW = 1761962400
+
+
+class TestDayAggregate:
+    """当日标题聚合单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.aggregate = self.create()
+
+    def teardown_method(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir)
+
+    def create(self):
+        aggregate = DayAggregate("2025年11月01日")
+        aggregate.sidecar_path = self.temp_dir / main.DAY_AGGREGATE_FILENAME
+        return aggregate
+
+    def add(self, time_info, stored_titles):
+        self.aggregate.add_snapshot(
+            time_info,
+            to_news_items(stored_titles),
+            {source_id: source_id for source_id in stored_titles},
+            0,
+        )
+
+    def test_new_titles(self):
+        """测试最新快照中首次出现的标题"""
+        self.add("10时00分", {"baidu": {"标题一": (1, "", "")}})
+        assert self.aggregate.detect_new_titles() == {}
+
+        self.add("10时30分", {"baidu": {"标题二": (1, "", ""), "标题一": (2, "", "")}})
+        new_titles = self.aggregate.detect_new_titles()
+        assert {k: list(v) for k, v in new_titles.items()} == {"baidu": ["标题二"]}
+
+    def test_first_crawl_of_platform_is_baseline(self):
+        """测试平台当天第一次抓取的标题作为基准，不算新增"""
+        self.add("10时00分", {"baidu": {"标题一": (1, "", "")}})
+        self.add(
+            "10时30分",
+            {
+                "baidu": {"标题一": (1, "", "")},
+                "zhihu": {f"知乎{i}": (i, "", "") for i in range(1, 31)},
+            },
+        )
+        assert self.aggregate.detect_new_titles() == {}
+
+        # 从持久化数据恢复后按首次出现时间扫描，结果相同
+        self.aggregate.save()
+        loaded = self.create()
+        loaded.load()
+        assert loaded.detect_new_titles() == {}
+
+        self.add(
+            "11时00分",
+            {"zhihu": {"知乎新": (1, "", ""), "知乎1": (2, "", "")}},
+        )
+        new_titles = self.aggregate.detect_new_titles()
+        assert {k: list(v) for k, v in new_titles.items()} == {"zhihu": ["知乎新"]}
+
+
+    def test_full_turnover_is_new(self):
+        """测试平台榜单整体更换时所有标题都算新增（恢复持久化数据后相同）"""
+        self.add("10时00分", {"baidu": {"标题一": (1, "", "")}})
+        self.add("10时30分", {"baidu": {"标题二": (1, "", "")}})
+        assert list(self.aggregate.detect_new_titles()["baidu"]) == ["标题二"]
+
+        self.aggregate.save()
+        loaded = self.create()
+        loaded.load()
+        assert loaded.baseline_times == {"baidu": "10时00分"}
+        assert list(loaded.detect_new_titles()["baidu"]) == ["标题二"]
+
+class TestCrawlScheduler:
+    """按平台间隔爬取单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.schedule_file = self.temp_dir / ".crawl_schedule.json"
+
+    def teardown_method(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_interval_tolerance(self):
+        """测试到期判断留出一分钟余量，爬取时间持久化"""
+        now = datetime.fromtimestamp(NOW)
+        scheduler = CrawlScheduler(str(self.schedule_file))
+        platforms = [
+            {"id": "baidu"},
+            {"id": "zhihu", "interval": 30},
+            {"id": "weibo", "interval": "abc"},
+        ]
+        assert scheduler.split_due(platforms, now) == (platforms, [])
+        scheduler.record(["baidu", "zhihu"], now)
+
+        scheduler = CrawlScheduler(str(self.schedule_file))
+        assert scheduler.last_crawled == {"baidu": NOW, "zhihu": NOW}
+        assert scheduler.is_due(platforms[1], now + timedelta(minutes=29))
+        assert not scheduler.is_due(platforms[1], now + timedelta(minutes=28, seconds=59))
+        assert scheduler.split_due(platforms, now + timedelta(minutes=10)) == (
+            [platforms[0], platforms[2]],
+            [platforms[1]],
+        )
+
+
+class TestPlatformHealth:
+    """平台熔断单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.health_file = self.temp_dir / ".platform_health.json"
+
+    def teardown_method(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir)
+
+    @pytest.fixture(autouse=True)
+    def breaker_config(self, monkeypatch):
+        monkeypatch.setitem(
+            main.CONFIG,
+            "CIRCUIT_BREAKER",
+            {
+                "ENABLED": True,
+                "FAILURE_THRESHOLD": 3,
+                "COOLDOWN_MINUTES": 60,
+                "MAX_COOLDOWN_MINUTES": 240,
+            },
+        )
+        monkeypatch.setattr(main.time, "time", lambda: NOW)
+
+    def test_failure_threshold_and_cooldown(self):
+        """测试连续失败达到阈值后熔断，冷却时间逐次翻倍且不超过上限"""
+        health = PlatformHealth(str(self.health_file))
+        for _ in range(2):
+            health.record_failure("baidu")
+        assert not health.is_open("baidu")
+        assert health.open_until("baidu") is None
+
+        cooldowns = []
+        for _ in range(4):
+            health.record_failure("baidu")
+            cooldowns.append((health.open_until("baidu") - NOW) / 60)
+        assert cooldowns == [60, 120, 240, 240]
+
+        health.save()
+        assert PlatformHealth(str(self.health_file)).records == health.records
+
+    def test_probe_once_after_cooldown(self, monkeypatch):
+        """测试冷却期内跳过，冷却结束后只试探一次且不重试"""
+        health = PlatformHealth(str(self.health_file))
+        for _ in range(3):
+            health.record_failure("baidu")
+        platforms = [{"id": "baidu"}, {"id": "zhihu"}]
+
+        now = datetime.fromtimestamp(NOW + 59 * 60)
+        assert health.split_available(platforms, now) == ([platforms[1]], [platforms[0]])
+        now = datetime.fromtimestamp(NOW + 60 * 60)
+        assert health.split_available(platforms, now) == (platforms, [])
+        assert health.probe_ids == {"baidu"}
+        assert health.max_retries("baidu", 2) == 0
+        assert health.max_retries("zhihu", 2) == 2
+
+        class FailingClient:
+            calls = 0
+
+            def get(self, url, **kwargs):
+                FailingClient.calls += 1
+                raise ConnectionError("连接失败")
+
+        monkeypatch.setattr(main, "get_http_client", FailingClient)
+        monkeypatch.setattr(main.time, "sleep", lambda seconds: None)
+        DataFetcher(api_url="http://127.0.0.1/api/s").fetch_data("baidu", health=health)
+        assert FailingClient.calls == 1
+        assert health.records["baidu"]["consecutive_failures"] == 4
+
+    def test_latency_excludes_rate_limit(self, monkeypatch):
+        """测试记录的响应耗时只包含请求本身，不含请求间隔的等待"""
+        clock = [0.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        class SlowClient:
+            def get(self, url, **kwargs):
+                clock[0] += 0.2
+                return Response()
+
+        class Response:
+            text = '{"status": "success", "items": []}'
+
+            def raise_for_status(self):
+                pass
+
+        monkeypatch.setattr(main.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(main.time, "sleep", sleep)
+        monkeypatch.setattr(main, "get_http_client", SlowClient)
+
+        health = PlatformHealth(str(self.health_file))
+        DataFetcher(api_url="http://127.0.0.1/api/s").fetch_data(
+            "baidu", rate_limiter=main.HostRateLimiter(1, 1000), health=health
+        )
+        assert clock[0] > 1
+        assert health.records["baidu"]["latency_ms"] == 200.0
+
+    def test_reset_on_success(self):
+        """测试成功后清零连续失败次数，响应耗时取滑动平均"""
+        health = PlatformHealth(str(self.health_file))
+        for _ in range(3):
+            health.record_failure("baidu")
+        health.record_success("baidu", 100)
+        health.record_success("baidu", 200)
+
+        record = health.records["baidu"]
+        assert record["consecutive_failures"] == 0
+        assert record["last_success"] == NOW
+        assert record["latency_ms"] == 130.0
+        assert not health.is_open("baidu")
+
+
+class TestCrawlWebsites:
+    """按优先级爬取单元测试"""
+
+    @pytest.fixture(autouse=True)
+    def fake_clock(self, monkeypatch):
+        self.clock = 0.0
+        self.fetched = []
+        monkeypatch.setattr(main.time, "monotonic", lambda: self.clock)
+        monkeypatch.setattr(main.time, "sleep", lambda seconds: None)
+
+        self.fetcher = DataFetcher(api_url="http://127.0.0.1/api/s")
+        monkeypatch.setattr(self.fetcher, "fetch_data", self.fetch_data)
+
+    def fetch_data(self, id_info, rate_limiter=None, health=None, deadline=None):
+        """每次请求耗时 10 秒，返回以平台ID为标题的一条新闻"""
+        id_value, alias = id_info if isinstance(id_info, tuple) else (id_info, id_info)
+        self.fetched.append(id_value)
+        self.clock += 10
+        return {"status": "success", "items": [{"title": id_value}]}, id_value, alias
+
+    def test_priority_order(self):
+        """测试按优先级爬取，结果保持配置顺序"""
+        ids = ["a", ("b", "B"), "c", "d"]
+        results, id_to_name, failed_ids = self.fetcher.crawl_websites(
+            ids, max_concurrency=1, priorities={"c": 5, "b": 1}
+        )
+        assert self.fetched == ["c", "b", "a", "d"]
+        assert list(results) == ["a", "b", "c", "d"]
+        assert id_to_name == {"a": "a", "b": "B", "c": "c", "d": "d"}
+        assert failed_ids == []
+
+        results, _, _ = self.fetcher.crawl_websites(
+            ids, max_concurrency=3, priorities={"d": 2}
+        )
+        assert list(results) == ["a", "b", "c", "d"]
+
+    def test_deadline(self):
+        """测试到达时长上限后未开始的平台放弃并计入失败"""
+        results, _, failed_ids = self.fetcher.crawl_websites(
+            ["a", "b", "c", "d"], max_concurrency=1, priorities={"d": 1}, deadline_seconds=15
+        )
+        assert self.fetched == ["d", "a"]
+        assert list(results) == ["a", "d"]
+        assert failed_ids == ["b", "c"]
+
+
+class TestMatchCachePath:
+    """标题匹配缓存位置单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_cache_under_storage_root(self, monkeypatch):
+        """测试匹配缓存和当日聚合保存在存储后端的本地目录下"""
+        monkeypatch.setattr(main, "_storage_backend", LocalStorage(self.temp_dir / "output"))
+        monkeypatch.setattr(main, "_match_caches", {})
+        groups = [{"required": [], "normal": ["华为"], "group_key": "华为"}]
+
+        cache = main.get_match_cache(groups, [], "2025年11月01日")
+        assert main.get_match_cache(groups, [], "2025年11月01日") is cache
+        assert cache.match("华为新品") == 0
+        main.save_match_caches()
+
+        day_dir = self.temp_dir / "output" / "2025年11月01日"
+        assert (day_dir / main.MATCH_CACHE_FILENAME).is_file()
+        assert DayAggregate("2025年11月01日").sidecar_path == day_dir / main.DAY_AGGREGATE_FILENAME
+
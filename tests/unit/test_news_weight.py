@@ -0,0 +1,45 @@
+import pytest
+
+from analysis.news_weight import calculate_news_weights, np, top_news_by_weight
+
+WEIGHT_CONFIG = {"RANK_WEIGHT": 0.6, "FREQUENCY_WEIGHT": 0.3, "HOTNESS_WEIGHT": 0.1}
+
+NEWS = [
+    {"ranks": [1, 3, 12], "count": 4},
+    {"ranks": [], "count": 5},
+    {"ranks": [20]},
+    {"ranks": [2] * 30, "count": 30},
+]
+
+
+def expected_weight(ranks, count):
+    rank_weight = sum(11 - min(rank, 10) for rank in ranks) / len(ranks)
+    hotness_weight = sum(1 for rank in ranks if rank <= 5) / len(ranks) * 100
+    return rank_weight * 0.6 + min(count, 10) * 10 * 0.3 + hotness_weight * 0.1
+
+
+class TestNewsWeight:
+    """新闻权重单元测试"""
+
+    def test_weights(self):
+        """测试排名、频次和热度权重，没有排名时为 0"""
+        weights = calculate_news_weights(NEWS, 5, WEIGHT_CONFIG, use_numpy=False)
+        assert weights == [
+            expected_weight([1, 3, 12], 4),
+            0.0,
+            expected_weight([20], 1),
+            expected_weight([2] * 30, 30),
+        ]
+
+    @pytest.mark.skipif(np is None, reason="未安装 NumPy")
+    def test_numpy_matches_python(self):
+        """测试 NumPy 批量计算与逐条计算结果逐位一致"""
+        assert calculate_news_weights(NEWS, 5, WEIGHT_CONFIG, use_numpy=True) == (
+            calculate_news_weights(NEWS, 5, WEIGHT_CONFIG, use_numpy=False)
+        )
+
+    def test_top_news_by_weight(self):
+        """测试按权重降序选择，权重相同时保持原顺序"""
+        news_list = [{"id": 0, "ranks": [9]}, {"id": 1, "ranks": [1]}, {"id": 2, "ranks": [9]}]
+        assert [news["id"] for news in top_news_by_weight(news_list)] == [1, 0, 2]
+        assert [news["id"] for news in top_news_by_weight(news_list, 2)] == [1, 0]
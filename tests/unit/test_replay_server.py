@@ -0,0 +1,81 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from tools.crawl_benchmark import percentile
+from tools.replay_server import ReplayServer, load_replay_data
+
+
+class TestReplayServer:
+    """newsnow 接口回放服务单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        txt_dir = Path(self.temp_dir) / "2025年11月01日" / "txt"
+        txt_dir.mkdir(parents=True)
+        (txt_dir / "10时00分.txt").write_text(
+            "baidu | 百度热搜\n2. 标题二\n1. 标题一 [URL:https://example.com/1]\n\n",
+            encoding="utf-8",
+        )
+        (txt_dir / "10时30分.txt").write_text(
+            "baidu | 百度热搜\n1. 新标题\n\n", encoding="utf-8"
+        )
+        self.server = None
+
+    def teardown_method(self):
+        """清理测试环境"""
+        if self.server:
+            self.server.httpd.server_close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_load_replay_data(self):
+        """测试快照按时间顺序转换为接口 items"""
+        snapshots = load_replay_data(self.temp_dir)
+        assert [item["title"] for item in snapshots["baidu"][0]] == ["标题一", "标题二"]
+        assert snapshots["baidu"][0][0]["url"] == "https://example.com/1"
+        assert [item["title"] for item in snapshots["baidu"][1]] == ["新标题"]
+
+    def test_load_replay_data_unchanged(self):
+        """测试内容未变化的平台回放引用快照中的标题"""
+        txt_dir = Path(self.temp_dir) / "2025年11月01日" / "txt"
+        (txt_dir / "11时00分.txt").write_text(
+            "baidu | 百度热搜\n[UNCHANGED:10时30分]\n\n", encoding="utf-8"
+        )
+        snapshots = load_replay_data(self.temp_dir)
+        assert [item["title"] for item in snapshots["baidu"][2]] == ["新标题"]
+
+    def test_handle_cycles_snapshots(self):
+        """测试同一平台依次循环回放快照"""
+        self.server = ReplayServer(load_replay_data(self.temp_dir), port=0)
+        titles = [
+            self.server.handle("/api/s?id=baidu&latest")[1]["items"][0]["title"]
+            for _ in range(3)
+        ]
+        assert titles == ["标题一", "新标题", "标题一"]
+        assert self.server.handle("/api/s?id=baidu")[1]["status"] == "success"
+
+    def test_handle_cache_repeats_last_snapshot(self):
+        """测试 cache 状态重复返回上次的列表且不前进"""
+        self.server = ReplayServer(load_replay_data(self.temp_dir), port=0, cache_rate=1)
+        responses = [self.server.handle("/api/s?id=baidu")[1] for _ in range(3)]
+        assert [r["status"] for r in responses] == ["success", "cache", "cache"]
+        assert [r["items"][0]["title"] for r in responses] == ["标题一"] * 3
+
+        self.server.cache_rate = 0
+        assert self.server.handle("/api/s?id=baidu")[1]["items"][0]["title"] == "新标题"
+
+    def test_handle_errors(self):
+        """测试未知平台和注入的错误"""
+        self.server = ReplayServer(
+            load_replay_data(self.temp_dir), port=0, error_rate=1
+        )
+        assert self.server.handle("/api/s?id=unknown")[0] == 404
+        assert self.server.handle("/api/s?id=baidu")[0] == 500
+
+    def test_percentile(self):
+        """测试最近秩百分位数"""
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([], 50) == 0.0
@@ -0,0 +1,42 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from storage import snapshot_loader
+from storage.snapshot_loader import MIN_PARALLEL_FILES, parse_snapshot_files
+from storage.txt_format import parse_snapshot_file
+
+
+class TestParseSnapshotFiles:
+    """快照并行解析单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.files = []
+        for index in range(MIN_PARALLEL_FILES + 2):
+            file_path = self.temp_dir / f"10时{index:02d}分.txt"
+            file_path.write_text(
+                f"baidu | 百度热搜\n1. 标题{index} [URL:https://example.com/{index}]\n2. 公共标题\n\n"
+                "weibo\n[UNCHANGED:10时00分]\n\n==== 以下ID请求失败 ====\nzhihu\n",
+                encoding="utf-8",
+            )
+            self.files.append(file_path)
+
+    def teardown_method(self):
+        """清理测试环境"""
+        snapshot_loader.shutdown()
+        shutil.rmtree(self.temp_dir)
+
+    def test_parallel_matches_sequential(self):
+        """测试进程池解析结果与逐个解析相同且保持输入顺序"""
+        expected = [parse_snapshot_file(file_path) for file_path in self.files]
+        assert parse_snapshot_files(self.files, workers=2) == expected
+        assert parse_snapshot_files(self.files, workers=1) == expected
+
+    def test_failed_file_returns_exception(self):
+        """测试单个文件解析失败时对应位置返回异常，不影响其他文件"""
+        missing = self.temp_dir / "不存在.txt"
+        results = parse_snapshot_files([self.files[0], missing], workers=2)
+        assert results[0] == parse_snapshot_file(self.files[0])
+        assert isinstance(results[1], FileNotFoundError)
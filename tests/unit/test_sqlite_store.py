@@ -0,0 +1,166 @@
+import shutil
+import tempfile
+from pathlib import Path
+from storage.sqlite_store import SQLiteSnapshotStore, date_to_folder, folder_to_date
+from storage.txt_format import parse_snapshot_file, parse_unchanged_marker
+
+
+SNAPSHOT_TEXT = """baidu | 百度热搜
+1. 标题一 [URL:https://example.com/1] [MOBILE:https://m.example.com/1]
+2. 标题二
+
+weibo
+1. 微博标题 [URL:https://weibo.com/1]
+
+==== 以下ID请求失败 ====
+zhihu
+"""
+
+
+class TestSQLiteSnapshotStore:
+    """SQLite快照存储单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = SQLiteSnapshotStore(str(Path(self.temp_dir) / "test.db"))
+
+    def teardown_method(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_date_conversion(self):
+        """测试日期目录名与ISO日期互转"""
+        assert folder_to_date("2025年11月01日") == "2025-11-01"
+        assert date_to_folder("2025-11-01") == "2025年11月01日"
+
+    def test_save_and_read_snapshot(self):
+        """测试保存和读取快照"""
+        titles_by_id = {
+            "baidu": {
+                "标题一": (1, "https://example.com/1", "https://m.example.com/1"),
+                "标题二": (2, "", ""),
+            },
+        }
+        self.store.save_snapshot(
+            "2025-11-01", "10时00分", titles_by_id, {"baidu": "百度热搜"}, ["zhihu"]
+        )
+
+        read_titles, id_to_name = self.store.read_snapshot("2025-11-01", "10时00分")
+        assert read_titles == titles_by_id
+        assert list(read_titles["baidu"]) == ["标题一", "标题二"]
+        assert id_to_name == {"baidu": "百度热搜"}
+        assert self.store.read_failed_ids("2025-11-01", "10时00分") == ["zhihu"]
+        assert self.store.list_snapshots("2025-11-01") == [("10时00分", 2)]
+
+    def test_overwrite_snapshot(self):
+        """测试同一时间的快照覆盖写入"""
+        self.store.save_snapshot(
+            "2025-11-01", "10时00分", {"baidu": {"旧标题": (1, "", "")}}, {}
+        )
+        self.store.save_snapshot(
+            "2025-11-01", "10时00分", {"baidu": {"新标题": (3, "", "")}}, {}
+        )
+
+        read_titles, _ = self.store.read_snapshot("2025-11-01", "10时00分")
+        assert read_titles == {"baidu": {"新标题": (3, "", "")}}
+        assert self.store.list_snapshots("2025-11-01") == [("10时00分", 1)]
+
+    def test_platform_names_per_snapshot(self):
+        """测试平台名称按快照保留"""
+        self.store.save_snapshot(
+            "2025-11-01", "10时00分", {"baidu": {"标题": (1, "", "")}}, {"baidu": "旧名称"}
+        )
+        self.store.save_snapshot(
+            "2025-11-02", "10时00分", {"baidu": {"标题": (1, "", "")}}, {"baidu": "新名称"}
+        )
+
+        assert self.store.get_platform_names("2025-11-01") == {"baidu": "旧名称"}
+        assert self.store.get_platform_names() == {"baidu": "新名称"}
+
+    def test_iter_rows_filters(self):
+        """测试按日期范围和平台过滤"""
+        for date in ["2025-11-01", "2025-11-02", "2025-11-03"]:
+            self.store.save_snapshot(
+                date,
+                "10时00分",
+                {
+                    "baidu": {f"百度{date}": (1, "", "")},
+                    "weibo": {f"微博{date}": (1, "", "")},
+                },
+                {},
+            )
+
+        rows = list(self.store.iter_rows("2025-11-02", "2025-11-03", ["weibo"]))
+        assert [row[3] for row in rows] == ["微博2025-11-02", "微博2025-11-03"]
+        assert self.store.list_dates() == ["2025-11-01", "2025-11-02", "2025-11-03"]
+
+    def test_import_output_dir(self):
+        """测试导入txt快照目录"""
+        output_dir = Path(self.temp_dir) / "output"
+        txt_dir = output_dir / "2025年11月01日" / "txt"
+        txt_dir.mkdir(parents=True)
+        (txt_dir / "10时00分.txt").write_text(SNAPSHOT_TEXT, encoding="utf-8")
+
+        assert self.store.import_output_dir(str(output_dir)) == (1, 0)
+        assert self.store.import_output_dir(str(output_dir)) == (0, 1)
+
+        expected_titles, expected_names, expected_failed, _ = parse_snapshot_file(
+            txt_dir / "10时00分.txt"
+        )
+        read_titles, id_to_name = self.store.read_snapshot("2025-11-01", "10时00分")
+        assert read_titles == expected_titles
+        assert id_to_name == expected_names == {"baidu": "百度热搜", "weibo": "weibo"}
+        assert self.store.read_failed_ids("2025-11-01", "10时00分") == expected_failed
+        assert expected_failed == ["zhihu"]
+
+    def test_unchanged_platforms(self):
+        """测试未变化的平台只记录引用的快照时间"""
+        self.store.save_snapshot(
+            "2025-11-01", "10时00分", {"baidu": {"标题": (1, "", "")}}, {"baidu": "百度热搜"}
+        )
+        self.store.save_snapshot(
+            "2025-11-01",
+            "10时30分",
+            {"weibo": {"微博标题": (1, "", "")}},
+            {"baidu": "百度热搜", "weibo": "微博"},
+            unchanged={"baidu": "10时00分"},
+        )
+
+        read_titles, id_to_name = self.store.read_snapshot("2025-11-01", "10时30分")
+        assert read_titles == {"weibo": {"微博标题": (1, "", "")}}
+        assert id_to_name == {"baidu": "百度热搜", "weibo": "微博"}
+        assert self.store.list_unchanged("2025-11-01") == [
+            ("10时30分", "baidu", "10时00分")
+        ]
+        assert self.store.list_unchanged("2025-11-01", "10时00分") == []
+
+    def test_import_unchanged_marker(self):
+        """测试导入带未变化标记的txt快照"""
+        output_dir = Path(self.temp_dir) / "output"
+        txt_dir = output_dir / "2025年11月01日" / "txt"
+        txt_dir.mkdir(parents=True)
+        (txt_dir / "10时00分.txt").write_text(SNAPSHOT_TEXT, encoding="utf-8")
+        (txt_dir / "10时30分.txt").write_text(
+            "baidu | 百度热搜\n[UNCHANGED:10时00分]\n\nweibo\n1. 新微博标题\n\n",
+            encoding="utf-8",
+        )
+
+        titles_by_id, id_to_name, failed_ids, unchanged = parse_snapshot_file(
+            txt_dir / "10时30分.txt"
+        )
+        assert titles_by_id == {"weibo": {"新微博标题": (1, "", "")}}
+        assert id_to_name == {"baidu": "百度热搜", "weibo": "weibo"}
+        assert failed_ids == []
+        assert unchanged == {"baidu": "10时00分"}
+
+        assert self.store.import_output_dir(str(output_dir)) == (2, 0)
+        assert self.store.list_unchanged("2025-11-01") == [
+            ("10时30分", "baidu", "10时00分")
+        ]
+
+    def test_parse_unchanged_marker(self):
+        """测试解析未变化标记"""
+        assert parse_unchanged_marker("[UNCHANGED:10时00分]") == "10时00分"
+        assert parse_unchanged_marker("1. [UNCHANGED:10时00分]") is None
+        assert parse_unchanged_marker("1. 标题") is None
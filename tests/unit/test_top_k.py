@@ -0,0 +1,22 @@
+import random
+
+from analysis.top_k import top_k
+
+
+class TestTopK:
+    """有上限的排序选择单元测试"""
+
+    def test_same_as_sorted_slice(self):
+        """测试结果与完整排序后截取相同（包括相等元素的顺序）"""
+        rng = random.Random(0)
+        for _ in range(200):
+            items = [(rng.randint(0, 5), index) for index in range(rng.randint(0, 30))]
+            k = rng.randint(1, 35)
+            for reverse in (False, True):
+                expected = sorted(items, key=lambda x: x[0], reverse=reverse)[:k]
+                assert top_k(items, k, key=lambda x: x[0], reverse=reverse) == expected
+
+    def test_unbounded(self):
+        """测试不限制数量时返回全部排序结果"""
+        assert top_k([3, 1, 2], None) == [1, 2, 3]
+        assert top_k(iter([3, 1, 2]), 0, reverse=True) == [3, 2, 1]
@@ -0,0 +1,185 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from storage.txt_format import (
+    RECORD_FAILED,
+    RECORD_PLATFORM,
+    RECORD_TITLE,
+    encode_delta_lines,
+    format_snapshot,
+    format_title_line,
+    iter_snapshot_records,
+    parse_snapshot_file,
+    parse_snapshot_text,
+    parse_title_line,
+    read_platform_sections,
+    resolve_unchanged,
+    select_platform_sections,
+)
+
+
+SNAPSHOT_TEXT = """baidu | 百度热搜
+1. 标题一 [URL:https://example.com/1] [MOBILE:https://m.example.com/1]
+2. 标题二
+
+
+weibo
+[UNCHANGED:10时00分]
+
+empty | 只有首行
+
+==== 以下ID请求失败 ====
+zhihu
+"""
+
+
+class TestTxtFormat:
+    """txt快照格式单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = Path(self.temp_dir) / "10时30分.txt"
+        self.file_path.write_text(SNAPSHOT_TEXT, encoding="utf-8")
+
+    def teardown_method(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_iter_snapshot_records(self):
+        """测试逐行产出的记录"""
+        assert list(iter_snapshot_records(self.file_path)) == [
+            (RECORD_PLATFORM, "baidu", "百度热搜", None),
+            (RECORD_TITLE, "baidu", 1, "标题一", "https://example.com/1", "https://m.example.com/1"),
+            (RECORD_TITLE, "baidu", 2, "标题二", "", ""),
+            (RECORD_PLATFORM, "weibo", "weibo", "10时00分"),
+            (RECORD_FAILED, "zhihu"),
+        ]
+
+    def test_parse_snapshot_file(self):
+        """测试汇总解析结果"""
+        titles_by_id, id_to_name, failed_ids, unchanged = parse_snapshot_file(
+            self.file_path
+        )
+        assert titles_by_id == {
+            "baidu": {
+                "标题一": (1, "https://example.com/1", "https://m.example.com/1"),
+                "标题二": (2, "", ""),
+            }
+        }
+        assert id_to_name == {"baidu": "百度热搜", "weibo": "weibo"}
+        assert failed_ids == ["zhihu"]
+        assert unchanged == {"weibo": "10时00分"}
+
+    def test_parse_title_line_irregular(self):
+        """测试快速匹配不适用的标题行按逐段规则解析"""
+        assert parse_title_line("3. 标题　含  空白 [URL:u]") == (3, "标题 含 空白", "u", "")
+        assert parse_title_line("4. [置顶] 标题 [URL:a] [MOBILE:m]") == (4, "[置顶] 标题", "a", "m")
+        assert parse_title_line("没有排名 [MOBILE:m") == (1, "没有排名", "", "")
+        assert parse_title_line("  5. 前后空格  ") == (5, "前后空格", "", "")
+
+    def test_delta_snapshot(self):
+        """测试增量快照按基准还原为完整内容"""
+        base_items = [
+            (f"标题{i}", (i, f"https://example.com/{i}", "")) for i in range(1, 6)
+        ]
+        items = [
+            ("新标题", (1, "https://example.com/new", "")),
+            ("标题1", (2, "https://example.com/1", "")),
+            ("标题2", (3, "https://example.com/2", "")),
+            ("标题4", (4, "https://example.com/4", "")),
+            ("标题5", (5, "https://example.com/changed", "")),
+        ]
+        lines = encode_delta_lines(base_items, items)
+        assert lines == [
+            "1. 新标题 [URL:https://example.com/new]",
+            "=2,0,2",
+            "=4,3,1",
+            "5. 标题5 [URL:https://example.com/changed]",
+        ]
+
+        base_dir = Path(self.temp_dir)
+        (base_dir / "10时00分.txt").write_text(
+            "baidu | 百度热搜\n"
+            + "".join(format_title_line(rank, title, url) + "\n" for title, (rank, url, _) in base_items)
+            + "\n",
+            encoding="utf-8",
+        )
+        (base_dir / "10时10分.txt").write_text(
+            "baidu | 百度热搜\n[UNCHANGED:10时00分]\n\n", encoding="utf-8"
+        )
+        # 基准快照中该平台未变化时沿引用找到内容
+        delta_path = base_dir / "10时20分.txt"
+        delta_path.write_text(
+            "baidu | 百度热搜\n[DELTA:10时10分]\n" + "\n".join(lines) + "\n\n",
+            encoding="utf-8",
+        )
+
+        titles_by_id, id_to_name, _, unchanged = parse_snapshot_file(delta_path)
+        assert list(titles_by_id["baidu"].items()) == items
+        assert id_to_name == {"baidu": "百度热搜"}
+        assert unchanged == {}
+
+    def test_resolve_unchanged(self):
+        """测试未变化的平台沿引用链读取标题，引用的快照不存在时保留在 unchanged 中"""
+        snapshots = {
+            "10时00分": ({"weibo": {"微博一": (1, "u", "")}}, {}, [], {}),
+            "10时10分": ({}, {}, [], {"weibo": "10时00分"}),
+        }
+        parsed = parse_snapshot_text(
+            "weibo\n[UNCHANGED:10时10分]\n\nzhihu\n[UNCHANGED:09时00分]\n\n"
+        )
+
+        titles_by_id, id_to_name, _, unchanged = resolve_unchanged(parsed, snapshots.get)
+        assert titles_by_id == {"weibo": {"微博一": (1, "u", "")}}
+        assert id_to_name == {"weibo": "weibo", "zhihu": "zhihu"}
+        assert unchanged == {"zhihu": "09时00分"}
+        assert resolve_unchanged(parsed, None)[3] == parsed[3]
+
+    def test_delta_snapshot_without_base(self):
+        """测试基准快照不存在时只保留完整标题行"""
+        titles_by_id, _, _, _ = parse_snapshot_text(
+            "baidu\n[DELTA:09时00分]\n=1,0,3\n4. 标题 [URL:u]\n\n"
+        )
+        assert titles_by_id == {"baidu": {"标题": (4, "u", "")}}
+
+    def test_platform_index(self):
+        """测试按平台偏移索引只读取指定平台，结果与完整解析后过滤相同"""
+        content = format_snapshot(
+            [
+                ("baidu", "baidu | 百度热搜\n1. 标题一 [URL:u1]\n\n"),
+                ("weibo", "weibo | 微博\n1. 微博标题\n2. 标题　二\n\n"),
+                ("zhihu", "zhihu\n[UNCHANGED:10时00分]\n\n"),
+            ],
+            "==== 以下ID请求失败 ====\ntoutiao\n",
+        )
+        self.file_path.write_bytes(content)
+
+        full = parse_snapshot_file(self.file_path)
+        assert set(full[0]) == {"baidu", "weibo"}
+
+        assert read_platform_sections(self.file_path, ["weibo"]) == (
+            "weibo | 微博\n1. 微博标题\n2. 标题　二\n\n==== 以下ID请求失败 ====\ntoutiao\n"
+        )
+        assert select_platform_sections(content, ["weibo"]).decode("utf-8") == (
+            read_platform_sections(self.file_path, ["weibo"])
+        )
+
+        titles_by_id, id_to_name, failed_ids, unchanged = parse_snapshot_file(
+            self.file_path, platform_ids=["weibo", "zhihu"]
+        )
+        assert titles_by_id == {"weibo": full[0]["weibo"]}
+        assert id_to_name == {"weibo": "微博", "zhihu": "zhihu"}
+        assert failed_ids == ["toutiao"]
+        assert unchanged == {"zhihu": "10时00分"}
+
+    def test_platform_filter_without_index(self):
+        """测试没有索引的旧文件解析后按平台过滤"""
+        assert read_platform_sections(self.file_path, ["baidu"]) is None
+        titles_by_id, id_to_name, _, unchanged = parse_snapshot_file(
+            self.file_path, platform_ids=["baidu"]
+        )
+        assert set(titles_by_id) == {"baidu"}
+        assert id_to_name == {"baidu": "百度热搜"}
+        assert unchanged == {}
@@ -0,0 +1,35 @@
+from storage.url_templates import UrlTemplate, compact_url, expand_url
+
+
+class TestUrlTemplates:
+    """链接模板单元测试"""
+
+    def test_title_derived_url(self):
+        """测试可由标题推出的链接只保存模板序号"""
+        url = "https://www.baidu.com/s?wd=%E6%B5%8B%E8%AF%95+%E6%A0%87%E9%A2%98"
+        compact = compact_url("baidu", "url", "测试 标题", url)
+        assert compact == "~0"
+        assert expand_url("baidu", "url", "测试 标题", compact) == url
+
+    def test_id_variable_url(self):
+        """测试只保存链接中的ID"""
+        url = "https://www.toutiao.com/trending/7568338340397727787/"
+        compact = compact_url("toutiao", "url", "标题", url)
+        assert compact == "~07568338340397727787"
+        assert expand_url("toutiao", "url", "标题", compact) == url
+
+    def test_title_and_variable(self):
+        """测试同时包含标题和可变部分的模板"""
+        template = UrlTemplate("https://example.com/{}?name={title}")
+        url = "https://example.com/42?name=%E6%A0%87%E9%A2%98"
+        assert template.compact("标题", url) == "42"
+        assert template.compact("其他标题", url) is None
+        assert template.expand("标题", "42") == url
+
+    def test_unmatched_url_kept(self):
+        """测试不符合模板的链接和未配置模板的平台原样保存"""
+        url = "https://www.baidu.com/s?wd=%E5%85%B6%E4%BB%96"
+        assert compact_url("baidu", "url", "标题", url) == url
+        assert compact_url("unknown", "url", "标题", "https://example.com/1") == "https://example.com/1"
+        assert compact_url("baidu", "url", "标题", "") == ""
+        assert expand_url("baidu", "url", "标题", url) == url
@@ -0,0 +1,155 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from analysis.word_matcher import AhoCorasick, MatchCache, WordGroupMatcher, get_word_matcher
+
+
+def make_group(required=None, normal=None, group_key="key"):
+    return {"required": required or [], "normal": normal or [], "group_key": group_key}
+
+
+class TestAhoCorasick:
+    """多模式匹配自动机单元测试"""
+
+    def test_find_overlapping_patterns(self):
+        """测试重叠和嵌套的模式都能找到"""
+        automaton = AhoCorasick(["he", "she", "his", "hers"])
+        assert automaton.find("ushers") == {0, 1, 3}
+        assert automaton.find("history") == {2}
+        assert automaton.find("xyz") == set()
+
+    def test_empty_pattern_always_found(self):
+        """测试空模式串在任意文本中出现"""
+        automaton = AhoCorasick(["", "ab"])
+        assert automaton.find("") == {0}
+        assert automaton.find("cab") == {0, 1}
+
+
+class TestWordGroupMatcher:
+    """词组匹配器单元测试"""
+
+    def test_first_matching_group(self):
+        """测试返回第一个命中的词组"""
+        matcher = WordGroupMatcher(
+            [
+                make_group(normal=["华为", "苹果"]),
+                make_group(required=["AI"], normal=["芯片"]),
+                make_group(normal=["芯片"]),
+            ],
+            [],
+        )
+        assert matcher.match("苹果发布会") == 0
+        assert matcher.match("国产ai芯片突破") == 1
+        assert matcher.match("芯片出口管制") == 2
+        assert matcher.match("今日天气") is None
+
+    def test_required_words_all_present(self):
+        """测试必须词需要全部出现"""
+        matcher = WordGroupMatcher([make_group(required=["股市", "上涨"])], [])
+        assert matcher.match("股市今日上涨") == 0
+        assert matcher.match("股市今日下跌") is None
+
+    def test_filter_words(self):
+        """测试命中过滤词的标题不匹配"""
+        matcher = WordGroupMatcher([make_group(normal=["足球"])], ["彩票"])
+        assert matcher.matches("足球比赛")
+        assert not matcher.matches("足球彩票开奖")
+
+    def test_blank_title(self):
+        """测试空标题不匹配"""
+        matcher = WordGroupMatcher([make_group(required=[""])], [])
+        assert matcher.match("任意标题") == 0
+        assert matcher.match("  ") is None
+        assert matcher.match(None) is None
+
+    def test_no_groups_matches_all(self):
+        """测试未配置词组时匹配所有非空标题，且忽略过滤词"""
+        matcher = WordGroupMatcher([], ["广告"])
+        assert matcher.matches("广告标题")
+        assert not matcher.matches("")
+
+    def test_group_without_words(self):
+        """测试不含任何词的虚拟词组匹配所有标题"""
+        matcher = WordGroupMatcher([make_group(group_key="全部新闻")], [])
+        assert matcher.match("任意标题") == 0
+
+    def test_get_word_matcher_cache(self):
+        """测试同一词组对象复用已编译的匹配器"""
+        word_groups = [make_group(normal=["测试"])]
+        filter_words = []
+        matcher = get_word_matcher(word_groups, filter_words)
+        assert get_word_matcher(word_groups, filter_words) is matcher
+        assert get_word_matcher(list(word_groups), filter_words) is not matcher
+
+
+class TestMatchCache:
+    """标题匹配缓存单元测试"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.path = self.temp_dir / "2025年11月01日" / ".match_cache.json"
+        self.matcher = WordGroupMatcher(
+            [make_group(normal=["华为"]), make_group(normal=["芯片"])], ["广告"]
+        )
+
+    def teardown_method(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_persisted_results(self):
+        """测试匹配结果持久化后直接复用"""
+        cache = MatchCache(self.matcher, self.path)
+        assert cache.match("华为新品") == 0
+        assert cache.match("AI芯片") == 1
+        assert cache.match("芯片广告") is None
+        assert not cache.matches("无关标题")
+        cache.save()
+
+        loaded = MatchCache(self.matcher, self.path)
+        assert len(loaded) == 4
+        # 匹配结果只取决于小写标题
+        assert loaded.match("ai芯片") == 1
+        assert loaded.match("芯片广告") is None
+        assert len(loaded) == 4
+
+    def test_invalidated_by_rule_change(self):
+        """测试关键词配置变化后丢弃已保存的结果"""
+        cache = MatchCache(self.matcher, self.path)
+        cache.match("华为新品")
+        cache.save()
+
+        same_rules = WordGroupMatcher(
+            [make_group(normal=["华为"], group_key="其他"), make_group(normal=["芯片"])], ["广告"]
+        )
+        assert same_rules.fingerprint == self.matcher.fingerprint
+        assert len(MatchCache(same_rules, self.path)) == 1
+
+        reordered = WordGroupMatcher(
+            [make_group(normal=["芯片"]), make_group(normal=["华为"])], ["广告"]
+        )
+        cache = MatchCache(reordered, self.path)
+        assert len(cache) == 0
+        assert cache.match("华为新品") == 1
+
+    def test_alternating_rules_keep_sections(self):
+        """测试交替使用两套规则时各自的结果都保留在文件中"""
+        all_news = WordGroupMatcher([make_group(group_key="全部新闻")], [])
+        cache = MatchCache(self.matcher, self.path)
+        cache.match("华为新品")
+        other = MatchCache(all_news, self.path)
+        other.match("华为新品")
+        other.match("无关标题")
+        cache.save()
+        other.save()
+
+        assert len(MatchCache(self.matcher, self.path)) == 1
+        assert len(MatchCache(all_news, self.path)) == 2
+
+        # 只保留最近保存的 MAX_SECTIONS 套规则
+        for index in range(MatchCache.MAX_SECTIONS):
+            extra = MatchCache(WordGroupMatcher([make_group(normal=[f"词{index}"])], []), self.path)
+            extra.match("华为新品")
+            extra.save()
+        assert len(MatchCache(self.matcher, self.path)) == 0
@@ -0,0 +1,161 @@
+"""
+爬虫压测工具
+
+使用 DataFetcher.crawl_websites 爬取本地回放服务（或 --api-url 指定的接口），
+统计请求数、吞吐量(请求/秒)、请求耗时 p50/p99 和整轮爬取耗时：
+
+    python -m tools.crawl_benchmark output --latency 80 --jitter 40 --error-rate 0.02 --concurrency 4
+
+需要在项目根目录运行（读取 config/config.yaml 的平台列表和爬虫配置）。
+"""
+
+import argparse
+import math
+import threading
+import time
+from typing import List, Optional
+
+from tools.replay_server import add_server_arguments, create_server
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """最近秩百分位数，values 为空时返回 0"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = math.ceil(percent / 100 * len(ordered)) - 1
+    return ordered[max(0, min(len(ordered) - 1, index))]
+
+
+def run_benchmark(
+    api_url: str,
+    platform_ids: List[str],
+    rounds: int = 1,
+    max_concurrency: Optional[int] = None,
+    request_interval: Optional[int] = None,
+    deadline_seconds: int = 0,
+) -> dict:
+    """
+    按当前爬虫配置执行若干轮爬取并统计
+
+    Returns:
+        统计结果字典（requests、rps、p50_ms、p99_ms、wall_seconds、round_seconds、succeeded、failed）
+    """
+    import main as trendradar
+
+    latencies: List[float] = []
+    latencies_lock = threading.Lock()
+
+    class TimingHttpClient(trendradar.HttpClient):
+        def request(self, method, url, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return super().request(method, url, **kwargs)
+            finally:
+                with latencies_lock:
+                    latencies.append((time.perf_counter() - start_time) * 1000)
+
+    if max_concurrency is None:
+        max_concurrency = trendradar.CONFIG["MAX_CONCURRENCY"]
+    if request_interval is None:
+        request_interval = trendradar.CONFIG["REQUEST_INTERVAL"]
+
+    http_client = TimingHttpClient(pool_maxsize=max(10, max_concurrency))
+    previous_client = trendradar._http_client
+    trendradar._http_client = http_client
+    fetcher = trendradar.DataFetcher(None, max_concurrency, api_url=api_url)
+
+    round_seconds = []
+    succeeded = failed = 0
+    try:
+        for _ in range(rounds):
+            start_time = time.perf_counter()
+            results, _, failed_ids = fetcher.crawl_websites(
+                platform_ids,
+                request_interval,
+                deadline_seconds=deadline_seconds,
+            )
+            round_seconds.append(time.perf_counter() - start_time)
+            succeeded += len(results)
+            failed += len(failed_ids)
+    finally:
+        trendradar._http_client = previous_client
+        http_client.close()
+
+    wall_seconds = sum(round_seconds)
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / wall_seconds if wall_seconds else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "wall_seconds": wall_seconds,
+        "round_seconds": round_seconds,
+        "succeeded": succeeded,
+        "failed": failed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TrendRadar 爬虫离线压测")
+    add_server_arguments(parser)
+    parser.add_argument(
+        "--api-url", default=None, help="压测已运行的接口地址，不启动内置回放服务"
+    )
+    parser.add_argument("--rounds", type=int, default=1, help="爬取轮数（默认: 1）")
+    parser.add_argument(
+        "--concurrency", type=int, default=None, help="并发数（默认: crawler.max_concurrency）"
+    )
+    parser.add_argument(
+        "--request-interval",
+        type=int,
+        default=None,
+        help="请求间隔(毫秒)（默认: crawler.request_interval）",
+    )
+    parser.add_argument("--deadline", type=int, default=0, help="每轮爬取时长上限(秒)，0=不限制")
+    parser.add_argument(
+        "--platforms", default=None, help="逗号分隔的平台ID（默认: config.yaml 中的所有平台）"
+    )
+    parser.set_defaults(port=0)
+    args = parser.parse_args()
+
+    server = None
+    api_url = args.api_url
+    if api_url is None:
+        server = create_server(args).start()
+        api_url = server.api_url
+
+    import main as trendradar
+
+    if args.platforms:
+        platform_ids = [p.strip() for p in args.platforms.split(",") if p.strip()]
+    else:
+        platform_ids = [p["id"] for p in trendradar.CONFIG["PLATFORMS"]]
+
+    try:
+        stats = run_benchmark(
+            api_url,
+            platform_ids,
+            rounds=max(1, args.rounds),
+            max_concurrency=args.concurrency,
+            request_interval=args.request_interval,
+            deadline_seconds=args.deadline,
+        )
+    finally:
+        if server:
+            server.stop()
+
+    print()
+    print(f"接口: {api_url}")
+    print(f"平台数: {len(platform_ids)}，轮数: {len(stats['round_seconds'])}")
+    print(f"请求数: {stats['requests']}（成功平台 {stats['succeeded']}，失败平台 {stats['failed']}）")
+    print(f"吞吐量: {stats['rps']:.2f} 请求/秒")
+    print(f"请求耗时: p50 {stats['p50_ms']:.1f} 毫秒，p99 {stats['p99_ms']:.1f} 毫秒")
+    print(
+        f"爬取耗时: 共 {stats['wall_seconds']:.2f} 秒，每轮 "
+        + ", ".join(f"{seconds:.2f}" for seconds in stats["round_seconds"])
+        + " 秒"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+快照解析压测工具
+
+对比按 "\n\n" 切分段落的原解析方式与 storage.txt_format 的逐行解析，
+先校验两者在所有快照上的结果一致，再统计解析耗时：
+
+    python -m tools.parse_benchmark output --repeat 3
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from storage.txt_format import (
+    FAILED_SECTION_MARKER,
+    parse_snapshot_file,
+    parse_unchanged_marker,
+)
+
+
+def split_parse_snapshot_file(file_path: Path) -> Tuple[Dict, Dict, List[str], Dict]:
+    """原解析方式（整文件读取后按段落切分，逐行 split/rsplit 和正则清理），作为对照"""
+    titles_by_id = {}
+    id_to_name = {}
+    failed_ids = []
+    unchanged = {}
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    for section in content.split("\n\n"):
+        if not section.strip():
+            continue
+
+        lines = section.strip().split("\n")
+        if FAILED_SECTION_MARKER in section:
+            failed_ids.extend(
+                line.strip()
+                for line in lines
+                if line.strip() and FAILED_SECTION_MARKER not in line
+            )
+            continue
+
+        if len(lines) < 2:
+            continue
+
+        header_line = lines[0].strip()
+        if " | " in header_line:
+            source_id, name = header_line.split(" | ", 1)
+            source_id = source_id.strip()
+            id_to_name[source_id] = name.strip()
+        else:
+            source_id = header_line
+            id_to_name[source_id] = source_id
+
+        since_time = parse_unchanged_marker(lines[1])
+        if since_time is not None:
+            unchanged[source_id] = since_time
+            continue
+
+        source_titles = titles_by_id[source_id] = {}
+        for line in lines[1:]:
+            if not line.strip():
+                continue
+            title_part = line.strip()
+            rank = None
+            if ". " in title_part and title_part.split(". ")[0].isdigit():
+                rank_str, title_part = title_part.split(". ", 1)
+                rank = int(rank_str)
+
+            mobile_url = ""
+            if " [MOBILE:" in title_part:
+                title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
+                if mobile_part.endswith("]"):
+                    mobile_url = mobile_part[:-1]
+
+            url = ""
+            if " [URL:" in title_part:
+                title_part, url_part = title_part.rsplit(" [URL:", 1)
+                if url_part.endswith("]"):
+                    url = url_part[:-1]
+
+            title = title_part.strip().replace("\n", " ").replace("\r", " ")
+            title = re.sub(r"\s+", " ", title).strip()
+            source_titles[title] = (rank if rank is not None else 1, url, mobile_url)
+
+    return titles_by_id, id_to_name, failed_ids, unchanged
+
+
+def time_parser(parser, files: List[Path], repeat: int) -> float:
+    """返回多次解析全部文件中最快一次的耗时(秒)"""
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for file_path in files:
+            parser(file_path)
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TrendRadar 快照解析压测")
+    parser.add_argument(
+        "output_dir", nargs="?", default="output", help="output 目录（默认: output）"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数，取最快一次（默认: 3）")
+    args = parser.parse_args()
+
+    files = sorted(Path(args.output_dir).glob("*/txt/*.txt"))
+    if not files:
+        raise SystemExit(f"{args.output_dir} 下没有txt快照")
+
+    mismatched = [
+        file_path
+        for file_path in files
+        if split_parse_snapshot_file(file_path) != parse_snapshot_file(file_path)
+    ]
+    if mismatched:
+        raise SystemExit(f"解析结果不一致: {[str(f) for f in mismatched[:5]]}")
+
+    total_bytes = sum(f.stat().st_size for f in files)
+    repeat = max(1, args.repeat)
+    split_seconds = time_parser(split_parse_snapshot_file, files, repeat)
+    stream_seconds = time_parser(parse_snapshot_file, files, repeat)
+
+    print(f"快照文件: {len(files)} 个，共 {total_bytes / 1024 / 1024:.1f} MB，解析结果一致")
+    print(f"按段落切分: {split_seconds * 1000:.1f} 毫秒")
+    print(f"逐行解析:   {stream_seconds * 1000:.1f} 毫秒")
+    print(f"加速比: {split_seconds / stream_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+newsnow 接口回放服务
+
+读取 output/*/txt/ 下已保存的快照，以 newsnow `/api/s?id=<平台ID>` 的 JSON 格式返回，
+可配置响应延迟、错误率和 `cache` 状态比例，用于离线测试和压测爬虫：
+
+    python -m tools.replay_server output --port 8765 --latency 50 --error-rate 0.05
+
+然后在 config.yaml 中设置 crawler.api_url: "http://127.0.0.1:8765/api/s"（或环境变量 CRAWLER_API_URL）。
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from storage.day_archive import day_snapshot_loader
+from storage.txt_format import parse_snapshot_file, resolve_unchanged
+from storage.url_templates import expand_url
+
+
+def load_replay_data(output_dir: str) -> Dict[str, List[List[Dict]]]:
+    """
+    读取 output 目录下的所有txt快照
+
+    Returns:
+        {platform_id: [按时间排序的每次快照的 items 列表]}，items 与 newsnow 接口返回的结构相同
+    """
+    snapshots: Dict[str, List[List[Dict]]] = {}
+    # 每天的快照共用一个解析缓存，增量和未变化平台引用的快照只解析一次
+    loaders: Dict[Path, Callable] = {}
+    for txt_file in sorted(Path(output_dir).glob("*/txt/*.txt")):
+        if txt_file.parent not in loaders:
+            loaders[txt_file.parent] = day_snapshot_loader(txt_file.parent)
+        load_base = loaders[txt_file.parent]
+        try:
+            titles_by_id, _, _, _ = resolve_unchanged(
+                parse_snapshot_file(txt_file, load_base), load_base
+            )
+        except Exception as e:
+            print(f"跳过无法解析的快照 {txt_file}: {e}")
+            continue
+
+        for platform_id, titles in titles_by_id.items():
+            items = [
+                {
+                    "id": title,
+                    "title": title,
+                    "url": expand_url(platform_id, "url", title, url),
+                    "mobileUrl": expand_url(platform_id, "mobile_url", title, mobile_url),
+                }
+                for title, (rank, url, mobile_url) in sorted(
+                    titles.items(), key=lambda entry: entry[1][0]
+                )
+            ]
+            if items:
+                snapshots.setdefault(platform_id, []).append(items)
+    return snapshots
+
+
+class ReplayServer:
+    """按平台依次循环回放历史快照的 HTTP 服务"""
+
+    def __init__(
+        self,
+        snapshots: Dict[str, List[List[Dict]]],
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        cache_rate: float = 0,
+        seed: Optional[int] = None,
+    ):
+        self.snapshots = snapshots
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.cache_rate = cache_rate
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def api_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/s"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 响应头和响应体分两次写出，关闭 Nagle 避免与客户端延迟确认叠加产生约 40 毫秒的等待
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                status, body = server.handle(self.path)
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def handle(self, path: str):
+        """处理一次请求，返回 (HTTP状态码, 响应JSON)"""
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+            failed = self.random.random() < self.error_rate
+            cached = self.random.random() < self.cache_rate
+
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        parsed = urlparse(path)
+        platform_id = parse_qs(parsed.query).get("id", [""])[0]
+        if parsed.path != "/api/s" or platform_id not in self.snapshots:
+            return 404, {"status": "error", "message": f"unknown source: {platform_id}"}
+        if failed:
+            return 500, {"status": "error", "message": "replay injected error"}
+
+        platform_snapshots = self.snapshots[platform_id]
+        with self._lock:
+            position = self._positions.get(platform_id, 0)
+            if cached and position > 0:
+                # cache 状态与 newsnow 一致：重复返回上次的列表，不前进到下一个快照
+                position -= 1
+            else:
+                cached = False
+                self._positions[platform_id] = position + 1
+        return 200, {
+            "status": "cache" if cached else "success",
+            "id": platform_id,
+            "updatedTime": int(time.time() * 1000),
+            "items": platform_snapshots[position % len(platform_snapshots)],
+        }
+
+    def start(self) -> "ReplayServer":
+        """在后台线程中启动服务"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """回放服务的命令行参数（压测工具复用）"""
+    parser.add_argument(
+        "output_dir", nargs="?", default="output", help="快照所在的 output 目录（默认: output）"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址（默认: 127.0.0.1）")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口（默认: 8765，0=随机端口）")
+    parser.add_argument("--latency", type=float, default=0, help="每个请求的固定延迟(毫秒)")
+    parser.add_argument("--jitter", type=float, default=0, help="在固定延迟上追加的随机延迟上限(毫秒)")
+    parser.add_argument("--error-rate", type=float, default=0, help="返回 500 错误的比例(0-1)")
+    parser.add_argument("--cache-rate", type=float, default=0, help="返回 cache 状态（重复上次的列表）的比例(0-1)")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子，便于复现")
+
+
+def create_server(args: argparse.Namespace) -> ReplayServer:
+    snapshots = load_replay_data(args.output_dir)
+    if not snapshots:
+        raise SystemExit(f"{args.output_dir} 下没有可回放的txt快照")
+    return ReplayServer(
+        snapshots,
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        cache_rate=args.cache_rate,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="newsnow 接口回放服务")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = create_server(args)
+    print(f"回放 {len(server.snapshots)} 个平台的快照: {server.api_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+新闻权重压测工具
+
+对比逐条计算权重的原实现与 analysis.news_weight 的批量计算（逐条循环 / NumPy），
+先校验结果逐位一致，再统计计算耗时：
+
+    python -m tools.weight_benchmark --titles 20000 --repeat 5
+
+排名历史随机生成（固定随机种子），每条新闻 1~max_ranks 个排名。
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List
+
+from analysis.news_weight import DEFAULT_WEIGHT_CONFIG, calculate_news_weights, np
+
+
+def reference_news_weight(title_data: Dict, rank_threshold: int, weight_config: Dict) -> float:
+    """原实现（每条新闻单独构建得分列表并多次遍历排名），作为对照"""
+    ranks = title_data.get("ranks", [])
+    if not ranks:
+        return 0.0
+
+    count = title_data.get("count", len(ranks))
+
+    rank_scores = []
+    for rank in ranks:
+        score = 11 - min(rank, 10)
+        rank_scores.append(score)
+
+    rank_weight = sum(rank_scores) / len(ranks) if ranks else 0
+    frequency_weight = min(count, 10) * 10
+    high_rank_count = sum(1 for rank in ranks if rank <= rank_threshold)
+    hotness_ratio = high_rank_count / len(ranks) if ranks else 0
+    hotness_weight = hotness_ratio * 100
+
+    return (
+        rank_weight * weight_config["RANK_WEIGHT"]
+        + frequency_weight * weight_config["FREQUENCY_WEIGHT"]
+        + hotness_weight * weight_config["HOTNESS_WEIGHT"]
+    )
+
+
+def generate_news(titles: int, max_ranks: int, seed: int = 0) -> List[Dict]:
+    """生成随机排名历史"""
+    rng = random.Random(seed)
+    news_list = []
+    for _ in range(titles):
+        ranks = [rng.randint(1, 50) for _ in range(rng.randint(1, max_ranks))]
+        news_list.append({"ranks": ranks, "count": rng.randint(1, 2 * len(ranks))})
+    return news_list
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """返回多次执行中最快一次的耗时(秒)"""
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TrendRadar 新闻权重压测")
+    parser.add_argument("--titles", type=int, default=20000, help="新闻条数（默认: 20000）")
+    parser.add_argument("--max-ranks", type=int, default=24, help="每条新闻最多的排名数（默认: 24）")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数，取最快一次（默认: 5）")
+    args = parser.parse_args()
+
+    news_list = generate_news(args.titles, args.max_ranks)
+    rank_threshold = 5
+    weight_config = DEFAULT_WEIGHT_CONFIG
+    repeat = max(1, args.repeat)
+
+    def run_reference():
+        return [reference_news_weight(news, rank_threshold, weight_config) for news in news_list]
+
+    variants = {"逐条计算(原实现)": run_reference}
+    variants["批量计算"] = lambda: calculate_news_weights(
+        news_list, rank_threshold, weight_config, use_numpy=False
+    )
+    if np is not None:
+        variants["批量计算(NumPy)"] = lambda: calculate_news_weights(
+            news_list, rank_threshold, weight_config, use_numpy=True
+        )
+
+    expected = run_reference()
+    for name, func in variants.items():
+        if func() != expected:
+            raise SystemExit(f"{name} 的结果与原实现不一致")
+
+    total_ranks = sum(len(news["ranks"]) for news in news_list)
+    print(f"新闻: {len(news_list)} 条，排名: {total_ranks} 个，结果一致")
+    if np is None:
+        print("未安装 NumPy，跳过 NumPy 批量计算")
+
+    baseline = None
+    for name, func in variants.items():
+        seconds = best_time(func, repeat)
+        baseline = seconds if baseline is None else baseline
+        print(f"{name}: {seconds * 1000:.1f} 毫秒（{baseline / seconds:.2f}x）")
+
+
+if __name__ == "__main__":
+    main()